@@ -0,0 +1,116 @@
+"""Benchmark da inferência NumPy das árvores (``uber_price.arvores``) contra o predict do scikit-learn.
+
+Treina HistGradientBoosting, RandomForest e Bagging (hiperparâmetros fixos)
+em corridas sintéticas, exporta cada um com ``arvores.exportar`` e mede:
+
+* a maior diferença absoluta entre as predições (deve ficar no arredondamento);
+* latência de uma linha (p50/p99): ``predict`` do sklearn num DataFrame de uma
+  linha, do motor no mesmo DataFrame e do motor numa linha já preparada;
+* vazão em lote (``--lote`` linhas), melhor de 3.
+
+Também verifica, num processo novo, que carregar o ``.npz`` e prever não
+importa o scikit-learn. Sai com código 1 se alguma predição divergir.
+
+    python benchmarks/bench_arvores.py --linhas 100000 --repeticoes 300
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ))
+
+MODELOS = {
+    "HistGradientBoosting": ("pipe_hgb", {"max_iter": 200, "learning_rate": 0.1}),
+    "RandomForest": ("pipe_rf", {"rf__n_estimators": 100, "rf__max_depth": 15, "rf__max_features": "sqrt",
+                                 "rf__oob_score": False}),
+    "Bagging": ("pipe_bag", {"bag__n_estimators": 50, "bag__estimator__max_depth": 10, "bag__oob_score": False}),
+}
+
+SONDA = """
+import sys
+import pandas as pd
+from uber_price.arvores import ArvoresCompiladas
+modelo = ArvoresCompiladas.carregar(sys.argv[1])
+modelo.predict(pd.read_pickle(sys.argv[2]))
+print(int("sklearn" in sys.modules))
+"""
+
+
+def cronometrar(funcao, *args):
+    t0 = time.perf_counter()
+    funcao(*args)
+    return time.perf_counter() - t0
+
+
+def latencias_ms(funcao, linhas):
+    funcao(linhas[0])  # aquece caches e imports tardios
+    return np.array([cronometrar(funcao, x) for x in linhas]) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, default=100_000, help="corridas sintéticas (antes de filtrar o Lyft)")
+    parser.add_argument("--modelos", nargs="+", choices=list(MODELOS), default=list(MODELOS))
+    parser.add_argument("--repeticoes", type=int, default=300, help="predicts de uma linha")
+    parser.add_argument("--lote", type=int, default=10_000, help="linhas do predict em lote")
+    args = parser.parse_args(argv)
+
+    from sklearn.base import clone
+    from uber_price import models
+    from uber_price.arvores import exportar
+    from uber_price.data import filtrar_uber, limparDados
+    from uber_price.features import dividir, selecionar_features
+    from uber_price.sintetico import gerar_corridas
+
+    X_train, X_test, y_train, _ = dividir(*selecionar_features(filtrar_uber(
+        limparDados(gerar_corridas(args.linhas), compacto=True))))
+    linhas = [X_test.iloc[[i % len(X_test)]] for i in range(args.repeticoes)]
+    X_lote = X_test.iloc[:args.lote]
+
+    print(f"{'caminho':<22}{'1 linha p50/p99 (ms)':>23}{'lote (linhas/s)':>17}")
+    divergentes = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for nome in args.modelos:
+            atributo, params = MODELOS[nome]
+            modelo = clone(getattr(models, atributo)).set_params(**params).fit(X_train, y_train)
+            motor = exportar(modelo)
+            diferenca = float(np.abs(motor.predict(X_test) - modelo.predict(X_test)).max())
+            if diferenca > 1e-6:
+                divergentes.append(f"{nome}: {diferenca:.3g}")
+            print(f"\n{nome}: {motor.n_arvores} árvores, {len(motor.feature):,} nós, "
+                  f"profundidade {motor.profundidade}, diferença máxima {diferenca:.2g}")
+
+            preparadas = [motor.preparar(x) for x in linhas]
+            caminhos = {
+                "sklearn": (modelo.predict, linhas, X_lote),
+                "numpy (DataFrame)": (motor.predict, linhas, X_lote),
+                "numpy (preparado)": (motor.predict, preparadas, motor.preparar(X_lote)),
+            }
+            for rotulo, (funcao, entradas, lote) in caminhos.items():
+                tempos = latencias_ms(funcao, entradas)
+                vazao = len(X_lote) / min(cronometrar(funcao, lote) for _ in range(3))
+                print(f"{rotulo:<22}{np.percentile(tempos, 50):>12.3f} / {np.percentile(tempos, 99):<8.3f}"
+                      f"{vazao:>17,.0f}", flush=True)
+
+            caminho, amostra = Path(tmp) / f"{nome}.npz", Path(tmp) / "amostra.pkl"
+            motor.salvar(caminho)
+            X_lote.to_pickle(amostra)
+            out = subprocess.run([sys.executable, "-c", SONDA, str(caminho), str(amostra)], cwd=RAIZ,
+                                 capture_output=True, text=True, check=True)
+            if out.stdout.strip().splitlines()[-1] != "0":
+                divergentes.append(f"{nome}: o motor importou o scikit-learn")
+
+    for d in divergentes:
+        print(f"FALHA: {d}")
+    return 1 if divergentes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
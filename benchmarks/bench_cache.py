@@ -0,0 +1,61 @@
+"""Benchmark do cache colunar: carga fria (CSV + limparDados) × carga quente (Feather).
+
+    python benchmarks/bench_cache.py --linhas 700000
+    python benchmarks/bench_cache.py --csv data/rideshare_kaggle.csv
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from uber_price.cache import limpar_com_cache  # noqa: E402
+
+
+def cronometrar(func, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        resultado = func()
+        tempos.append(time.perf_counter() - t0)
+    return min(tempos), resultado
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", help="CSV real; se omitido, gera um sintético")
+    parser.add_argument("--linhas", type=int, default=200_000, help="tamanho do CSV sintético")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv = args.csv
+        if csv is None:
+            from uber_price.sintetico import gerar_corridas
+
+            csv = Path(tmp) / "rideshare_sintetico.csv"
+            gerar_corridas(args.linhas).to_csv(csv, index=False)
+
+        def fria():
+            raiz = tempfile.mkdtemp(dir=tmp)  # cache vazio a cada repetição
+            return limpar_com_cache(csv, raiz=raiz)
+
+        raiz_quente = Path(tmp) / "quente"
+        limpar_com_cache(csv, raiz=raiz_quente)
+
+        t_fria, df = cronometrar(fria, args.repeticoes)
+        t_quente, df_q = cronometrar(lambda: limpar_com_cache(csv, raiz=raiz_quente), args.repeticoes)
+
+    tamanho = Path(csv).stat().st_size / 1e6 if args.csv else float("nan")
+    print(f"linhas limpas: {len(df):,}  colunas: {df.shape[1]}" + (f"  CSV: {tamanho:.0f} MB" if args.csv else ""))
+    print(f"carga fria  (read_csv + limparDados + gravação): {t_fria:8.3f} s")
+    print(f"carga quente (Feather, memory-map):              {t_quente:8.3f} s")
+    print(f"ganho: {t_fria / t_quente:.1f}x")
+    assert df_q.shape == df.shape
+
+
+if __name__ == "__main__":
+    main()
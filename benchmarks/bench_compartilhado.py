@@ -0,0 +1,116 @@
+"""Benchmark de pico de memória da busca paralela em função de ``n_jobs``.
+
+Compara ``buscar(..., compartilhar=True)`` (X gravado uma vez em memória
+compartilhada e lido com memory-map pelos workers) com o envio de X
+serializado a cada tarefa. A memória é a soma do PSS do processo principal e
+de todos os workers, amostrada durante a busca: páginas compartilhadas entram
+uma vez só, divididas entre os processos que as usam (o RSS somado as contaria
+em cada worker).
+
+Cada medição roda num processo novo. ``--matriz densa`` usa o One-Hot denso
+antigo (``codificar``/``separar_xy``), onde as cópias por worker pesam mais.
+
+    python benchmarks/bench_compartilhado.py --linhas 600000 --n-jobs 1 2 4 --matriz densa
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+
+SONDA = """
+import json, os, sys, threading, time, warnings
+warnings.filterwarnings("ignore")
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.linear_model import Ridge
+from uber_price import models
+from uber_price.busca import buscar
+from uber_price.data import limparDados, filtrar_uber
+from uber_price.features import codificar, separar_xy, selecionar_features
+from uber_price.sintetico import gerar_corridas
+
+linhas, matriz, n_jobs, compartilhar = int(sys.argv[1]), sys.argv[2], int(sys.argv[3]), sys.argv[4] == "1"
+
+def processos():
+    filhos = {}
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except OSError:
+            continue
+        filhos.setdefault(ppid, []).append(int(pid))
+    pendentes, todos = [os.getpid()], []
+    while pendentes:
+        pid = pendentes.pop()
+        todos.append(pid)
+        pendentes.extend(filhos.get(pid, []))
+    return todos
+
+def pss_mb():
+    total = 0
+    for pid in processos():
+        try:
+            with open(f"/proc/{pid}/smaps_rollup") as f:
+                total += next(int(l.split()[1]) for l in f if l.startswith("Pss:"))
+        except (OSError, StopIteration):
+            pass
+    return total / 1024
+
+df = filtrar_uber(limparDados(gerar_corridas(linhas), compacto=True))
+if matriz == "densa":
+    X, y = separar_xy(codificar(df))
+    X = X.astype("float64")
+    lista = [("HGB", HistGradientBoostingRegressor(max_iter=30, random_state=42),
+              {"learning_rate": [0.05, 0.1, 0.3]}, False),
+             ("Ridge", Ridge(), {"alpha": [0.1, 1.0, 10.0]}, False)]
+else:
+    X, y = selecionar_features(df)
+    lista = [("HGB", models.pipe_hgb, {"max_iter": [30], "learning_rate": [0.05, 0.1, 0.3]}, False),
+             ("LinearRegression", models.pipe_lr, {"lr__fit_intercept": [True, False]}, False)]
+del df
+
+picos, fim = [pss_mb()], threading.Event()
+def amostrar():
+    while not fim.wait(0.05):
+        picos.append(pss_mb())
+thread = threading.Thread(target=amostrar, daemon=True)
+thread.start()
+inicio = time.perf_counter()
+buscar(lista, X, y, n_iter=3, n_jobs=n_jobs, compartilhar=compartilhar, verbose=0)
+segundos = time.perf_counter() - inicio
+fim.set()
+thread.join()
+print(json.dumps({"x_mb": X.memory_usage(deep=True).sum() / 1e6, "base_mb": picos[0],
+                  "pico_mb": max(picos), "segundos": segundos}))
+"""
+
+
+def medir(linhas, matriz, n_jobs, compartilhar):
+    out = subprocess.run([sys.executable, "-c", SONDA, str(linhas), matriz, str(n_jobs), str(int(compartilhar))],
+                         cwd=RAIZ, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, default=600_000, help="corridas sintéticas (antes de filtrar o Lyft)")
+    parser.add_argument("--n-jobs", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--matriz", choices=["compacta", "densa"], default="compacta")
+    args = parser.parse_args(argv)
+
+    print(f"{'n_jobs':>6} {'X (MB)':>7} {'cópias (MB)':>12} {'compartilhado (MB)':>19} "
+          f"{'cópias (s)':>11} {'compart. (s)':>13}")
+    for n_jobs in args.n_jobs:
+        copia = medir(args.linhas, args.matriz, n_jobs, False)
+        comp = medir(args.linhas, args.matriz, n_jobs, True)
+        print(f"{n_jobs:>6} {comp['x_mb']:>7.0f} {copia['pico_mb'] - copia['base_mb']:>12.0f} "
+              f"{comp['pico_mb'] - comp['base_mb']:>19.0f} {copia['segundos']:>11.1f} {comp['segundos']:>13.1f}")
+    print("valores: pico do PSS somado (processo principal + workers) acima do processo já com os dados carregados")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark de uma cotação avulsa: DataFrame + ``predict`` do sklearn contra ``cotacao.CotadorRapido``.
+
+Treina o modelo do simulador em corridas sintéticas num registro temporário e
+cota ``--cotacoes`` corridas sorteadas, uma por vez, pelos dois caminhos:
+
+* antes: ``montar_X`` (um DataFrame de uma linha, com a categórica do
+  codificador) e ``modelo.predict``, como o ``Precificador`` fazia fora da grade;
+* depois: ``Cotacao`` (registro com ``__slots__``) -> vetor na ordem das
+  árvores -> motor NumPy (``uber_price.arvores``).
+
+Mostra a latência p50/p99 de cada caminho, a maior diferença entre os preços
+e o tempo de carga num processo novo (``modelo.joblib`` contra ``arvores.npz``).
+
+    python benchmarks/bench_cotacao.py --linhas 100000 --cotacoes 2000
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ))
+
+SONDA = """
+import json, sys, time
+t0 = time.perf_counter()
+if sys.argv[2] == "joblib":
+    from uber_price.registry import carregar_modelo
+    carregar_modelo("simulador", raiz=sys.argv[1])
+else:
+    from uber_price.cotacao import CotadorRapido
+    CotadorRapido.do_registro("simulador", raiz=sys.argv[1])
+print(json.dumps({"segundos": time.perf_counter() - t0, "sklearn": "sklearn" in sys.modules}))
+"""
+
+
+def carga(raiz, caminho):
+    out = subprocess.run([sys.executable, "-c", SONDA, str(raiz), caminho], cwd=RAIZ, capture_output=True,
+                         text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, default=100_000, help="corridas sintéticas do treino")
+    parser.add_argument("--cotacoes", type=int, default=2_000, help="cotações de uma linha por caminho")
+    args = parser.parse_args(argv)
+
+    from uber_price.cotacao import Cotacao, CotadorRapido
+    from uber_price.data import filtrar_uber, limparDados
+    from uber_price.features import montar_X
+    from uber_price.registry import carregar_codificador, carregar_modelo
+    from uber_price.simulador import NOME_SIMULADOR, gerar_grade_simulador, registrar_simulador
+    from uber_price.sintetico import gerar_corridas
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as raiz:
+        registrar_simulador(filtrar_uber(limparDados(gerar_corridas(args.linhas), compacto=True)), raiz=raiz)
+        gerar_grade_simulador(raiz)  # grava também o arvores.npz
+        modelo, meta = carregar_modelo(NOME_SIMULADOR, raiz=raiz)
+        codificador = carregar_codificador(NOME_SIMULADOR, raiz=raiz)
+        cotador = CotadorRapido.do_registro(NOME_SIMULADOR, raiz=raiz)
+        servicos = list(codificador.categorias_["name"])
+        pedidos = [(float(rng.uniform(0.1, 20)), int(rng.integers(24)), float(rng.choice([1.0, 1.25, 1.5, 2.0])),
+                    servicos[rng.integers(len(servicos))]) for _ in range(args.cotacoes)]
+
+        def antes(d, h, s, n):
+            cotacao = {"distance": d, "hour": h, "surge_multiplier": s, "name": n}
+            return float(modelo.predict(montar_X([cotacao], meta, codificador))[0])
+
+        def depois(d, h, s, n):
+            return cotador.preco(Cotacao(d, h, s, n))
+
+        resultados = {}
+        for rotulo, funcao in [("DataFrame + sklearn", antes), ("Cotacao + motor NumPy", depois)]:
+            funcao(*pedidos[0])  # aquece caches e imports tardios
+            tempos, precos = [], []
+            for pedido in pedidos:
+                t0 = time.perf_counter()
+                precos.append(funcao(*pedido))
+                tempos.append((time.perf_counter() - t0) * 1000)
+            resultados[rotulo] = (np.array(tempos), np.array(precos))
+        cargas = {"modelo.joblib": carga(raiz, "joblib"), "arvores.npz": carga(raiz, "npz")}
+
+    print(f"{'caminho':<24}{'p50 (ms)':>10}{'p99 (ms)':>10}{'cotações/s':>12}")
+    for rotulo, (tempos, _) in resultados.items():
+        print(f"{rotulo:<24}{np.percentile(tempos, 50):>10.3f}{np.percentile(tempos, 99):>10.3f}"
+              f"{1000 / tempos.mean():>12,.0f}")
+    (t_antes, p_antes), (t_depois, p_depois) = resultados.values()
+    diferenca = float(np.abs(p_antes - p_depois).max())
+    print(f"\nganho no p50: {np.percentile(t_antes, 50) / np.percentile(t_depois, 50):.1f}x; "
+          f"maior diferença entre os preços: {diferenca:.2g}")
+    for arquivo, c in cargas.items():
+        print(f"carga de {arquivo} num processo novo: {c['segundos'] * 1000:.0f} ms"
+              f"{' (importa o scikit-learn)' if c['sklearn'] else ''}")
+    return 0 if diferenca < 1e-6 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
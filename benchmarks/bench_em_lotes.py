@@ -0,0 +1,104 @@
+"""Benchmark de pico de memória (RSS): treino em memória × treino lote a lote.
+
+O CSV sintético é limpo para o cache colunar antes das medições; cada modo
+roda num processo novo e treina a partir do mesmo Feather:
+
+* ``memoria`` – lê o Feather inteiro, ``selecionar_features``, split 80/20 e
+  ``HistGradientBoostingRegressor.fit`` (o caminho do pipeline);
+* ``hgb`` – ``treinar_hgb_em_lotes`` (bins da amostra + células agregadas);
+* ``sgd`` – ``treinar_sgd_em_lotes`` (``partial_fit`` lote a lote).
+
+Com as features padrão o ``hgb`` guarda até ``--max-celulas`` células (os
+bins numéricos engrossam acima disso), então o pico para de crescer quando o
+orçamento é atingido; com ``--features simulador`` (as 5 features do app) as
+linhas já colapsam em poucas células.
+
+    python benchmarks/bench_em_lotes.py --linhas 200000 600000 1200000
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+
+SONDA = """
+import json, resource, sys, time
+import numpy as np, pandas as pd, pyarrow, sklearn.ensemble
+
+def pico_kb():
+    try:
+        with open("/proc/self/status") as f:
+            return next(int(l.split()[1]) for l in f if l.startswith("VmHWM:"))
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+from uber_price.fora_da_memoria import FEATURES_PADRAO, treinar_hgb_em_lotes, treinar_sgd_em_lotes
+from uber_price.simulador import FEATURES_SIMULADOR
+
+modo, caminho, features, max_celulas = sys.argv[1:]
+features = FEATURES_SIMULADOR if features == "simulador" else FEATURES_PADRAO
+base = pico_kb()
+inicio = time.perf_counter()
+celulas = None
+if modo == "memoria":
+    from sklearn.ensemble import HistGradientBoostingRegressor
+    from uber_price.cache import ler_feather
+    from uber_price.data import filtrar_uber
+    from uber_price.eval import eval_model
+    from uber_price.features import TARGET, dividir
+
+    df = filtrar_uber(ler_feather(caminho))
+    X_train, X_test, y_train, y_test = dividir(df[features], df[TARGET])
+    modelo = HistGradientBoostingRegressor(max_iter=200, random_state=42, early_stopping=False,
+                                           categorical_features="from_dtype").fit(X_train, y_train)
+    metricas = eval_model("hgb", modelo, X_test, y_test)
+elif modo == "hgb":
+    _, metricas, info = treinar_hgb_em_lotes(caminho, features, max_celulas=int(max_celulas), verbose=0)
+    celulas = info["celulas"]
+else:
+    _, metricas, _ = treinar_sgd_em_lotes(caminho, verbose=0)
+print(json.dumps({"base_mb": base / 1024, "pico_mb": pico_kb() / 1024, "segundos": time.perf_counter() - inicio,
+                  "rmse": float(metricas["RMSE_test"]), "celulas": celulas}))
+"""
+
+
+def medir(modo, caminho, features, max_celulas):
+    out = subprocess.run([sys.executable, "-c", SONDA, modo, str(caminho), features, str(max_celulas)],
+                         cwd=RAIZ, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, nargs="+", default=[200_000, 600_000, 1_200_000])
+    parser.add_argument("--modos", nargs="+", default=["memoria", "hgb", "sgd"], choices=["memoria", "hgb", "sgd"])
+    parser.add_argument("--features", default="padrao", choices=["padrao", "simulador"])
+    parser.add_argument("--max-celulas", type=int, default=500_000, help="orçamento de células do hgb")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(RAIZ))
+    from uber_price.cache import cachear_em_chunks
+    from uber_price.sintetico import gerar_corridas
+
+    print(f"{'linhas':>10} {'modo':>8} {'pico (MB)':>10} {'tempo (s)':>10} {'RMSE':>8} {'células':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.linhas:
+            csv = Path(tmp) / f"corridas_{n}.csv"
+            gerar_corridas(n).to_csv(csv, index=False)
+            caminho = cachear_em_chunks(csv, raiz=tmp)
+            csv.unlink()
+            for modo in args.modos:
+                r = medir(modo, caminho, args.features, args.max_celulas)
+                celulas = f"{r['celulas']:>10,}" if r["celulas"] is not None else f"{'-':>10}"
+                print(f"{n:>10,} {modo:>8} {r['pico_mb'] - r['base_mb']:>10.0f} {r['segundos']:>10.1f} "
+                      f"{r['rmse']:>8.4f} {celulas}")
+            caminho.unlink()
+    print("pico: RSS acima do processo já com pandas/pyarrow/scikit-learn importados")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark dos esboços de streaming (``uber_price.esbocos``) contra as estatísticas exatas do pandas.
+
+Gera ``--chunks`` chunks de corridas sintéticas limpas e alimenta um
+``PerfilStreaming`` por chunk, combinando-os como fariam processos
+diferentes. A cada potência de 2 de chunks mostra o tamanho do perfil
+combinado (pickle), que deve ficar constante, e no fim compara com o
+``describe``/``corr``/``value_counts`` do DataFrame inteiro:
+
+* erro de rank dos quartis de cada coluna numérica;
+* maior diferença na média, desvio padrão e correlação;
+* se as contagens das zonas e dos serviços são exatas.
+
+    python benchmarks/bench_esbocos.py --linhas 100000 --chunks 16
+"""
+
+import argparse
+import pickle
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(RAIZ))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, default=100_000, help="corridas sintéticas por chunk")
+    parser.add_argument("--chunks", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    from uber_price.data import limparDados
+    from uber_price.esbocos import CORRELACAO_PERFIL, NUMERICAS_PERFIL, PerfilStreaming
+    from uber_price.sintetico import gerar_corridas
+
+    perfil, partes, segundos = PerfilStreaming(), [], 0.0
+    print(f"{'chunks':>7}{'linhas':>12}{'perfil (KB)':>13}")
+    for i in range(args.chunks):
+        df = limparDados(gerar_corridas(args.linhas, seed=i), compacto=True)
+        partes.append(df)
+        t0 = time.perf_counter()
+        perfil.juntar(PerfilStreaming(semente=i).atualizar(df))
+        segundos += time.perf_counter() - t0
+        if (i + 1) & i == 0 or i + 1 == args.chunks:
+            print(f"{i + 1:>7}{perfil.linhas:>12,}{len(pickle.dumps(perfil)) / 1024:>13.1f}")
+
+    df = pd.concat(partes, ignore_index=True)
+    print(f"\n{perfil.linhas:,} linhas em {segundos:.2f}s ({perfil.linhas / segundos:,.0f} linhas/s); "
+          f"DataFrame exato: {df.memory_usage(deep=True).sum() / 2 ** 20:.0f} MB")
+
+    exato, aproximado = df[NUMERICAS_PERFIL].astype(np.float64).describe(), perfil.descricao()
+    print(f"\n{'coluna':<22}{'erro de rank (quartis)':>24}")
+    for col in NUMERICAS_PERFIL:
+        valores = np.sort(df[col].to_numpy(np.float64))
+        quartis = aproximado.loc[["25%", "50%", "75%"], col].to_numpy()
+        # rank do valor estimado: qualquer posição entre a primeira e a última ocorrência serve
+        rank_min = np.searchsorted(valores, quartis, side="left") / len(valores)
+        rank_max = np.searchsorted(valores, quartis, side="right") / len(valores)
+        alvo = np.array([0.25, 0.5, 0.75])
+        erro = np.maximum(0, np.maximum(rank_min - alvo, alvo - rank_max)).max()
+        print(f"{col:<22}{erro:>24.4f}")
+    momentos = (aproximado - exato).loc[["mean", "std"]].abs().max().max()
+    corr = np.abs(perfil.correlacao().to_numpy() - df[CORRELACAO_PERFIL].astype(np.float64).corr().to_numpy())
+    contagens_exatas = all(
+        perfil.frequentes[col].mais_frequentes().sort_index().equals(
+            df[col].value_counts().rename("corridas").pipe(lambda s: s[s > 0]).astype(np.int64).sort_index())
+        for col in ("source", "destination", "name"))
+    print(f"\nmaior diferença em média/desvio: {momentos:.2g}; na correlação: {np.nanmax(corr):.2g}; "
+          f"contagens de source/destination/name exatas: {'sim' if contagens_exatas else 'não'}")
+    return 0 if contagens_exatas else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
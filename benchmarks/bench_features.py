@@ -0,0 +1,85 @@
+"""Benchmark das matrizes de features: One-Hot denso (get_dummies) × CSR/categórico.
+
+Para cada modelo mede o tempo de fit e o pico de memória alocada durante o
+fit (tracemalloc, que enxerga os buffers do numpy), além do tamanho de X.
+
+    python benchmarks/bench_features.py --linhas 200000
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sklearn.base import clone  # noqa: E402
+from sklearn.ensemble import (  # noqa: E402
+    RandomForestRegressor, AdaBoostRegressor, BaggingRegressor, HistGradientBoostingRegressor
+)
+from sklearn.linear_model import LinearRegression  # noqa: E402
+from sklearn.pipeline import Pipeline  # noqa: E402
+from sklearn.preprocessing import StandardScaler  # noqa: E402
+from sklearn.svm import SVR  # noqa: E402
+from sklearn.tree import DecisionTreeRegressor  # noqa: E402
+
+from uber_price import models  # noqa: E402
+from uber_price.data import limparDados, filtrar_uber  # noqa: E402
+from uber_price.features import codificar, separar_xy, selecionar_features  # noqa: E402
+from uber_price.sintetico import gerar_corridas  # noqa: E402
+
+RS = models.RANDOM_STATE
+
+# (nome, modelo no caminho denso antigo, modelo atual, parâmetros comuns, usa subamostra de 20k)
+CASOS = [
+    ("LinearRegression", Pipeline([("scaler", StandardScaler()), ("lr", LinearRegression())]), models.pipe_lr, {}, False),
+    ("SVR", Pipeline([("scaler", StandardScaler()), ("svr", SVR())]), models.pipe_svr, {}, True),
+    ("RandomForest", RandomForestRegressor(n_estimators=50, max_depth=15, max_features="sqrt", random_state=RS),
+     models.pipe_rf, {"rf__n_estimators": 50, "rf__max_depth": 15, "rf__oob_score": False,
+      "rf__max_features": "sqrt"}, False),
+    ("AdaBoost", AdaBoostRegressor(estimator=DecisionTreeRegressor(max_depth=2), n_estimators=50, random_state=RS),
+     models.pipe_ada, {"ada__n_estimators": 50}, False),
+    ("HistGradientBoosting", HistGradientBoostingRegressor(max_iter=200, random_state=RS),
+     models.pipe_hgb, {"max_iter": 200}, False),
+    ("Bagging", BaggingRegressor(estimator=DecisionTreeRegressor(max_depth=10, random_state=RS), n_estimators=20,
+                                 random_state=RS),
+     models.pipe_bag, {"bag__n_estimators": 20, "bag__estimator__max_depth": 10, "bag__oob_score": False}, False),
+]
+
+
+def medir_fit(modelo, X, y):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    modelo.fit(X, y)
+    dt = time.perf_counter() - t0
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return dt, pico / 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, default=200_000, help="corridas sintéticas (antes de filtrar o Lyft)")
+    parser.add_argument("--modelos", nargs="*", help="subconjunto de modelos (padrão: todos)")
+    args = parser.parse_args(argv)
+
+    df = filtrar_uber(limparDados(gerar_corridas(args.linhas), compacto=True))
+    X_denso, y = separar_xy(codificar(df))
+    X_novo, _ = selecionar_features(df)
+    print(f"linhas: {len(df):,}")
+    print(f"X denso:   {X_denso.shape[1]:>3} colunas, {X_denso.memory_usage(deep=True).sum() / 1e6:7.1f} MB")
+    print(f"X compacto:{X_novo.shape[1]:>3} colunas, {X_novo.memory_usage(deep=True).sum() / 1e6:7.1f} MB\n")
+
+    print(f"{'modelo':<22}{'fit denso (s)':>14}{'fit novo (s)':>13}{'mem denso (MB)':>16}{'mem novo (MB)':>15}")
+    for nome, denso, novo, params, sub in CASOS:
+        if args.modelos and nome not in args.modelos:
+            continue
+        idx = X_novo.sample(min(20_000, len(X_novo)), random_state=RS).index if sub else X_novo.index
+        t_d, m_d = medir_fit(clone(denso), X_denso.loc[idx], y.loc[idx])
+        t_n, m_n = medir_fit(clone(novo).set_params(**params), X_novo.loc[idx], y.loc[idx])
+        print(f"{nome:<22}{t_d:>14.2f}{t_n:>13.2f}{m_d:>16.1f}{m_n:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
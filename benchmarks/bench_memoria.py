@@ -0,0 +1,73 @@
+"""Benchmark de pico de memória (RSS): limpeza inteira × limpeza em chunks.
+
+Cada medição roda num processo novo, para que o pico de um modo não
+contamine o outro. Com ``cachear_em_chunks`` o pico deve ficar estável
+quando o CSV cresce; com ``limparDados(pd.read_csv(...))`` ele cresce junto.
+
+    python benchmarks/bench_memoria.py --linhas 100000 300000 700000
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+
+SONDA = """
+import json, resource, sys
+import pandas as pd, pyarrow
+from uber_price.cache import cachear_em_chunks, limpar_com_cache
+
+def pico_kb():
+    # VmHWM é zerado no exec; ru_maxrss herda o pico do processo pai no Linux
+    try:
+        with open("/proc/self/status") as f:
+            return next(int(l.split()[1]) for l in f if l.startswith("VmHWM:"))
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+base = pico_kb()
+modo, csv, raiz, chunksize = sys.argv[1:]
+if modo == "inteiro":
+    limpar_com_cache(csv, raiz=raiz)
+else:
+    cachear_em_chunks(csv, raiz=raiz, chunksize=int(chunksize))
+pico = pico_kb()
+print(json.dumps({"base_mb": base / 1024, "pico_mb": pico / 1024}))
+"""
+
+
+def medir(modo, csv, chunksize):
+    with tempfile.TemporaryDirectory() as raiz:
+        out = subprocess.run([sys.executable, "-c", SONDA, modo, str(csv), raiz, str(chunksize)],
+                             cwd=RAIZ, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, nargs="+", default=[100_000, 300_000, 700_000])
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(RAIZ))
+    from uber_price.sintetico import gerar_corridas
+
+    print(f"{'linhas':>10} {'CSV (MB)':>9} {'inteiro (MB)':>13} {'chunks (MB)':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.linhas:
+            csv = Path(tmp) / f"corridas_{n}.csv"
+            gerar_corridas(n).to_csv(csv, index=False)
+            inteiro = medir("inteiro", csv, args.chunksize)
+            chunks = medir("chunks", csv, args.chunksize)
+            print(f"{n:>10,} {csv.stat().st_size / 1e6:>9.0f} "
+                  f"{inteiro['pico_mb'] - inteiro['base_mb']:>13.0f} {chunks['pico_mb'] - chunks['base_mb']:>12.0f}")
+            csv.unlink()
+    print("valores: pico de RSS acima do processo já com pandas/pyarrow importados")
+
+
+if __name__ == "__main__":
+    main()
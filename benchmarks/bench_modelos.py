@@ -0,0 +1,245 @@
+"""Benchmark do zoológico de modelos: custo (fit, predict, memória, tamanho) e acurácia.
+
+Para cada modelo de ``uber_price.models`` (mais o baseline linear e o
+Stacking) e cada tamanho de dataset sintético (``uber_price.sintetico``),
+mede num processo novo:
+
+* tempo de fit e pico de RSS durante o fit (VmHWM acima do processo já com X carregado);
+* latência de predict de uma linha (p50/p99 de ``--repeticoes`` chamadas) e
+  vazão de predict em lote (``--lote`` linhas);
+* tamanho do modelo serializado (joblib) e RMSE/MAE/R² no split 80/20.
+
+Os modelos buscados numa subamostra no pipeline (``subsample`` em
+``models.MODELOS``) treinam com até 20 mil linhas, como lá. Os
+hiperparâmetros são fixos (``PARAMETROS``), para que execuções diferentes
+meçam a mesma coisa. O resultado vai para um JSON; com ``--baseline`` cada
+medida é comparada com a de um JSON anterior e o script sai com código 1 se
+alguma piorar além da tolerância.
+
+    python benchmarks/bench_modelos.py --linhas 20000 100000 --saida resultados.json
+    python benchmarks/bench_modelos.py --baseline benchmarks/baseline_modelos.json
+    python benchmarks/bench_modelos.py --atualizar-baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+BASELINE_PADRAO = Path(__file__).resolve().parent / "baseline_modelos.json"
+
+# Hiperparâmetros fixos do benchmark (os do pipeline vêm da busca)
+PARAMETROS = {
+    "LinearRegression": {},
+    "RandomForest": {"rf__n_estimators": 100, "rf__max_depth": 15, "rf__max_features": "sqrt",
+                     "rf__oob_score": False},
+    "SVR": {"svr__C": 10.0, "svr__gamma": 0.1, "svr__epsilon": 0.1},
+    "KernelAproximado": {"kernel__n_components": 1000, "kernel__gamma": 0.01, "kernel__alpha": 1e-3},
+    "AdaBoost": {"ada__n_estimators": 100, "ada__learning_rate": 0.1},
+    "HistGradientBoosting": {"max_iter": 200, "learning_rate": 0.1},
+    "Bagging": {"bag__n_estimators": 50, "bag__estimator__max_depth": 10, "bag__oob_score": False},
+}
+MODELOS = [*PARAMETROS, "Stacking"]
+
+# métrica -> sentido em que piora ("maior" = valores maiores são piores); o p99 de
+# uma linha é ruidoso demais para reprovar a execução e só aparece na tabela
+COMPARACAO = {
+    "fit_s": "maior", "pico_mb": "maior", "predict_1_p50_ms": "maior",
+    "predict_lote_linhas_s": "menor", "tamanho_mb": "maior", "rmse": "maior",
+}
+
+
+def pico_mb():
+    with open("/proc/self/status") as f:
+        return next(int(linha.split()[1]) for linha in f if linha.startswith("VmHWM:")) / 1024
+
+
+def processador():
+    """Modelo da CPU (``/proc/cpuinfo``; ``platform.processor()`` costuma vir vazio no Linux)."""
+    try:
+        with open("/proc/cpuinfo") as f:
+            return next(linha.split(":", 1)[1].strip() for linha in f if linha.startswith("model name"))
+    except (OSError, StopIteration):
+        return platform.processor()
+
+
+def construir(nome):
+    """``(estimador, usa_subamostra)`` com os hiperparâmetros de ``PARAMETROS``."""
+    from sklearn.base import clone
+    from uber_price import models
+
+    if nome == "LinearRegression":
+        return clone(models.pipe_lr), False
+    if nome == "Stacking":
+        return None, False
+    estimador, subsample = {n: (e, s) for n, e, _, s in models.MODELOS}[nome]
+    return clone(estimador).set_params(**PARAMETROS[nome]), subsample
+
+
+def medir(nome, caminho, repeticoes, lote):
+    """Roda no processo filho: ajusta e mede ``nome`` no Feather ``caminho``."""
+    import io
+    import time
+
+    import joblib
+    import numpy as np
+    from uber_price.busca import TAMANHO_SUBAMOSTRA
+    from uber_price.cache import ler_feather
+    from uber_price.eval import eval_model
+    from uber_price.features import dividir, selecionar_features
+    from uber_price.models import RANDOM_STATE
+
+    X_train, X_test, y_train, y_test = dividir(*selecionar_features(ler_feather(caminho)))
+    estimador, subsample = construir(nome)
+    if subsample and len(X_train) > TAMANHO_SUBAMOSTRA:
+        X_train = X_train.sample(TAMANHO_SUBAMOSTRA, random_state=RANDOM_STATE)
+        y_train = y_train.loc[X_train.index]
+
+    base = pico_mb()
+    inicio = time.perf_counter()
+    if nome == "Stacking":  # o blender do pipeline, aqui sem predições out-of-fold guardadas
+        from uber_price.empilhamento import empilhar
+
+        bases = [(curto, construir(n)[0]) for curto, n in
+                 [("lr", "LinearRegression"), ("hgb", "HistGradientBoosting"), ("bag", "Bagging")]]
+        modelo = empilhar(bases, X_train, y_train, reajustar=[c for c, _ in bases], n_jobs=1, verbose=0)
+    else:
+        modelo = estimador.fit(X_train, y_train)
+    fit_s = time.perf_counter() - inicio
+    pico = pico_mb() - base
+
+    linhas = [X_test.iloc[[i % len(X_test)]] for i in range(repeticoes)]
+    modelo.predict(linhas[0])  # aquece caches e imports tardios
+    tempos = []
+    for x in linhas:
+        t0 = time.perf_counter()
+        modelo.predict(x)
+        tempos.append((time.perf_counter() - t0) * 1000)
+    X_lote = X_test.iloc[:lote]
+    lote_s = min(_cronometrar(modelo.predict, X_lote) for _ in range(3))
+
+    buffer = io.BytesIO()
+    joblib.dump(modelo, buffer)
+    metricas = eval_model(nome, modelo, X_test, y_test)
+    return {
+        "modelo": nome, "linhas_treino": int(len(X_train)), "linhas_teste": int(len(X_test)),
+        "fit_s": fit_s, "pico_mb": pico,
+        "predict_1_p50_ms": float(np.percentile(tempos, 50)), "predict_1_p99_ms": float(np.percentile(tempos, 99)),
+        "predict_lote_linhas_s": len(X_lote) / lote_s, "tamanho_mb": buffer.getbuffer().nbytes / 1e6,
+        "rmse": float(metricas["RMSE_test"]), "mae": float(metricas["MAE_test"]), "r2": float(metricas["R2_test"]),
+    }
+
+
+def _cronometrar(funcao, *args):
+    import time
+
+    t0 = time.perf_counter()
+    funcao(*args)
+    return time.perf_counter() - t0
+
+
+def comparar(resultados, baseline, tolerancia, tolerancia_rmse):
+    """Imprime a razão atual/baseline de cada medida; retorna as regressões encontradas."""
+    anteriores = {(r["modelo"], r["linhas"]): r for r in baseline["resultados"]}
+    regressoes, comparados = [], 0
+    print(f"\ncomparação com o baseline de {baseline['meta']['data']} (razão atual / baseline)")
+    print(f"{'modelo':<22}{'linhas':>9}" + "".join(f"{m:>{len(m) + 3}}" for m in COMPARACAO))
+    for r in resultados:
+        anterior = anteriores.get((r["modelo"], r["linhas"]))
+        if anterior is None:
+            continue
+        comparados += 1
+        celulas = []
+        for metrica, sentido in COMPARACAO.items():
+            razao = r[metrica] / anterior[metrica] if anterior[metrica] else float("nan")
+            limite = tolerancia_rmse if metrica == "rmse" else tolerancia
+            piorou = razao > 1 + limite if sentido == "maior" else razao < 1 / (1 + limite)
+            if piorou:
+                regressoes.append(f"{r['modelo']} ({r['linhas']:,} linhas): {metrica} {razao:.2f}x")
+            celulas.append(f"{razao:>{len(metrica) + 2}.2f}{'!' if piorou else ' '}")
+        print(f"{r['modelo']:<22}{r['linhas']:>9,}" + "".join(celulas))
+    if not comparados:
+        print("nenhum par (modelo, linhas) em comum com o baseline; nada comparado")
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--linhas", type=int, nargs="+", default=[20_000, 100_000],
+                        help="corridas sintéticas por tamanho (antes de filtrar o Lyft)")
+    parser.add_argument("--modelos", nargs="+", choices=MODELOS, default=MODELOS)
+    parser.add_argument("--repeticoes", type=int, default=200, help="predicts de uma linha por modelo")
+    parser.add_argument("--lote", type=int, default=10_000, help="linhas do predict em lote")
+    parser.add_argument("--saida", help="JSON com os resultados")
+    parser.add_argument("--baseline", help=f"JSON de referência (padrão: {BASELINE_PADRAO.name}, se existir)")
+    parser.add_argument("--atualizar-baseline", action="store_true", help="grava os resultados como o novo baseline")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="piora relativa aceita em tempo/memória/tamanho")
+    parser.add_argument("--tolerancia-rmse", type=float, default=0.02, help="piora relativa aceita no RMSE")
+    parser.add_argument("--medir", nargs=4, help=argparse.SUPPRESS)  # modo do processo filho
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(RAIZ))
+    if args.medir:
+        nome, caminho, repeticoes, lote = args.medir
+        print(json.dumps(medir(nome, caminho, int(repeticoes), int(lote))))
+        return 0
+
+    import numpy
+    import pandas
+    import sklearn
+    from uber_price.data import filtrar_uber, limparDados
+    from uber_price.sintetico import gerar_corridas
+
+    resultados = []
+    print(f"{'modelo':<22}{'linhas':>9}{'fit (s)':>9}{'pico (MB)':>10}{'1 linha p50/p99 (ms)':>22}"
+          f"{'lote (linhas/s)':>16}{'tamanho (MB)':>13}{'RMSE':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.linhas:
+            caminho = Path(tmp) / f"corridas_{n}.feather"
+            filtrar_uber(limparDados(gerar_corridas(n), compacto=True)).reset_index(drop=True).to_feather(caminho)
+            for nome in args.modelos:
+                out = subprocess.run([sys.executable, __file__, "--medir", nome, str(caminho), str(args.repeticoes),
+                                      str(args.lote)], cwd=RAIZ, capture_output=True, text=True, check=True)
+                r = {"linhas": n, **json.loads(out.stdout.strip().splitlines()[-1])}
+                resultados.append(r)
+                print(f"{nome:<22}{n:>9,}{r['fit_s']:>9.2f}{r['pico_mb']:>10.0f}"
+                      f"{r['predict_1_p50_ms']:>12.2f} / {r['predict_1_p99_ms']:<7.2f}"
+                      f"{r['predict_lote_linhas_s']:>16,.0f}{r['tamanho_mb']:>13.2f}{r['rmse']:>8.4f}", flush=True)
+
+    relatorio = {
+        "meta": {
+            "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(), "sklearn": sklearn.__version__, "numpy": numpy.__version__,
+            "pandas": pandas.__version__, "maquina": platform.machine(), "processador": processador(),
+            "cpus": os.cpu_count(),
+            "parametros": PARAMETROS, "repeticoes": args.repeticoes, "lote": args.lote,
+        },
+        "resultados": resultados,
+    }
+    if args.saida:
+        Path(args.saida).write_text(json.dumps(relatorio, indent=2))
+    if args.atualizar_baseline:
+        BASELINE_PADRAO.write_text(json.dumps(relatorio, indent=2))
+        print(f"\nbaseline gravado em {BASELINE_PADRAO}")
+        return 0
+
+    baseline = Path(args.baseline) if args.baseline else BASELINE_PADRAO
+    if not baseline.is_file():
+        if args.baseline:
+            raise FileNotFoundError(f"Baseline {baseline} não encontrado")
+        print(f"\nsem baseline ({baseline} não existe); nada comparado. Gere um com --atualizar-baseline")
+        return 0
+    regressoes = comparar(resultados, json.loads(baseline.read_text()), args.tolerancia, args.tolerancia_rmse)
+    for regressao in regressoes:
+        print(f"REGRESSÃO: {regressao}")
+    return 1 if regressoes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
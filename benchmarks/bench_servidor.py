@@ -0,0 +1,118 @@
+"""Benchmark do servidor de predição: micro-lotes × um ``predict`` por requisição.
+
+Treina o simulador com dados sintéticos num registro temporário, sobe
+``python -m uber_price servir`` num processo separado e dispara requisições
+de uma cotação cada, com ``--concorrencia`` conexões keep-alive simultâneas.
+Mostra a latência vista pelo cliente (p50/p99), a vazão e o tamanho médio
+dos lotes informado por ``GET /stats``.
+
+    python benchmarks/bench_servidor.py --requisicoes 5000 --concorrencia 64
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+RAIZ = Path(__file__).resolve().parents[1]
+
+
+async def _http(reader, writer, metodo, caminho, corpo=b""):
+    writer.write(f"{metodo} {caminho} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(corpo)}\r\n\r\n".encode() + corpo)
+    await writer.drain()
+    cabecalhos = {}
+    status = int((await reader.readline()).split()[1])
+    while (linha := await reader.readline()) not in (b"\r\n", b""):
+        chave, _, valor = linha.decode().partition(":")
+        cabecalhos[chave.strip().lower()] = valor.strip()
+    return status, json.loads(await reader.readexactly(int(cabecalhos["content-length"])))
+
+
+async def _cliente(porta, corpos, latencias):
+    reader, writer = await asyncio.open_connection("127.0.0.1", porta)
+    for corpo in corpos:
+        inicio = time.perf_counter()
+        status, resposta = await _http(reader, writer, "POST", "/prever", corpo)
+        latencias.append((time.perf_counter() - inicio) * 1000)
+        if status != 200 or "erro" in resposta:  # senão a medida seria do caminho de erro
+            raise RuntimeError(f"/prever respondeu {status}: {resposta}")
+    writer.close()
+
+
+async def _carga(porta, requisicoes, concorrencia, servicos):
+    rng = np.random.default_rng(0)
+    corpos = [json.dumps({"distance": float(d), "surge_multiplier": 1.0, "hour": int(h), "name": servicos[s]}).encode()
+              for d, h, s in zip(rng.uniform(0.5, 8, requisicoes), rng.integers(0, 24, requisicoes),
+                                 rng.integers(0, len(servicos), requisicoes))]
+    latencias = []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(_cliente(porta, corpos[i::concorrencia], latencias) for i in range(concorrencia)))
+    segundos = time.perf_counter() - inicio
+    reader, writer = await asyncio.open_connection("127.0.0.1", porta)
+    _, stats = await _http(reader, writer, "GET", "/stats")
+    writer.close()
+    if stats["lotes"] == 0:
+        raise RuntimeError(f"nenhum lote executado: {stats}")
+    p50, p99 = np.percentile(latencias, [50, 99])
+    return {"p50": p50, "p99": p99, "req_s": requisicoes / segundos, "lote": stats["cotacoes_por_lote"]}
+
+
+async def _esperar(porta, processo):
+    for _ in range(300):
+        if processo.poll() is not None:
+            raise RuntimeError("servidor terminou antes de ficar pronto")
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", porta)
+        except OSError:
+            await asyncio.sleep(0.1)
+            continue
+        writer.close()
+        return
+    raise TimeoutError("servidor não respondeu")
+
+
+def medir(registro, porta, max_lote, janela_ms, requisicoes, concorrencia, servicos):
+    env = {**os.environ, "UBER_PRICE_MODELOS": registro, "PYTHONPATH": str(RAIZ)}
+    processo = subprocess.Popen([sys.executable, "-m", "uber_price", "servir", "--porta", str(porta),
+                                 "--max-lote", str(max_lote), "--janela-ms", str(janela_ms)],
+                                cwd=RAIZ, env=env, stdout=subprocess.DEVNULL)
+    try:
+        asyncio.run(_esperar(porta, processo))
+        return asyncio.run(_carga(porta, requisicoes, concorrencia, servicos))
+    finally:
+        processo.terminate()
+        processo.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requisicoes", type=int, default=5000)
+    parser.add_argument("--concorrencia", type=int, default=64)
+    parser.add_argument("--janela-ms", type=float, default=2.0)
+    parser.add_argument("--porta", type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(RAIZ))
+    from uber_price.data import limparDados, filtrar_uber
+    from uber_price.registry import carregar_codificador
+    from uber_price.simulador import NOME_SIMULADOR, registrar_simulador
+    from uber_price.sintetico import gerar_corridas
+
+    with tempfile.TemporaryDirectory() as registro:
+        registrar_simulador(filtrar_uber(limparDados(gerar_corridas(100_000), compacto=True)), raiz=registro)
+        servicos = [str(s) for s in carregar_codificador(NOME_SIMULADOR, raiz=registro).categorias_["name"]]
+        print(f"{'modo':<16}{'p50 (ms)':>10}{'p99 (ms)':>10}{'req/s':>10}{'cotações/lote':>15}")
+        for modo, max_lote in [("sem micro-lote", 1), ("micro-lote", 1024)]:
+            r = medir(registro, args.porta, max_lote, args.janela_ms, args.requisicoes, args.concorrencia, servicos)
+            print(f"{modo:<16}{r['p50']:>10.1f}{r['p99']:>10.1f}{r['req_s']:>10,.0f}{r['lote']:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark de inicialização: tempo de ``import uber_price`` em um processo novo.
+
+Falha (código de saída 1) se a mediana passar do orçamento ou se o import
+carregar módulos pesados/de rede (scikit-learn, kagglehub, matplotlib, seaborn).
+
+    python benchmarks/bench_startup.py --orcamento 1.5 --repeticoes 7
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+
+MODULOS_PROIBIDOS = ["sklearn", "kagglehub", "matplotlib", "seaborn"]
+
+SONDA = """
+import json, sys, time
+t0 = time.perf_counter()
+import uber_price
+dt = time.perf_counter() - t0
+print(json.dumps({"segundos": dt, "modulos": sorted(m for m in %r if m in sys.modules)}))
+""" % (MODULOS_PROIBIDOS,)
+
+
+def medir():
+    out = subprocess.run([sys.executable, "-c", SONDA], cwd=RAIZ, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orcamento", type=float, default=1.5, help="tempo máximo (s) para a mediana do import")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    medidas = [medir() for _ in range(args.repeticoes)]
+    tempos = [m["segundos"] for m in medidas]
+    carregados = sorted({mod for m in medidas for mod in m["modulos"]})
+    mediana = statistics.median(tempos)
+
+    print(f"import uber_price: mediana {mediana * 1000:.1f} ms "
+          f"(min {min(tempos) * 1000:.1f} ms, max {max(tempos) * 1000:.1f} ms, n={len(tempos)})")
+    print(f"orçamento: {args.orcamento * 1000:.0f} ms")
+
+    ok = True
+    if carregados:
+        print(f"FALHA: o import carregou módulos pesados: {', '.join(carregados)}")
+        ok = False
+    if mediana > args.orcamento:
+        print("FALHA: import acima do orçamento")
+        ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
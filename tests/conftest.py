@@ -0,0 +1,17 @@
+import pytest
+
+from uber_price.data import filtrar_uber, limparDados
+from uber_price.features import dividir, selecionar_features
+from uber_price.sintetico import gerar_corridas
+
+
+@pytest.fixture(scope="session")
+def corridas():
+    """Corridas sintéticas limpas (Uber e Lyft), como saem de ``limparDados``."""
+    return limparDados(gerar_corridas(3000, seed=7), compacto=True)
+
+
+@pytest.fixture(scope="session")
+def treino(corridas):
+    """``(X_train, X_test, y_train, y_test)`` das corridas Uber."""
+    return dividir(*selecionar_features(filtrar_uber(corridas)))
@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+from sklearn.base import clone
+
+from uber_price.arvores import exportar
+from uber_price.models import pipe_ada, pipe_bag, pipe_rf
+
+
+@pytest.mark.parametrize("pipe", [pipe_rf, pipe_bag], ids=["rf", "bag"])
+def test_exportar_florestas_coincide_com_predict(treino, pipe):
+    X_train, X_test, y_train, _ = treino
+    modelo = clone(pipe).set_params(**{f"{pipe.steps[-1][0]}__n_estimators": 5}).fit(X_train, y_train)
+    np.testing.assert_allclose(exportar(modelo).predict(X_test), modelo.predict(X_test), rtol=1e-5)
+
+
+def test_exportar_rejeita_adaboost(treino):
+    X_train, _, y_train, _ = treino
+    modelo = clone(pipe_ada).set_params(ada__n_estimators=5).fit(X_train, y_train)
+    with pytest.raises(TypeError, match="AdaBoostRegressor"):
+        exportar(modelo)
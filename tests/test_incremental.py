@@ -0,0 +1,21 @@
+import pytest
+from sklearn.base import clone
+
+from uber_price.empilhamento import Empilhamento
+from uber_price.incremental import atualizar_modelo
+from uber_price.models import pipe_lr, pipe_rf
+
+
+def test_atualizar_floresta_acrescenta_arvores(treino):
+    X_train, X_test, y_train, y_test = treino
+    modelo = clone(pipe_rf).set_params(rf__n_estimators=5, rf__oob_score=False).fit(X_train, y_train)
+    atualizar_modelo(modelo, X_test, y_test, n_novos=2)
+    assert len(modelo[-1].estimators_) == 7
+
+
+def test_atualizar_rejeita_stacking(treino):
+    X_train, X_test, y_train, y_test = treino
+    lr = clone(pipe_lr).fit(X_train, y_train)
+    stacking = Empilhamento([("lr", lr)], clone(pipe_lr[-1]).fit(lr.predict(X_train)[:, None], y_train))
+    with pytest.raises(TypeError, match="não suporta atualização incremental"):
+        atualizar_modelo(stacking, X_test, y_test)
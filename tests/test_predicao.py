@@ -0,0 +1,27 @@
+import numpy as np
+from sklearn.ensemble import HistGradientBoostingRegressor
+
+from uber_price.data import filtrar_uber
+from uber_price.predicao import COLUNA_PREDICAO, prever_chunk
+from uber_price.preprocessing import CodificadorCategorias
+from uber_price.registry import salvar_modelo
+from uber_price.simulador import FEATURES_SIMULADOR
+from uber_price.sintetico import gerar_corridas
+
+
+def test_prever_chunk_sem_preco_para_lyft_e_servico_desconhecido(corridas, tmp_path):
+    uber = filtrar_uber(corridas)
+    X, y = uber[FEATURES_SIMULADOR], uber["price"]
+    modelo = HistGradientBoostingRegressor(max_iter=10, categorical_features="from_dtype").fit(X, y)
+    salvar_modelo(modelo, "teste", X, y, raiz=tmp_path, codificador=CodificadorCategorias().fit(uber))
+
+    chunk = gerar_corridas(500, seed=3)
+    chunk.loc[chunk.index[0], ["cab_type", "name"]] = ["Uber", "UberMoto"]
+    saida = prever_chunk(chunk, "teste", 1, tmp_path, manter=("cab_type", "name"))
+
+    # Taxi é Uber no dataset, mas sem preço: fica fora do treino, como o UberMoto
+    invalidas = (saida["cab_type"] != "Uber") | ~saida["name"].isin(uber["name"].unique())
+    assert (saida["cab_type"] == "Lyft").any() and (saida["name"] == "UberMoto").any()
+    assert 0 < invalidas.sum() < len(saida)
+    assert saida.loc[invalidas, COLUNA_PREDICAO].isna().all()
+    assert np.isfinite(saida.loc[~invalidas, COLUNA_PREDICAO]).all()
@@ -0,0 +1,39 @@
+import threading
+import time
+
+import pytest
+
+from uber_price.recursos import CacheLRU
+
+
+def test_fabrica_roda_uma_vez_com_sessoes_concorrentes():
+    cache, chamadas = CacheLRU(), []
+
+    def fabrica():
+        chamadas.append(1)
+        time.sleep(0.01)
+        return b"x"
+
+    threads = [threading.Thread(target=cache.obter, args=("k", fabrica), kwargs={"tamanho": 1}) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(chamadas) == 1
+
+
+def test_trava_solta_quando_a_fabrica_falha():
+    cache = CacheLRU()
+    with pytest.raises(RuntimeError):
+        cache.obter("k", lambda: (_ for _ in ()).throw(RuntimeError("falhou")))
+    assert cache._travas_chave == {}
+
+
+def test_trava_solta_com_item_rejeitado_ou_despejado():
+    cache = CacheLRU(orcamento_mb=1 / 1024)  # 1 KB
+    cache.obter("grande", lambda: b"", tamanho=2048)
+    for chave in range(4):
+        cache.obter(chave, lambda: b"", tamanho=400)
+    assert set(cache._travas_chave) == set(cache._itens) == {2, 3}
+    cache.limpar()
+    assert cache._travas_chave == {}
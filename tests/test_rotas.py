@@ -0,0 +1,21 @@
+import numpy as np
+
+from uber_price.data import filtrar_uber
+from uber_price.features import montar_X
+from uber_price.rotas import aplicar_duracao, construir_tabela, descrever_duracao
+
+META = {"features": [["distance", "float32"], ["duration", "float32"], ["hour", "int8"]]}
+
+
+def test_duracao_do_treino_igual_a_do_servico(corridas):
+    uber = filtrar_uber(corridas)
+    tabela = construir_tabela(uber)
+    treino = aplicar_duracao(uber[["distance", "duration", "hour"]], tabela, uber)
+    servico = montar_X(uber[["source", "destination", "hour", "distance"]], META, rotas=tabela)
+    np.testing.assert_array_equal(treino["duration"].to_numpy(), servico["duration"].to_numpy())
+
+
+def test_descrever_duracao_registra_ritmos(corridas):
+    descricao = descrever_duracao(construir_tabela(filtrar_uber(corridas)))
+    assert descricao["origem"] == "rotas"
+    assert np.allclose(descricao["ritmo_min_por_milha"], descricao["ritmo_sem_rota"], rtol=1e-5)
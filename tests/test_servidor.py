@@ -0,0 +1,30 @@
+import pytest
+
+from uber_price.servidor import validar
+
+META = {"features": [["distance", "float32"], ["duration", "float32"], ["surge_multiplier", "float32"],
+                     ["hour", "int8"], ["name", "category"]]}
+
+
+def cotacao(**campos):
+    return {"distance": 3.5, "duration": 10.5, "surge_multiplier": 1.0, "hour": 17, "name": "UberX", **campos}
+
+
+def test_validar_aceita_cotacao_valida():
+    validar([cotacao(), cotacao(hour=0, distance=0)], META)
+
+
+@pytest.mark.parametrize("campos, mensagem", [
+    ({"hour": 99}, "fora da faixa"),
+    ({"hour": 10 ** 10}, "fora da faixa"),
+    ({"hour": 3.5}, "inteiro"),
+    ({"distance": -1.0}, "fora da faixa"),
+    ({"distance": float("nan")}, "finito"),
+    ({"duration": float("inf")}, "finito"),
+    ({"surge_multiplier": True}, "numérico"),
+    ({"distance": "3.5"}, "numérico"),
+    ({"name": 3}, "texto"),
+])
+def test_validar_rejeita(campos, mensagem):
+    with pytest.raises(ValueError, match=mensagem):
+        validar([cotacao(**campos)], META)
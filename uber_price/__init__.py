@@ -0,0 +1,10 @@
+"""Pacote do projeto de previsão de preços Uber (NCIA / FPF Tech).
+
+Importar o pacote não faz nenhum I/O: o download do Kaggle, a limpeza,
+os gráficos e o treinamento só rodam quando chamados explicitamente
+(``run_pipeline()`` ou ``python -m uber_price``).
+"""
+
+from uber_price.data import limparDados, load_kaggle_data, carregar_dados, filtrar_uber
+
+__all__ = ["limparDados", "load_kaggle_data", "carregar_dados", "filtrar_uber"]
@@ -0,0 +1,3 @@
+from uber_price.cli import main
+
+main()
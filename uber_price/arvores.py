@@ -0,0 +1,332 @@
+"""Inferência de ensembles de árvores em NumPy puro, sem o scikit-learn.
+
+O ``predict`` do RandomForest e do Bagging chama cada árvore separadamente
+(e o Bagging ainda recorta as colunas de cada uma); com uma linha por vez o
+custo é quase todo esse despacho em Python. ``exportar`` achata todas as
+árvores de um modelo treinado (``models.pipe_hgb``, ``pipe_rf``, ``pipe_bag``
+ou um ``incremental.ModeloResidual`` sobre o HGB) em arrays contíguos:
+``feature``, ``limiar``, ``filhos`` (esquerdo, direito), ``valor``,
+``faltante_esquerda`` e, para os splits categóricos do HGB, um bitset de
+256 categorias por nó. ``ArvoresCompiladas.predict`` percorre todas as
+árvores de todas as linhas de uma vez, um nível por iteração (as folhas
+apontam para si mesmas), e não importa o scikit-learn.
+
+O X de entrada é o de ``features.selecionar_features``. ``preparar`` monta
+a matriz das árvores com o pandas, sem os transformadores do sklearn: no
+RF/Bagging, as indicadoras do One-Hot (a categoria descartada pelo
+``drop="first"`` e as desconhecidas ficam com todas em 0); no HGB, o código
+de cada categórica na ordem das categorias do treino, e categorias
+desconhecidas seguem o lado dos valores faltantes, como no sklearn. As
+comparações usam o mesmo dtype do sklearn (``float32`` nas árvores do
+RF/Bagging, ``float64`` no HGB), então as predições coincidem até o
+arredondamento da soma.
+
+``salvar``/``carregar`` usam ``.npz`` (sem pickle).
+"""
+
+import json
+
+import numpy as np
+
+_PALAVRAS = 8  # bitset de 256 categorias em uint32, como no HistGradientBoosting
+_ELEMENTOS_POR_BLOCO = 1 << 17  # pares (linha, árvore) por passo do percurso
+
+
+class ArvoresCompiladas:
+    """Ensemble de árvores em arrays NumPy; ``agregacao`` é ``"soma"`` (boosting) ou ``"media"``."""
+
+    def __init__(self, colunas, raizes, feature, limiar, filhos, valor, faltante_esquerda, bitset, bitsets,
+                 profundidade, agregacao="soma", base=0.0, float32=False):
+        self.colunas = list(colunas)
+        self.raizes = np.asarray(raizes, dtype=np.intp)
+        self.feature = np.asarray(feature, dtype=np.intp)
+        self.limiar = np.asarray(limiar, dtype=np.float64)
+        self.filhos = np.asarray(filhos, dtype=np.intp).reshape(-1, 2)
+        self.valor = np.asarray(valor, dtype=np.float64)
+        self.faltante_esquerda = np.asarray(faltante_esquerda, dtype=bool)
+        self.bitset = np.asarray(bitset, dtype=np.intp)  # -1: split numérico
+        self.bitsets = np.asarray(bitsets, dtype=np.uint32).reshape(-1, _PALAVRAS)
+        self.profundidade = int(profundidade)
+        self.agregacao = agregacao
+        self.base = float(base)
+        self.float32 = bool(float32)
+        self._filhos_planos = self.filhos.ravel()
+        self._folha = self.filhos[:, 0] == np.arange(len(self.filhos))
+        self._categorico = self.bitset >= 0
+        self._tem_categorico = bool(self._categorico.any())
+        self._bitsets_planos = self.bitsets.ravel().astype(np.int64)
+        self._plano = self._planejar_entrada()
+
+    @property
+    def n_arvores(self):
+        return len(self.raizes)
+
+    # --- entrada ----------------------------------------------------------------
+    def preparar(self, X):
+        """Matriz ``(n, len(colunas))`` na ordem das colunas das árvores a partir do X do treino."""
+        import pandas as pd
+
+        num, ind, cod, grupos = self._plano
+        saida = np.empty((len(X), len(self.colunas)), dtype=np.float32 if self.float32 else np.float64)
+        for j, nome in num:
+            saida[:, j] = X[nome].to_numpy()
+        if grupos:
+            codigos = np.empty((len(X), len(grupos)), dtype=np.int64)
+            for g, (nome, categorias) in enumerate(grupos):
+                serie = X[nome]
+                if isinstance(serie.dtype, pd.CategoricalDtype) and serie.cat.categories.tolist() == categorias:
+                    codigos[:, g] = serie.cat.codes.to_numpy()
+                else:
+                    codigos[:, g] = pd.Categorical(serie, categories=categorias).codes
+            # indicadoras: a categoria descartada e as desconhecidas (código -1) ficam com todas em 0
+            saida[:, ind[0]] = codigos[:, ind[1]] == ind[2]
+            # códigos: desconhecida -> NaN (lado dos faltantes)
+            c = codigos[:, cod[1]]
+            saida[:, cod[0]] = np.where(c < 0, np.nan, c)
+        return saida
+
+    def _planejar_entrada(self):
+        num, grupos, ind, cod = [], {}, ([], [], []), ([], [])
+        for j, col in enumerate(self.colunas):
+            if col["tipo"] == "num":
+                num.append((j, col["coluna"]))
+                continue
+            g = grupos.setdefault((col["coluna"], tuple(col["categorias"])), len(grupos))
+            if col["tipo"] == "ind":
+                for lista, valor in zip(ind, (j, g, col["indice"])):
+                    lista.append(valor)
+            else:
+                cod[0].append(j)
+                cod[1].append(g)
+        grupos = [(nome, list(cats)) for nome, cats in grupos]
+        return num, [np.array(x, dtype=np.intp) for x in ind], [np.array(x, dtype=np.intp) for x in cod], grupos
+
+    # --- predição ---------------------------------------------------------------
+    def predict(self, X):
+        """Predição para um DataFrame (colunas do treino) ou uma matriz já ``preparar``-ada."""
+        M = np.asarray(X) if isinstance(X, np.ndarray) else self.preparar(X)
+        if M.ndim == 1:
+            M = M[None, :]
+        # as árvores do sklearn comparam o valor em float32 com o limiar em float64
+        M = np.ascontiguousarray(M, dtype=np.float32 if self.float32 else np.float64).astype(np.float64)
+        passo = max(1, _ELEMENTOS_POR_BLOCO // self.n_arvores)
+        folhas = [self._percorrer(M[i:i + passo]) for i in range(0, len(M), passo)]
+        valores = self.valor[np.concatenate(folhas)] if folhas else np.empty((0, self.n_arvores))
+        pred = valores.sum(axis=1) if self.agregacao == "soma" else valores.mean(axis=1)
+        return pred + self.base
+
+    def _percorrer(self, M):
+        """Índice da folha de cada par (linha, árvore): array ``(n, n_arvores)``.
+
+        Quando uma parte relevante dos pares chega a uma folha, eles saem dos
+        arrays de trabalho, então as árvores rasas do boosting não pagam pela
+        profundidade das mais fundas.
+        """
+        n, d = M.shape
+        plano = M.ravel()
+        folhas = np.broadcast_to(self.raizes, (n, self.n_arvores)).ravel().copy()
+        pos = np.flatnonzero(~self._folha[folhas])
+        no = folhas[pos]
+        base = (pos // self.n_arvores) * d  # início da linha de cada par em ``plano``
+        tem_nan = bool(np.isnan(plano).any())
+        while len(pos):
+            v = plano[base + self.feature[no]]
+            direita = v > self.limiar[no]  # NaN -> False, corrigido abaixo
+            if self._tem_categorico:
+                cat = self._categorico[no]
+                if cat.any():
+                    vc, nc = v[cat], no[cat]
+                    codigo = np.clip(np.nan_to_num(vc, nan=0.0), 0, 255).astype(np.int64)
+                    palavra = self._bitsets_planos[self.bitset[nc] * _PALAVRAS + (codigo >> 5)]
+                    dc = ((palavra >> (codigo & 31)) & 1) == 0
+                    fora = np.isnan(vc) | (vc < 0)  # código inválido: lado dos faltantes
+                    dc[fora] = ~self.faltante_esquerda[nc[fora]]
+                    direita[cat] = dc
+            if tem_nan:
+                nan = np.isnan(v)
+                direita[nan] = ~self.faltante_esquerda[no[nan]]
+            no = self._filhos_planos[2 * no + direita]
+            fim = self._folha[no]
+            n_fim = np.count_nonzero(fim)
+            if n_fim * 4 >= len(no):  # compactar custa mais que seguir dando voltas nas folhas
+                folhas[pos[fim]] = no[fim]
+                seguem = ~fim
+                pos, base, no = pos[seguem], base[seguem], no[seguem]
+        return folhas.reshape(n, self.n_arvores)
+
+    # --- persistência -----------------------------------------------------------
+    def salvar(self, caminho):
+        meta = {"colunas": self.colunas, "profundidade": self.profundidade, "agregacao": self.agregacao,
+                "base": self.base, "float32": self.float32}
+        np.savez(caminho, raizes=self.raizes, feature=self.feature, limiar=self.limiar, filhos=self.filhos,
+                 valor=self.valor, faltante_esquerda=self.faltante_esquerda, bitset=self.bitset,
+                 bitsets=self.bitsets, meta=np.array(json.dumps(meta)))
+        return caminho
+
+    @classmethod
+    def carregar(cls, caminho):
+        with np.load(caminho, allow_pickle=False) as z:
+            meta = json.loads(str(z["meta"]))
+            return cls(meta["colunas"], z["raizes"], z["feature"], z["limiar"], z["filhos"], z["valor"],
+                       z["faltante_esquerda"], z["bitset"], z["bitsets"], meta["profundidade"],
+                       meta["agregacao"], meta["base"], meta["float32"])
+
+
+# --- exportação -------------------------------------------------------------------
+class _Acumulador:
+    """Nós de várias árvores concatenados (índices globais; folhas apontam para si mesmas)."""
+
+    def __init__(self):
+        self.raizes, self.partes, self.bitsets = [], [], []
+        self.n = 0
+        self.profundidade = 0
+
+    def arvore(self, feature, limiar, esquerda, direita, valor, faltante_esquerda, bitset=None, profundidade=0):
+        folha = esquerda < 0
+        indices = np.arange(len(feature)) + self.n
+        filhos = np.column_stack([np.where(folha, indices, esquerda + self.n),
+                                  np.where(folha, indices, direita + self.n)])
+        if bitset is None:
+            bitset = np.full(len(feature), -1)
+        self.partes.append((np.where(folha, 0, feature), np.where(folha, 0.0, limiar), filhos, valor,
+                            faltante_esquerda, bitset))
+        self.raizes.append(self.n)
+        self.n += len(feature)
+        self.profundidade = max(self.profundidade, profundidade)
+
+    def novo_bitset(self, bits):
+        self.bitsets.append(bits)
+        return len(self.bitsets) - 1
+
+    def montar(self, colunas, agregacao, base, float32):
+        campos = [np.concatenate(c) for c in zip(*self.partes)]
+        bitsets = np.array(self.bitsets, dtype=np.uint32).reshape(-1, _PALAVRAS)
+        return ArvoresCompiladas(colunas, self.raizes, *campos, bitsets, self.profundidade, agregacao, base, float32)
+
+
+def _bits(categorias):
+    bits = np.zeros(_PALAVRAS, dtype=np.uint32)
+    for c in categorias:
+        bits[c >> 5] |= np.uint32(1) << np.uint32(c & 31)
+    return bits
+
+
+def _profundidade_arvore(esquerda, direita):
+    prof = np.zeros(len(esquerda), dtype=np.intp)
+    for i in range(len(esquerda)):  # os filhos sempre vêm depois do pai
+        if esquerda[i] >= 0:
+            prof[esquerda[i]] = prof[direita[i]] = prof[i] + 1
+    return int(prof.max())
+
+
+def _colunas_one_hot(preprocessador):
+    """Colunas de saída do ``ColumnTransformer`` de ``preprocessador_esparso``."""
+    colunas = []
+    for nome, transformador, cols in preprocessador.transformers_:
+        if nome == "remainder" and transformador == "drop":
+            continue
+        # o sklearn recente guarda o remainder "passthrough" como um FunctionTransformer identidade
+        if transformador == "passthrough" or (nome == "remainder" and getattr(transformador, "func", 0) is None):
+            nomes = [preprocessador.feature_names_in_[c] if isinstance(c, (int, np.integer)) else c for c in cols]
+            colunas += [{"tipo": "num", "coluna": str(c)} for c in nomes]
+        elif type(transformador).__name__ == "OneHotEncoder":
+            descartadas = transformador.drop_idx_
+            for i, (col, categorias) in enumerate(zip(cols, transformador.categories_)):
+                cats = [str(c) for c in categorias]
+                colunas += [{"tipo": "ind", "coluna": col, "categorias": cats, "indice": j}
+                            for j in range(len(cats)) if descartadas is None or descartadas[i] is None
+                            or j != descartadas[i]]
+        else:
+            raise TypeError(f"Transformador não suportado: {transformador!r}")
+    return colunas
+
+
+def _exportar_florestas(arvores, colunas, features_por_arvore):
+    """RandomForest/Bagging: média das árvores, nas colunas de saída do One-Hot."""
+    acc = _Acumulador()
+    for arvore, mapa in zip(arvores, features_por_arvore):
+        t = arvore.tree_
+        esquerda, direita = t.children_left, t.children_right
+        feature = np.asarray(mapa)[np.maximum(t.feature, 0)]
+        faltante = getattr(t, "missing_go_to_left", np.zeros(len(feature), dtype=bool)).astype(bool)
+        acc.arvore(feature, t.threshold, esquerda, direita, t.value[:, 0, 0], faltante,
+                   profundidade=_profundidade_arvore(esquerda, direita))
+    return acc.montar(colunas, "media", 0.0, float32=True)
+
+
+def _exportar_hgb(modelos):
+    """Soma de um ou mais HistGradientBoostingRegressor com as mesmas features (``ModeloResidual``)."""
+    acc = _Acumulador()
+    colunas, base = None, 0.0
+    for hgb in modelos:
+        if getattr(hgb, "loss", "squared_error") not in ("squared_error", "absolute_error", "quantile"):
+            raise TypeError(f"Perda com função de ligação não suportada: {hgb.loss}")
+        cols = _colunas_hgb(hgb)
+        if colunas is not None and cols != colunas:
+            raise ValueError("Os HGB somados precisam ter as mesmas features")
+        colunas = cols
+        base += float(np.ravel(hgb._baseline_prediction)[0])
+        conhecidas, mapa_f = hgb._bin_mapper.make_known_categories_bitsets()
+        for (preditor,) in hgb._predictors:
+            nos = preditor.nodes
+            folha = nos["is_leaf"].astype(bool)
+            esquerda = np.where(folha, -1, nos["left"].astype(np.intp))
+            direita = np.where(folha, -1, nos["right"].astype(np.intp))
+            faltante = nos["missing_go_to_left"].astype(bool)
+            bitset = np.full(len(nos), -1)
+            for i in np.flatnonzero(nos["is_categorical"].astype(bool) & ~folha):
+                bits = preditor.raw_left_cat_bitsets[nos["bitset_idx"][i]].astype(np.uint32)
+                if faltante[i]:  # categorias que o modelo não viu no treino seguem os faltantes
+                    bits = bits | ~conhecidas[mapa_f[nos["feature_idx"][i]]].astype(np.uint32)
+                bitset[i] = acc.novo_bitset(bits)
+            acc.arvore(nos["feature_idx"], nos["num_threshold"], esquerda, direita, nos["value"], faltante,
+                       bitset, int(nos["depth"].max()))
+    return acc.montar(colunas, "soma", base, float32=False)
+
+
+def _colunas_hgb(hgb):
+    """Colunas da entrada das árvores do HGB (categóricas primeiro, como no ``_preprocess_X``)."""
+    nomes = [str(c) for c in getattr(hgb, "feature_names_in_", range(hgb.n_features_in_))]
+    preprocessador = getattr(hgb, "_preprocessor", None)
+    if preprocessador is None:
+        return [{"tipo": "num", "coluna": n} for n in nomes]
+    colunas = []
+    for nome, transformador, mascara in preprocessador.transformers_:
+        selecionadas = [n for n, m in zip(nomes, mascara) if m]
+        if nome == "encoder":
+            colunas += [{"tipo": "cod", "coluna": n, "categorias": [str(c) for c in cats]}
+                        for n, cats in zip(selecionadas, transformador.categories_)]
+        elif nome == "numerical":
+            colunas += [{"tipo": "num", "coluna": n} for n in selecionadas]
+    return colunas
+
+
+def exportar(modelo):
+    """``ArvoresCompiladas`` equivalente a ``modelo`` (HGB, Pipeline RF/ExtraTrees/Bagging ou ``ModeloResidual``).
+
+    Outros modelos levantam ``TypeError``.
+    """
+    from uber_price.incremental import ModeloResidual
+
+    if isinstance(modelo, ModeloResidual):
+        return _exportar_hgb([modelo.base, *modelo.correcoes])
+    if hasattr(modelo, "_predictors"):
+        return _exportar_hgb([modelo])
+
+    if hasattr(modelo, "steps"):
+        if len(modelo.steps) != 2:
+            raise TypeError("Só Pipelines One-Hot -> ensemble são suportados")
+        colunas = _colunas_one_hot(modelo.steps[0][1])
+        ensemble = modelo.steps[-1][1]
+    else:
+        ensemble = modelo
+        colunas = [{"tipo": "num", "coluna": str(c)} for c in ensemble.feature_names_in_]
+    from sklearn.ensemble import BaggingRegressor, ExtraTreesRegressor, RandomForestRegressor
+    from sklearn.tree import BaseDecisionTree
+
+    # Só ensembles cuja predição é a média das árvores (o AdaBoost, por exemplo, usa a mediana ponderada)
+    if isinstance(ensemble, BaggingRegressor) and all(isinstance(e, BaseDecisionTree) for e in ensemble.estimators_):
+        return _exportar_florestas(ensemble.estimators_, colunas, ensemble.estimators_features_)
+    if isinstance(ensemble, (RandomForestRegressor, ExtraTreesRegressor)):
+        return _exportar_florestas(ensemble.estimators_, colunas, [range(len(colunas))] * len(ensemble.estimators_))
+    raise TypeError(f"Modelo não suportado: {type(ensemble).__name__}")
@@ -0,0 +1,241 @@
+"""Busca de hiperparâmetros paralela e retomável (usada no lugar de ``models.tune``).
+
+Todos os ajustes ``(modelo, candidato, fold)`` de todos os modelos vão para um
+único pool de processos do joblib, em vez de cinco ``RandomizedSearchCV``
+seguidos (os com ``subsample`` rodavam com ``n_jobs=1``). Os candidatos são
+sorteados com ``ParameterSampler`` e os folds vêm de ``models.cv``, então sem
+halving o resultado é o mesmo do ``tune``.
+
+Cada avaliação terminada é anexada a um checkpoint JSONL; uma nova execução
+com o mesmo arquivo pula o que já foi calculado. A chave inclui o modelo, os
+parâmetros, o fold e o número de linhas de treino, então o arquivo deve ser
+específico dos dados (``pipeline.treinar_modelos`` usa o hash de X/y no nome).
+
+Com ``predicoes`` (um ``empilhamento.PredicoesFold``), as predições de
+teste de cada fold dos modelos treinados nos dados inteiros também são
+guardadas, para que o Stacking reaproveite as do melhor candidato.
+
+Com ``halving=True`` a busca é feita em rodadas de halving sucessivo (como o
+``HalvingRandomSearchCV``): os candidatos começam treinando com poucas linhas
+e só o melhor ``1/fator`` passa para a rodada seguinte, com ``fator`` vezes
+mais linhas; a última rodada usa todos os dados do modelo.
+"""
+
+import json
+import math
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+from uber_price.rastreio import etapa
+
+TAMANHO_SUBAMOSTRA = 20_000
+
+
+def _jsonavel(params):
+    """Converte escalares numpy para tipos nativos (chave estável no JSON)."""
+    return {k: v.item() if isinstance(v, np.generic) else v for k, v in params.items()}
+
+
+def chave(nome, params, fold, recurso):
+    return json.dumps([nome, _jsonavel(params), fold, recurso], sort_keys=True)
+
+
+class Checkpoint:
+    """RMSEs já calculados, persistidos em JSONL (uma linha por avaliação)."""
+
+    def __init__(self, caminho=None):
+        self.caminho = Path(caminho) if caminho else None
+        self.resultados = {}
+        if self.caminho and self.caminho.is_file():
+            for linha in self.caminho.read_text().splitlines():
+                try:
+                    reg = json.loads(linha)
+                except json.JSONDecodeError:
+                    continue  # última linha truncada por uma queda do processo
+                self.resultados[reg["chave"]] = reg["rmse"]
+
+    def __contains__(self, chave):
+        return chave in self.resultados
+
+    def __getitem__(self, chave):
+        return self.resultados[chave]
+
+    def gravar(self, chave, rmse, segundos):
+        self.resultados[chave] = rmse
+        if self.caminho is None:
+            return
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.caminho, "a") as f:
+            f.write(json.dumps({"chave": chave, "rmse": rmse, "segundos": round(segundos, 3)}) + "\n")
+
+
+def recursos_halving(n_candidatos, n_linhas, fator=3, min_recursos=2_000):
+    """Linhas de treino por rodada; a última rodada usa ``n_linhas``."""
+    rodadas = 1
+    while n_candidatos > fator:
+        n_candidatos = math.ceil(n_candidatos / fator)
+        rodadas += 1
+    return [max(min(min_recursos, n_linhas), n_linhas // fator ** (rodadas - 1 - i)) for i in range(rodadas)]
+
+
+def _xy(dados):
+    """``(X, y)`` de uma tupla ou de um ``DadosCompartilhados`` (memory-map no worker)."""
+    return dados if isinstance(dados, tuple) else dados.carregar()
+
+
+def _avaliar(chave, estimador, params, dados, treino, teste, scorer, guardar_predicoes=False):
+    from sklearn.base import clone
+    from sklearn.metrics import root_mean_squared_error
+
+    X, y = _xy(dados)
+    inicio = time.perf_counter()
+    predicoes = None
+    try:
+        modelo = clone(estimador).set_params(**params).fit(X.iloc[treino], y.iloc[treino])
+        if guardar_predicoes:
+            predicoes = modelo.predict(X.iloc[teste])
+            rmse = float(root_mean_squared_error(y.iloc[teste], predicoes))  # o que o scorer calcularia
+        else:
+            rmse = float(-scorer(modelo, X.iloc[teste], y.iloc[teste]))
+    except Exception as erro:  # mesmo comportamento do error_score=nan do sklearn
+        warnings.warn(f"Ajuste falhou ({chave}): {erro!r}")
+        rmse = float("nan")
+    return chave, rmse, time.perf_counter() - inicio, predicoes
+
+
+def _refit(nome, estimador, params, dados):
+    from sklearn.base import clone
+
+    X, y = _xy(dados)
+    return nome, clone(estimador).set_params(**params).fit(X, y)
+
+
+def _planejar(nome, estimador, param_dist, subsample, X_train, y_train, n_iter, halving, fator, min_recursos):
+    from sklearn.model_selection import ParameterSampler
+    from uber_price.models import RANDOM_STATE, cv
+
+    X, y = X_train, y_train
+    if subsample:
+        # Subamostra menor para caber na RAM (como no tune)
+        X = X_train.sample(min(TAMANHO_SUBAMOSTRA, len(X_train)), random_state=RANDOM_STATE)
+        y = y_train.loc[X.index]
+    candidatos = list(ParameterSampler(param_dist, n_iter, random_state=RANDOM_STATE))
+    recursos = recursos_halving(len(candidatos), len(X), fator, min_recursos) if halving else [len(X)]
+    return {
+        "nome": nome, "estimador": estimador, "n": len(X), "subsample": subsample, "dados": (X, y),
+        "candidatos": candidatos, "vivos": list(range(len(candidatos))),
+        "folds": list(cv.split(X)), "recursos": recursos,
+        # Ordem fixa das linhas: a rodada com r linhas treina com as r primeiras
+        "ordem": np.random.default_rng(RANDOM_STATE).permutation(len(X)),
+    }
+
+
+def _tarefas(plano, rodada):
+    """Avaliações ``(chave, params, treino, teste)`` da rodada para os candidatos vivos."""
+    recurso = plano["recursos"][rodada]
+    usadas = plano["ordem"][:recurso]
+    for i in plano["vivos"]:
+        params = plano["candidatos"][i]
+        for fold, (treino, teste) in enumerate(plano["folds"]):
+            if recurso < plano["n"]:
+                treino = treino[np.isin(treino, usadas)]
+            yield chave(plano["nome"], params, fold, recurso), params, treino, teste
+
+
+def _rmse_medio(plano, rodada, ck):
+    recurso = plano["recursos"][rodada]
+    n_folds = len(plano["folds"])
+    return {
+        i: np.mean([ck[chave(plano["nome"], plano["candidatos"][i], f, recurso)] for f in range(n_folds)])
+        for i in plano["vivos"]
+    }
+
+
+def buscar(modelos, X_train, y_train, n_iter=5, n_jobs=-1, halving=False, fator=3, min_recursos=2_000,
+           checkpoint=None, compartilhar=True, predicoes=None, verbose=1):
+    """Tuning de todos os ``modelos`` (lista ``(nome, estimador, params, subsample)``).
+
+    Com ``compartilhar=True`` (e mais de um processo) os dados são gravados uma
+    vez em memória compartilhada (``uber_price.compartilhado``) e os workers os
+    leem com memory-map, em vez de cada tarefa receber uma cópia serializada.
+    ``predicoes`` (``PredicoesFold``) recebe as predições out-of-fold dos
+    modelos sem subamostra. Retorna ``{nome: (melhor_estimador, rmse_cv)}``,
+    como ``tune`` para cada modelo; com halving, o RMSE é o da última rodada.
+    """
+    from joblib import effective_n_jobs
+    from sklearn.metrics import get_scorer
+    from uber_price.compartilhado import DadosCompartilhados
+    from uber_price.models import scoring
+
+    scorer = get_scorer(scoring)
+    ck = Checkpoint(checkpoint)
+    planos = [_planejar(*m, X_train, y_train, n_iter, halving, fator, min_recursos) for m in modelos]
+    # Uma cópia compartilhada por conjunto de dados (a subamostra é a mesma para todos os modelos)
+    compartilhados = {}
+    if compartilhar and effective_n_jobs(n_jobs) > 1:
+        for p in planos:
+            if p["subsample"] not in compartilhados:
+                compartilhados[p["subsample"]] = DadosCompartilhados(*p["dados"])
+            p["dados"] = compartilhados[p["subsample"]]
+    try:
+        refits = _executar(planos, ck, scorer, n_jobs, fator, predicoes, verbose)
+    finally:
+        for dados in compartilhados.values():
+            dados.remover()
+
+    resultado = {}
+    for p in planos:
+        if verbose:
+            print(f"\n[{p['nome']}] Melhor RMSE (CV): {p['rmse']:.4f}")
+            print(f"[{p['nome']}] Melhores parâmetros: {p['candidatos'][p['melhor']]}")
+        resultado[p["nome"]] = (refits[p["nome"]], p["rmse"])
+    return resultado
+
+
+def _executar(planos, ck, scorer, n_jobs, fator, predicoes, verbose):
+    """Rodadas da busca no pool compartilhado; retorna ``{nome: melhor_estimador}``."""
+    from joblib import Parallel, delayed
+
+    with Parallel(n_jobs=n_jobs, return_as="generator_unordered") as paralelo:
+        for rodada in range(max(len(p["recursos"]) for p in planos)):
+            ativos = [p for p in planos if rodada < len(p["recursos"])]
+            tarefas, retomadas = [], 0
+            for p in ativos:
+                # Só as avaliações com os dados inteiros do modelo servem de meta-features
+                guardar = predicoes is not None and not p["subsample"] and p["recursos"][rodada] == p["n"]
+                for k, params, treino, teste in _tarefas(p, rodada):
+                    if k in ck:
+                        retomadas += 1
+                    else:
+                        tarefas.append(delayed(_avaliar)(k, p["estimador"], params, p["dados"], treino, teste,
+                                                         scorer, guardar))
+            if verbose:
+                print(f"[busca] rodada {rodada}: {len(tarefas)} ajustes ({retomadas} retomados do checkpoint)")
+            with etapa(f"rodada {rodada}", ajustes=len(tarefas), retomados=retomadas):
+                for k, rmse, segundos, pred in paralelo(tarefas):
+                    if pred is not None:
+                        predicoes.guardar(k, pred)  # antes do checkpoint: uma queda não deixa a chave sem predição
+                    ck.gravar(k, rmse, segundos)
+
+            for p in ativos:
+                medias = _rmse_medio(p, rodada, ck)
+                # NaN (ajuste que falhou) vai para o fim do ranking
+                ranking = sorted(p["vivos"], key=lambda i: (np.isnan(medias[i]), medias[i]))
+                if rodada == len(p["recursos"]) - 1:
+                    p["melhor"], p["rmse"] = ranking[0], medias[ranking[0]]
+                    if predicoes is not None and not p["subsample"]:
+                        params = p["candidatos"][p["melhor"]]
+                        predicoes.melhores[p["nome"]] = [chave(p["nome"], params, f, p["recursos"][rodada])
+                                                         for f in range(len(p["folds"]))]
+                else:
+                    p["vivos"] = ranking[:math.ceil(len(ranking) / fator)]
+
+        with etapa("refit", modelos=len(planos)):
+            refits = dict(paralelo(
+                delayed(_refit)(p["nome"], p["estimador"], p["candidatos"][p["melhor"]], p["dados"])
+                for p in planos
+            ))
+    return refits
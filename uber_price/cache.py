@@ -0,0 +1,136 @@
+"""Cache colunar (Feather) do dataset já limpo por ``limparDados``.
+
+O cache guarda a versão compacta (``limparDados(..., compacto=True)``):
+colunas textuais como categóricas, floats em float32 e partes de data em int8.
+
+A chave é o SHA-256 do CSV de origem mais ``VERSAO_LIMPEZA``: se o arquivo
+ou o código de limpeza mudar, a entrada antiga simplesmente deixa de ser
+usada. O Feather é gravado sem compressão para ser lido com memory-map,
+então execuções repetidas não passam mais pelo ``pd.read_csv``.
+
+O índice do DataFrame não é preservado: o resultado sempre vem com ``RangeIndex``.
+"""
+
+import hashlib
+import io
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from uber_price.data import (
+    DATASET, ARQUIVO, VERSAO_LIMPEZA, COLUNAS_BRUTAS, COLUNAS_CODIFICADAS, kaggle_path, limparDados
+)
+from uber_price.rastreio import cronometrado, etapa
+
+RAIZ_CACHE = Path(os.environ.get("UBER_PRICE_CACHE", ".cache"))
+
+_BLOCO = 1 << 20
+
+
+@cronometrado("hash_conteudo")
+def hash_conteudo(origem):
+    """SHA-256 de um arquivo (caminho) ou de bytes já em memória (upload)."""
+    h = hashlib.sha256()
+    if isinstance(origem, (bytes, bytearray, memoryview)):
+        h.update(origem)
+    else:
+        with open(origem, "rb") as f:
+            for bloco in iter(lambda: f.read(_BLOCO), b""):
+                h.update(bloco)
+    return h.hexdigest()
+
+
+def caminho_cache(hash_fonte, raiz=RAIZ_CACHE):
+    return Path(raiz) / f"limpo-{hash_fonte[:24]}-v{VERSAO_LIMPEZA}.feather"
+
+
+@cronometrado("ler_feather")
+def ler_feather(caminho):
+    from pyarrow import feather
+
+    return feather.read_table(caminho, memory_map=True).to_pandas()
+
+
+@cronometrado("gravar_feather")
+def gravar_feather(df, caminho):
+    """Grava de forma atômica (arquivo temporário + rename)."""
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    tmp = caminho.with_suffix(f".{os.getpid()}.tmp")
+    df.to_feather(tmp, compression="uncompressed")
+    os.replace(tmp, caminho)
+
+
+def limpar_com_cache(origem, raiz=RAIZ_CACHE, hash_fonte=None):
+    """``limparDados(pd.read_csv(origem), compacto=True)``, reaproveitando o cache quando possível.
+
+    ``origem`` é o caminho do CSV ou o conteúdo em bytes (upload do app);
+    ``hash_fonte`` é o ``hash_conteudo(origem)``, se quem chama já o calculou.
+    """
+    if hash_fonte is None:
+        hash_fonte = hash_conteudo(origem)
+    destino = caminho_cache(hash_fonte, raiz)
+    if destino.is_file():
+        return ler_feather(destino)
+
+    if isinstance(origem, (bytes, bytearray, memoryview)):
+        origem = io.BytesIO(origem)
+    with etapa("read_csv"):
+        bruto = pd.read_csv(origem)
+    df = limparDados(bruto, compacto=True).reset_index(drop=True)
+    gravar_feather(df, destino)
+    return df
+
+
+def codificador_em_chunks(csv, chunksize=200_000):
+    """Primeira passada: ajusta o codificador lendo só as colunas categóricas."""
+    from uber_price.preprocessing import CodificadorCategorias
+
+    codificador = CodificadorCategorias()
+    for chunk in pd.read_csv(csv, usecols=COLUNAS_CODIFICADAS, chunksize=chunksize):
+        codificador.partial_fit(chunk)
+    return codificador
+
+
+def cachear_em_chunks(csv, raiz=RAIZ_CACHE, chunksize=100_000):
+    """Limpa o CSV em chunks e grava o resultado no cache, sem materializá-lo inteiro.
+
+    Lê apenas COLUNAS_BRUTAS (``usecols``), codifica cada chunk com um
+    codificador ajustado uma vez no arquivo todo e anexa o chunk ao Feather de destino.
+    O pico de memória fica proporcional a ``chunksize``, não ao tamanho do CSV.
+    O resultado é idêntico a ``limpar_com_cache(csv)``. Retorna o caminho no cache.
+    """
+    import pyarrow as pa
+
+    destino = caminho_cache(hash_conteudo(csv), raiz)
+    if destino.is_file():
+        return destino
+
+    codificador = codificador_em_chunks(csv)
+    usecols = lambda col: col in COLUNAS_BRUTAS  # noqa: E731
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    tmp = destino.with_suffix(f".{os.getpid()}.tmp")
+
+    writer = schema = None
+    try:
+        for chunk in pd.read_csv(csv, usecols=usecols, chunksize=chunksize):
+            limpo = limparDados(chunk, codificador, compacto=True)
+            tabela = pa.Table.from_pandas(limpo, schema=schema, preserve_index=False)
+            if writer is None:
+                schema = tabela.schema
+                writer = pa.ipc.new_file(tmp, schema)
+            writer.write_table(tabela)
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(tmp, destino)
+    return destino
+
+
+def carregar_limpo(csv=None, raiz=RAIZ_CACHE):
+    """Dataset limpo a partir do CSV local ou, se omitido, do download do Kaggle."""
+    if csv is None:
+        with etapa("load_kaggle_data"):
+            csv = kaggle_path(DATASET, ARQUIVO)
+    return limpar_com_cache(csv, raiz)
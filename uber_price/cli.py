@@ -0,0 +1,237 @@
+"""Linha de comando: ``python -m uber_price <comando>``."""
+
+import argparse
+
+
+def _cmd_run(args):
+    from contextlib import nullcontext
+    from uber_price.pipeline import run_pipeline
+    from uber_price.rastreio import Rastreador
+
+    rastrear = args.trace or args.profile
+    with Rastreador(cprofile=bool(args.profile)) if rastrear else nullcontext() as rastreador:
+        resultados, _ = run_pipeline(csv=args.csv, n_iter=args.n_iter, registrar=args.registrar,
+                                     cache=not args.sem_cache, n_jobs=args.n_jobs, halving=args.halving,
+                                     checkpoint=args.checkpoint or not args.sem_checkpoint)
+    print(resultados.to_string(float_format="%.5f"))
+    if args.saida:
+        resultados.to_csv(args.saida)
+    if rastrear:
+        _relatar_rastreio(rastreador, args.trace, args.profile)
+
+
+def _relatar_rastreio(rastreador, trace, profile):
+    print("\nEtapas (segundos de parede, CPU deste processo, pico e RSS final em MB):")
+    print(rastreador.resumo().to_string(index=False, float_format="%.2f"))
+    if trace:
+        rastreador.salvar(trace)
+        print(f"Rastreio (Chrome trace) salvo em {trace}")
+    if profile:
+        nome, stats = rastreador.perfil_mais_lento()
+        stats.dump_stats(profile)
+        print(f"\ncProfile da etapa mais lenta ({nome}) salvo em {profile}:")
+        stats.sort_stats("cumulative").print_stats(25)
+
+
+def _cmd_simulador(args):
+    from uber_price.cache import carregar_limpo
+    from uber_price.data import filtrar_uber
+    from uber_price.simulador import registrar_simulador, gerar_grade_simulador
+
+    df = filtrar_uber(carregar_limpo(args.csv))
+    pasta = registrar_simulador(df, por_servico=args.por_servico)
+    print(f"Modelo do simulador salvo em {pasta}")
+    grade = gerar_grade_simulador(n_distancias=args.n_distancias, surges=args.surges)
+    print(f"Grade de preços {grade.precos.shape} ({grade.precos.nbytes / 1024:.0f} KB) salva em {pasta}")
+
+
+def _cmd_limpar(args):
+    from uber_price.cache import cachear_em_chunks, limpar_com_cache, RAIZ_CACHE
+
+    if args.relatorio:
+        import pandas as pd
+        from uber_price.data import limparDados, relatorio_memoria
+
+        bruto = pd.read_csv(args.csv)
+        rel = relatorio_memoria(limparDados(bruto), limparDados(bruto, compacto=True))
+        print(rel.to_string())
+
+    if args.chunksize:
+        destino = cachear_em_chunks(args.csv, chunksize=args.chunksize)
+    else:
+        limpar_com_cache(args.csv)
+        destino = RAIZ_CACHE
+    print(f"Dataset limpo em cache: {destino}")
+
+
+def _cmd_prever(args):
+    from uber_price.predicao import prever_arquivo
+
+    stats = prever_arquivo(args.entrada, args.saida, args.modelo, versao=args.versao, chunksize=args.chunksize,
+                           n_jobs=args.n_jobs, manter=args.manter)
+    print(f"{stats['linhas']:,} linhas em {stats['segundos']:.1f}s ({stats['linhas_por_s']:,.0f} linhas/s) "
+          f"-> {args.saida}")
+    if stats["sem_predicao"]:
+        print(f"{stats['sem_predicao']:,} linhas sem predição (Lyft ou categorias desconhecidas pelo modelo)")
+
+
+def _cmd_perfil(args):
+    import pandas as pd
+    from uber_price.esbocos import perfilar_arquivos
+
+    perfil = perfilar_arquivos(args.entrada, chunksize=args.chunksize, n_jobs=args.n_jobs,
+                               apenas_uber=args.apenas_uber)
+    with pd.option_context("display.width", 160, "display.max_columns", None, "display.float_format", "{:.3f}".format):
+        print(f"{perfil.linhas:,} linhas\n")
+        print(perfil.descricao(), end="\n\n")
+        for col, esboco in perfil.frequentes.items():
+            exato = "" if esboco.erro == 0 else f" (contagens até {esboco.erro:,} abaixo do real)"
+            print(f"{col}{exato}:\n{esboco.mais_frequentes(args.top).to_string()}\n")
+        print(perfil.correlacao())
+
+
+def _cmd_servir(args):
+    from uber_price.servidor import servir
+
+    servir(args.host, args.porta, nome=args.modelo, versao=args.versao, janela_ms=args.janela_ms,
+           max_lote=args.max_lote)
+
+
+def _cmd_treinar_em_lotes(args):
+    from uber_price.fora_da_memoria import treinar_em_lotes
+
+    kwargs = {"amostra": args.amostra}
+    if args.modelo == "sgd":
+        kwargs["epocas"] = args.epocas
+    else:
+        kwargs["max_celulas"] = args.max_celulas
+    _, metricas = treinar_em_lotes(args.csv, args.modelo, registrar=args.registrar, nome=args.nome,
+                                   chunksize=args.chunksize, **kwargs)
+    print(" ".join(f"{k}={v:.5f}" for k, v in metricas.items()))
+
+
+def _cmd_atualizar(args):
+    import pandas as pd
+    from uber_price.data import filtrar_uber, limparDados
+    from uber_price.grade import carregar_grade
+    from uber_price.incremental import atualizar
+    from uber_price.registry import carregar_codificador, ler_meta
+    from uber_price.simulador import NOME_SIMULADOR, gerar_grade_simulador
+
+    try:
+        codificador = carregar_codificador(args.modelo, args.versao)
+    except FileNotFoundError:
+        codificador = None
+    df = filtrar_uber(limparDados(pd.read_csv(args.csv), codificador, compacto=True))
+    limiares = {k: v for k, v in (("limiar_psi", args.limiar_psi), ("limiar_rmse", args.limiar_rmse)) if v}
+    pasta, _ = atualizar(df, args.modelo, args.versao, n_novos=args.n_novos, forcar=args.forcar, **limiares)
+    if pasta is not None and args.modelo == NOME_SIMULADOR:
+        try:  # mesma grade da versão de origem, recalculada com o modelo atualizado
+            antiga = carregar_grade(NOME_SIMULADOR, ler_meta(NOME_SIMULADOR, raiz=pasta.parent.parent)["base"])
+            kwargs = {"n_distancias": len(antiga.distancias), "surges": tuple(antiga.surges)}
+        except FileNotFoundError:
+            kwargs = {}
+        gerar_grade_simulador(**kwargs)
+        print(f"Grade de preços recalculada em {pasta}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="uber_price", description="Previsão de preços Uber – NCIA / FPF Tech")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_run = sub.add_parser("run", help="executa o pipeline completo (limpeza, tuning e avaliação)")
+    p_run.add_argument("--csv", help="CSV local; se omitido, baixa o dataset do Kaggle")
+    p_run.add_argument("--n-iter", type=int, default=5, help="candidatos sorteados por modelo na busca")
+    p_run.add_argument("--saida", help="salva a tabela de resultados neste CSV")
+    p_run.add_argument("--sem-cache", action="store_true", help="ignora o cache colunar do dataset limpo")
+    p_run.add_argument("--registrar", action="store_true", help="salva os modelos treinados no registro")
+    p_run.add_argument("--n-jobs", type=int, default=-1, help="processos do pool da busca (-1 = todos os núcleos)")
+    p_run.add_argument("--halving", action="store_true",
+                       help="halving sucessivo: descarta cedo os candidatos ruins, treinando com poucas linhas")
+    p_run.add_argument("--checkpoint", help="arquivo de retomada da busca (padrão: .cache/busca/<hash>.jsonl)")
+    p_run.add_argument("--sem-checkpoint", action="store_true", help="não grava nem retoma a busca")
+    p_run.add_argument("--trace", help="grava tempo, CPU e memória de cada etapa neste JSON (formato Chrome trace)")
+    p_run.add_argument("--profile", nargs="?", const="etapa_mais_lenta.prof",
+                       help="roda cada etapa sob o cProfile e salva as estatísticas da mais lenta "
+                            "(padrão: etapa_mais_lenta.prof); o trabalho nos workers só aparece com --n-jobs 1")
+    p_run.set_defaults(func=_cmd_run)
+
+    p_limpar = sub.add_parser("limpar", help="limpa o CSV e grava o resultado no cache colunar")
+    p_limpar.add_argument("--csv", required=True)
+    p_limpar.add_argument("--chunksize", type=int, default=100_000,
+                          help="linhas por chunk (0 = carrega o CSV inteiro de uma vez)")
+    p_limpar.add_argument("--relatorio", action="store_true",
+                          help="mostra os bytes economizados por coluna com os dtypes compactos")
+    p_limpar.set_defaults(func=_cmd_limpar)
+
+    p_sim = sub.add_parser("simulador", help="treina e registra o modelo do simulador do app")
+    p_sim.add_argument("--csv", help="CSV local; se omitido, baixa o dataset do Kaggle")
+    p_sim.add_argument("--por-servico", action="store_true",
+                       help="registra também um modelo menor por produto (simulador-<serviço>)")
+    p_sim.add_argument("--n-distancias", type=int, default=791,
+                       help="pontos de distância na grade de preços (791 = passo de 0,01 milha)")
+    p_sim.add_argument("--surges", type=float, nargs="+", default=[1.0], help="valores de surge na grade")
+    p_sim.set_defaults(func=_cmd_simulador)
+
+    p_prever = sub.add_parser("prever", aliases=["predict"],
+                              help="predição em lote de um CSV/Parquet de cotações, em chunks")
+    p_prever.add_argument("--entrada", required=True, help="CSV ou Parquet com as colunas brutas do Kaggle")
+    p_prever.add_argument("--saida", required=True, help="CSV ou Parquet de saída (pela extensão)")
+    p_prever.add_argument("--modelo", default="simulador", help="nome do modelo no registro")
+    p_prever.add_argument("--versao", type=int, help="versão do modelo (padrão: a mais recente)")
+    p_prever.add_argument("--chunksize", type=int, default=100_000, help="linhas por chunk")
+    p_prever.add_argument("--n-jobs", type=int, default=-1, help="processos (-1 = todos os núcleos)")
+    p_prever.add_argument("--manter", nargs="*", default=["id"],
+                          help="colunas da entrada copiadas para a saída (padrão: id)")
+    p_prever.set_defaults(func=_cmd_prever)
+
+    p_perfil = sub.add_parser("perfil", help="estatísticas aproximadas (esboços) de logs brutos numa passada")
+    p_perfil.add_argument("entrada", nargs="+", help="CSVs ou Parquets com as colunas brutas do Kaggle")
+    p_perfil.add_argument("--chunksize", type=int, default=100_000, help="linhas por chunk")
+    p_perfil.add_argument("--n-jobs", type=int, default=-1, help="processos (-1 = todos os núcleos)")
+    p_perfil.add_argument("--apenas-uber", action="store_true", help="descarta as corridas da Lyft")
+    p_perfil.add_argument("--top", type=int, default=10, help="valores mais frequentes por coluna categórica")
+    p_perfil.set_defaults(func=_cmd_perfil)
+
+    p_servir = sub.add_parser("servir", aliases=["serve"], help="servidor HTTP de predição com micro-lotes")
+    p_servir.add_argument("--host", default="127.0.0.1")
+    p_servir.add_argument("--porta", type=int, default=8000)
+    p_servir.add_argument("--modelo", default="simulador", help="nome do modelo no registro")
+    p_servir.add_argument("--versao", type=int, help="versão do modelo (padrão: a mais recente)")
+    p_servir.add_argument("--janela-ms", type=float, default=2.0,
+                          help="espera máxima para juntar requisições concorrentes num lote")
+    p_servir.add_argument("--max-lote", type=int, default=1024, help="cotações por predict (1 = sem micro-lotes)")
+    p_servir.set_defaults(func=_cmd_servir)
+
+    p_lotes = sub.add_parser("treinar-em-lotes",
+                             help="treina lendo o cache colunar lote a lote (datasets maiores que a RAM)")
+    p_lotes.add_argument("--csv", required=True)
+    p_lotes.add_argument("--modelo", default="hgb", choices=["hgb", "sgd"],
+                         help="hgb: bins de uma amostra + células agregadas (até --max-celulas); "
+                              "sgd: partial_fit por lote")
+    p_lotes.add_argument("--amostra", type=int, default=200_000, help="linhas da amostra (bins / pré-processamento)")
+    p_lotes.add_argument("--epocas", type=int, default=3, help="passadas pelo arquivo (sgd)")
+    p_lotes.add_argument("--max-celulas", type=int, default=500_000,
+                         help="células agregadas em memória (hgb); acima disso os bins numéricos engrossam")
+    p_lotes.add_argument("--chunksize", type=int, default=100_000, help="linhas por chunk na limpeza do CSV")
+    p_lotes.add_argument("--registrar", action="store_true", help="salva o modelo no registro")
+    p_lotes.add_argument("--nome", help="nome no registro (padrão: <modelo>-em-lotes)")
+    p_lotes.set_defaults(func=_cmd_treinar_em_lotes)
+
+    p_atu = sub.add_parser("atualizar", help="atualiza um modelo registrado com um lote novo, sem retreino completo")
+    p_atu.add_argument("--csv", required=True, help="CSV do lote novo (colunas brutas do Kaggle)")
+    p_atu.add_argument("--modelo", default="simulador", help="nome do modelo no registro")
+    p_atu.add_argument("--versao", type=int, help="versão de origem (padrão: a mais recente)")
+    p_atu.add_argument("--n-novos", type=int,
+                       help="iterações de boosting ou árvores novas (padrão: 50 / 20%% do ensemble)")
+    p_atu.add_argument("--limiar-psi", type=float, help="PSI máximo por feature (padrão: 0.25)")
+    p_atu.add_argument("--limiar-rmse", type=float, help="RMSE no lote / RMSE registrado máximo (padrão: 1.2)")
+    p_atu.add_argument("--forcar", action="store_true", help="atualiza mesmo se o drift pedir retreino completo")
+    p_atu.set_defaults(func=_cmd_atualizar)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
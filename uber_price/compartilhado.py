@@ -0,0 +1,77 @@
+"""Dados de treino em memória compartilhada para os workers do joblib.
+
+``DadosCompartilhados`` grava cada coluna de X (e y) uma única vez como
+``.npy`` numa pasta temporária (em ``/dev/shm`` quando existe) e, ao ser
+enviado a um worker, serializa só o caminho e o schema. No worker as colunas
+são abertas com ``np.load(mmap_mode="r")`` e o DataFrame é montado sem cópia
+(as categóricas via ``Categorical.from_codes``), uma vez por processo. Assim a
+memória de X não cresce com ``n_jobs``: só os recortes de cada fold são cópias.
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# DataFrames já montados neste processo, por pasta (um por worker, não por tarefa)
+_ABERTOS = {}
+
+
+def _pasta_temporaria():
+    base = "/dev/shm" if Path("/dev/shm").is_dir() else None
+    return Path(tempfile.mkdtemp(prefix="uber_price-", dir=base))
+
+
+class DadosCompartilhados:
+    """X/y gravados uma vez em disco (ou shm) e lidos com memory-map pelos workers."""
+
+    def __init__(self, X, y, pasta=None):
+        self.pasta = Path(pasta) if pasta else _pasta_temporaria()
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        self.schema = []
+        for i, (col, serie) in enumerate(X.items()):
+            if isinstance(serie.dtype, pd.CategoricalDtype):
+                np.save(self.pasta / f"x{i}.npy", serie.cat.codes.to_numpy())
+                self.schema.append((col, serie.cat.categories.tolist(), serie.cat.ordered))
+            else:
+                np.save(self.pasta / f"x{i}.npy", serie.to_numpy())
+                self.schema.append((col, None, False))
+        np.save(self.pasta / "y.npy", np.asarray(y))
+        self.nome_y = getattr(y, "name", None)
+
+    def __len__(self):
+        return len(np.load(self.pasta / "y.npy", mmap_mode="r"))
+
+    def carregar(self):
+        """``(X, y)`` com os arrays em memory-map (somente leitura, ``RangeIndex``)."""
+        chave = str(self.pasta)
+        if chave not in _ABERTOS:
+            # Workers do loky são reutilizados entre buscas: solta os dados de buscas já encerradas
+            for antiga in [k for k in _ABERTOS if not Path(k).exists()]:
+                del _ABERTOS[antiga]
+            _ABERTOS[chave] = self._abrir()
+        return _ABERTOS[chave]
+
+    def _abrir(self):
+        colunas = {}
+        for i, (col, categorias, ordenada) in enumerate(self.schema):
+            valores = np.load(self.pasta / f"x{i}.npy", mmap_mode="r")
+            if categorias is not None:
+                tipo = pd.CategoricalDtype(categorias, ordered=ordenada)
+                valores = pd.Categorical.from_codes(valores, dtype=tipo, validate=False)
+            colunas[col] = valores
+        X = pd.DataFrame(colunas, copy=False)
+        y = pd.Series(np.load(self.pasta / "y.npy", mmap_mode="r"), name=self.nome_y, copy=False)
+        return X, y
+
+    def remover(self):
+        _ABERTOS.pop(str(self.pasta), None)
+        shutil.rmtree(self.pasta, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.remover()
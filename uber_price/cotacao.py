@@ -0,0 +1,98 @@
+"""Caminho rápido para uma cotação avulsa (simulador, ``Precificador`` fora da grade).
+
+Cotar uma corrida pelo caminho geral monta um DataFrame (``montar_X``), que o
+sklearn ainda valida (nomes e dtypes das features) antes de percorrer as
+árvores; para uma linha isso custa mais que a predição em si. Aqui:
+
+* ``Cotacao`` é um registro com ``__slots__`` (campos tipados, ``duration``
+  estimada a partir de ``distance`` como em ``limparDados``);
+* ``CotadorRapido`` confere uma única vez, ao carregar, que as colunas do
+  modelo são campos de ``Cotacao`` e monta a ordem das colunas e o mapa
+  categoria -> código. Cada cotação vira então um vetor float64 na ordem
+  das árvores, passado direto ao ``arvores.ArvoresCompiladas`` do modelo
+  (sem pandas e sem o scikit-learn).
+
+O motor das árvores pode ser salvo junto da versão do modelo
+(``salvar_motor``, ``arvores.npz``); ``do_registro`` o usa quando existe,
+sem carregar o ``modelo.joblib``.
+"""
+
+import numpy as np
+
+from uber_price.registry import RAIZ_PADRAO
+from uber_price.rotas import estimar_duracao
+
+ARQUIVO_MOTOR = "arvores.npz"
+
+
+class Cotacao:
+    """Uma corrida a cotar, nos campos das features do simulador."""
+
+    __slots__ = ("distance", "hour", "surge_multiplier", "duration", "name")
+
+    def __init__(self, distance, hour, surge_multiplier=1.0, name=None, duration=None):
+        self.distance = float(distance)
+        self.hour = float(hour)
+        self.surge_multiplier = float(surge_multiplier)
+        self.duration = estimar_duracao(self.distance) if duration is None else float(duration)
+        self.name = name
+
+
+class CotadorRapido:
+    """Preço de ``Cotacao`` pelo motor NumPy das árvores de um modelo do registro."""
+
+    def __init__(self, motor):
+        self.motor = motor
+        self._numericas, self._categoricas = [], []
+        for j, col in enumerate(motor.colunas):
+            campo = col["coluna"]
+            if campo not in Cotacao.__slots__:
+                raise ValueError(f"O modelo usa {campo!r}, que não é um campo de Cotacao")
+            if col["tipo"] == "num":
+                self._numericas.append((j, campo))
+            elif col["tipo"] == "cod":  # desconhecida: NaN, o lado dos faltantes
+                self._categoricas.append((j, campo, {c: float(i) for i, c in enumerate(col["categorias"])},
+                                          np.nan))
+            else:  # indicadora do One-Hot (RF/Bagging): 1.0 só na categoria da coluna
+                self._categoricas.append((j, campo, {col["categorias"][col["indice"]]: 1.0}, 0.0))
+
+    @classmethod
+    def do_modelo(cls, modelo):
+        """``TypeError`` se o modelo não for um ensemble de árvores suportado por ``arvores.exportar``."""
+        from uber_price.arvores import exportar
+
+        return cls(exportar(modelo))
+
+    @classmethod
+    def do_registro(cls, nome, versao=None, raiz=RAIZ_PADRAO):
+        from uber_price.arvores import ArvoresCompiladas
+        from uber_price.registry import carregar_modelo, pasta_modelo
+
+        caminho = pasta_modelo(nome, versao, raiz) / ARQUIVO_MOTOR
+        if caminho.is_file():
+            return cls(ArvoresCompiladas.carregar(caminho))
+        return cls.do_modelo(carregar_modelo(nome, versao, raiz)[0])
+
+    def vetor(self, cotacao):
+        """Linha na ordem das colunas do motor."""
+        linha = np.empty(len(self.motor.colunas))
+        for j, campo in self._numericas:
+            linha[j] = getattr(cotacao, campo)
+        for j, campo, codigos, padrao in self._categoricas:
+            linha[j] = codigos.get(getattr(cotacao, campo), padrao)
+        return linha
+
+    def preco(self, cotacao):
+        return float(self.motor.predict(self.vetor(cotacao))[0])
+
+    def precos(self, cotacoes):
+        return self.motor.predict(np.array([self.vetor(c) for c in cotacoes]))
+
+
+def salvar_motor(nome, versao=None, raiz=RAIZ_PADRAO):
+    """Exporta as árvores da versão do modelo para ``arvores.npz`` na pasta dela."""
+    from uber_price.arvores import exportar
+    from uber_price.registry import carregar_modelo, pasta_modelo
+
+    modelo, meta = carregar_modelo(nome, versao, raiz)
+    return exportar(modelo).salvar(pasta_modelo(nome, meta["versao"], raiz) / ARQUIVO_MOTOR)
@@ -0,0 +1,148 @@
+"""Carregamento e limpeza do dataset ``rideshare_kaggle.csv``."""
+
+from pathlib import Path
+
+import pandas as pd
+
+from uber_price.rastreio import cronometrado
+
+DATASET = "brllrb/uber-and-lyft-dataset-boston-ma"
+ARQUIVO = "rideshare_kaggle.csv"
+
+# Incrementar sempre que limparDados mudar: invalida os caches em uber_price.cache
+VERSAO_LIMPEZA = 2
+
+# Colunas mantidas por limparDados (Viagem, Clima, Tempo e Alvo)
+COLUNAS_LIMPEZA = ['datetime', 'hour', 'day', 'month',
+                   'source', 'destination', 'cab_type', 'name',
+                   'price', 'distance', 'surge_multiplier',
+                   'apparentTemperature', 'short_summary',
+                   'precipIntensity', 'precipProbability', 'icon', 'latitude', 'longitude', 'duration']
+
+# Colunas do CSV bruto usadas pela limpeza (hour/day/month são recalculadas de datetime)
+COLUNAS_BRUTAS = ['datetime', 'source', 'destination', 'cab_type', 'name',
+                  'price', 'distance', 'surge_multiplier',
+                  'apparentTemperature', 'short_summary',
+                  'precipIntensity', 'precipProbability', 'icon', 'latitude', 'longitude']
+
+# Colunas textuais que recebem Label Encoding (<col>_encoded)
+COLUNAS_CODIFICADAS = ['source', 'destination', 'cab_type', 'name', 'short_summary', 'icon']
+
+# Dtypes compactos do DataFrame limpo (ver otimizar_dtypes). As colunas textuais
+# viram categóricas com categorias ordenadas, então ``df[col].cat.codes`` é
+# igual ao antigo ``<col>_encoded``.
+SCHEMA_DTYPES = {
+    **{col: "category" for col in COLUNAS_CODIFICADAS},
+    'hour': 'int8', 'day': 'int8', 'month': 'int8',
+    'price': 'float32', 'distance': 'float32', 'surge_multiplier': 'float32', 'duration': 'float32',
+    'apparentTemperature': 'float32', 'precipIntensity': 'float32', 'precipProbability': 'float32',
+    'latitude': 'float32', 'longitude': 'float32',
+}
+
+
+def kaggle_path(dataset: str, filename: str):
+    """Baixa o dataset (se ainda não estiver no cache do kagglehub) e retorna o caminho do CSV."""
+    import kagglehub  # import tardio: só é necessário quando o download é pedido
+
+    path = kagglehub.dataset_download(dataset)
+    file_path = Path(path) / filename
+
+    if not file_path.is_file():
+        raise FileNotFoundError(f"Arquivo {filename} não encontrado em {path}")
+
+    return file_path
+
+
+def load_kaggle_data(dataset: str, filename: str):
+    return pd.read_csv(kaggle_path(dataset, filename))
+
+
+def carregar_dados(csv=None):
+    """Lê o CSV local informado ou, se omitido, baixa o dataset do Kaggle."""
+    if csv is None:
+        return load_kaggle_data(DATASET, ARQUIVO)
+    return pd.read_csv(csv)
+
+
+@cronometrado("limparDados")
+def limparDados(df, codificador=None, compacto=False, descartar_sem_preco=True):
+    """Limpeza do notebook (seção 3.1).
+
+    ``codificador`` é um ``CodificadorCategorias`` já ajustado (ex.: no dataset
+    inteiro, ao limpar em chunks, ou o salvo junto do modelo); por padrão é
+    ajustado no próprio ``df``, como o LabelEncoder fazia. Com ``compacto=True``
+    o resultado sai com os dtypes de SCHEMA_DTYPES (ver otimizar_dtypes).
+    ``descartar_sem_preco=False`` mantém as linhas sem ``price`` (predição).
+    """
+    from uber_price.preprocessing import CodificadorCategorias
+    from uber_price.rotas import estimar_duracao
+
+    # Seleciona as colunas antes de copiar: o CSV bruto tem 57 colunas
+    df = df[[col for col in COLUNAS_BRUTAS if col in df.columns]].copy()
+
+    df['datetime'] = pd.to_datetime(df['datetime'])
+    df['hour'] = df['datetime'].dt.hour
+    df['day'] = df['datetime'].dt.day
+    df['month'] = df['datetime'].dt.month
+
+    df['duration'] = estimar_duracao(df['distance'])  # o dataset não tem o tempo de viagem
+
+    df = df[[col for col in COLUNAS_LIMPEZA if col in df.columns]]
+    codificador = codificador or CodificadorCategorias().fit(df)
+    if compacto:
+        df = otimizar_dtypes(df, codificador)
+    else:
+        df = df.assign(**codificador.colunas_encoded(df))
+
+    if descartar_sem_preco:
+        df = df.dropna(subset=["price"])
+
+    return df
+
+
+def otimizar_dtypes(df, codificador=None, schema=SCHEMA_DTYPES):
+    """Converte o DataFrame limpo para os dtypes compactos de ``schema``.
+
+    As colunas ``<col>_encoded`` são descartadas: os códigos ficam em
+    ``df[col].cat.codes``. O ``codificador`` fixa as categorias (necessário para
+    que chunks limpos separadamente tenham o mesmo dicionário); sem ele, as
+    categorias vêm do próprio ``df``.
+    """
+    from uber_price.preprocessing import CodificadorCategorias
+
+    codificador = codificador or CodificadorCategorias().fit(df)
+    df = df.drop(columns=[f"{col}_encoded" for col in COLUNAS_CODIFICADAS], errors="ignore")
+    convertidas = {}
+    for col, dtype in schema.items():
+        if col not in df.columns:
+            continue
+        if dtype == "category":
+            convertidas[col] = codificador.categorical(col, df[col])
+        else:
+            convertidas[col] = df[col].astype(dtype)
+    return df.assign(**convertidas)
+
+
+def relatorio_memoria(antes, depois):
+    """Bytes por coluna antes/depois de otimizar_dtypes (``memory_usage(deep=True)``)."""
+    rel = pd.DataFrame({
+        "bytes_antes": antes.memory_usage(deep=True, index=False),
+        "bytes_depois": depois.memory_usage(deep=True, index=False),
+    }).reindex(antes.columns)
+    rel["dtype_antes"] = antes.dtypes.astype(str)
+    rel["dtype_depois"] = depois.dtypes.reindex(rel.index).astype(str)
+    rel = rel.fillna({"bytes_depois": 0, "dtype_depois": "(removida)"})
+    rel["economia"] = rel["bytes_antes"] - rel["bytes_depois"]
+    rel.loc["TOTAL"] = [rel["bytes_antes"].sum(), rel["bytes_depois"].sum(), "", "", rel["economia"].sum()]
+    return rel
+
+
+@cronometrado("filtrar_uber")
+def filtrar_uber(df):
+    """Mantém apenas as corridas da plataforma Uber (remove o Lyft)."""
+    df = df[df["cab_type"].str.lower() == "uber"]
+    # Categorias só do Lyft virariam colunas vazias no get_dummies
+    categoricas = df.select_dtypes("category").columns
+    if len(categoricas):
+        df = df.assign(**{col: df[col].cat.remove_unused_categories() for col in categoricas})
+    return df
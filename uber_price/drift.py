@@ -0,0 +1,93 @@
+"""Perfil dos dados de treino e verificação de drift de um lote novo.
+
+``perfil_dados`` resume cada feature em proporções por faixa (quantis do
+treino, para as numéricas) ou por categoria; o resumo é salvo no
+``meta.json`` do registro, então o lote novo é comparado sem reler os dados
+antigos. O drift de cada feature é medido pelo PSI (Population Stability
+Index): abaixo de 0,1 estável, entre 0,1 e 0,25 moderado, acima de 0,25
+relevante. ``verificar_drift`` também compara o RMSE do modelo no lote novo
+com o RMSE de teste registrado.
+"""
+
+import numpy as np
+import pandas as pd
+
+LIMIAR_PSI = 0.25
+LIMIAR_RMSE = 1.2  # RMSE no lote novo até 20% acima do registrado
+_EPS = 1e-4
+
+
+def perfil_dados(X, n_faixas=10):
+    """``{coluna: {"tipo", "bordas"|"categorias", "proporcoes"}}`` (serializável em JSON)."""
+    perfil = {}
+    for col, serie in X.items():
+        if isinstance(serie.dtype, pd.CategoricalDtype) or serie.dtype == object:
+            freq = serie.astype(object).value_counts(normalize=True, dropna=False)
+            perfil[col] = {"tipo": "categorica", "categorias": [str(c) for c in freq.index],
+                           "proporcoes": freq.tolist()}
+        else:
+            valores = serie.to_numpy(dtype=np.float64)
+            bordas = np.unique(np.nanquantile(valores, np.linspace(0, 1, n_faixas + 1)))
+            perfil[col] = {"tipo": "numerica", "bordas": bordas.tolist(),
+                           "proporcoes": _proporcoes_numericas(valores, bordas).tolist()}
+    return perfil
+
+
+def _proporcoes_numericas(valores, bordas):
+    # Faixas internas dos quantis + uma faixa abaixo e outra acima do intervalo de treino
+    faixas = np.searchsorted(np.asarray(bordas)[1:-1], valores, side="right")
+    faixas = np.where(valores < bordas[0], -1, faixas) + 1
+    faixas = np.where(valores > bordas[-1], len(bordas), faixas)
+    contagem = np.bincount(faixas[~np.isnan(valores)], minlength=len(bordas) + 1)
+    return contagem / max(contagem.sum(), 1)
+
+
+def psi(esperado, observado):
+    esperado = np.clip(np.asarray(esperado, dtype=np.float64), _EPS, None)
+    observado = np.clip(np.asarray(observado, dtype=np.float64), _EPS, None)
+    return float(np.sum((observado - esperado) * np.log(observado / esperado)))
+
+
+def psi_features(perfil, X):
+    """PSI de cada coluna de ``X`` em relação ao ``perfil`` do treino."""
+    resultado = {}
+    for col, ref in perfil.items():
+        if col not in X.columns:
+            continue
+        if ref["tipo"] == "categorica":
+            freq = X[col].astype(object).astype(str).value_counts(normalize=True)
+            observado = [freq.get(c, 0.0) for c in ref["categorias"]]
+            novas = 1.0 - sum(observado)  # categorias que não existiam no treino
+            resultado[col] = psi(ref["proporcoes"] + [0.0], observado + [novas])
+        else:
+            bordas = np.asarray(ref["bordas"])
+            esperado = np.asarray(ref["proporcoes"])
+            observado = _proporcoes_numericas(X[col].to_numpy(dtype=np.float64), bordas)
+            resultado[col] = psi(esperado, observado)
+    return resultado
+
+
+def verificar_drift(meta, X, y=None, modelo=None, limiar_psi=LIMIAR_PSI, limiar_rmse=LIMIAR_RMSE):
+    """Relatório de drift do lote ``X`` (e ``y``) contra o modelo registrado em ``meta``.
+
+    ``retreinar`` é ``True`` se alguma feature passar de ``limiar_psi`` ou se o
+    RMSE no lote passar de ``limiar_rmse`` vezes o RMSE de referência.
+    """
+    relatorio = {"psi": {}, "psi_max": 0.0, "rmse_lote": None, "rmse_referencia": None, "motivos": []}
+    if "perfil" in meta:
+        relatorio["psi"] = psi_features(meta["perfil"], X)
+        relatorio["psi_max"] = max(relatorio["psi"].values(), default=0.0)
+        for col, valor in relatorio["psi"].items():
+            if valor > limiar_psi:
+                relatorio["motivos"].append(f"PSI de {col} = {valor:.3f} > {limiar_psi}")
+    else:
+        relatorio["motivos"].append("modelo registrado sem perfil dos dados de treino")
+
+    rmse_ref = meta.get("rmse_referencia", meta.get("metricas", {}).get("RMSE_test"))
+    if modelo is not None and y is not None and rmse_ref:
+        rmse = float(np.sqrt(np.mean((np.asarray(y) - modelo.predict(X)) ** 2)))
+        relatorio["rmse_lote"], relatorio["rmse_referencia"] = rmse, rmse_ref
+        if rmse > limiar_rmse * rmse_ref:
+            relatorio["motivos"].append(f"RMSE no lote {rmse:.3f} > {limiar_rmse} x {rmse_ref:.3f}")
+    relatorio["retreinar"] = bool(relatorio["motivos"])
+    return relatorio
@@ -0,0 +1,124 @@
+"""Agregados da aba de EDA do app: histogramas, contagens, densidade preço x distância e correlação.
+
+O notebook desenha a EDA a partir das linhas (``sns.scatterplot`` com todas
+as corridas, ``histplot`` numa amostra de 50 mil, um ``value_counts`` por
+coluna). ``resumir`` percorre o dataset uma vez: as numéricas e os códigos
+das categóricas (os ``*_encoded`` do notebook) viram uma única matriz
+float64, da qual saem os histogramas de faixas fixas, a densidade 2D preço x
+distância (com o preço médio por faixa de distância) e a matriz de
+correlação (um produto ``XᵀX``); as contagens vêm de ``np.bincount`` nos
+códigos das categóricas.
+
+O ``ResumoEDA`` resultante tem poucos KB, é guardado no cache do app
+(``recursos.eda``) pelo hash do upload e os gráficos são desenhados a
+partir dele, sem passar as corridas ao navegador.
+"""
+
+import numpy as np
+import pandas as pd
+
+COLUNAS_HISTOGRAMA = ["price", "distance", "duration", "surge_multiplier"]
+COLUNAS_CONTAGEM = ["name", "source", "destination", "short_summary", "cab_type"]
+# Categóricas entram pelos códigos, como os ``*_encoded`` da matriz do notebook
+COLUNAS_CORRELACAO = ["price", "distance", "duration", "surge_multiplier", "apparentTemperature",
+                      "source", "destination", "cab_type", "name", "short_summary", "icon"]
+
+N_FAIXAS = 50
+N_FAIXAS_DENSIDADE = 40
+
+
+class ResumoEDA:
+    """Agregados de um dataset limpo (DataFrames pequenos, prontos para os gráficos)."""
+
+    def __init__(self, linhas, histogramas, contagens, densidade, curva, correlacao):
+        self.linhas = linhas
+        self.histogramas = histogramas  # coluna -> DataFrame(inicio, fim, corridas)
+        self.contagens = contagens  # coluna -> Series categoria -> corridas (decrescente)
+        self.densidade = densidade  # células não vazias: distancia_*, preco_*, corridas
+        self.curva = curva  # preço médio por faixa de distância
+        self.correlacao = correlacao
+
+    @property
+    def nbytes(self):
+        quadros = [*self.histogramas.values(), *self.contagens.values(), self.densidade, self.curva, self.correlacao]
+        return int(sum(np.sum(q.memory_usage(deep=True)) for q in quadros))
+
+
+def resumir(df, n_faixas=N_FAIXAS, n_faixas_densidade=N_FAIXAS_DENSIDADE):
+    colunas = [col for col in dict.fromkeys(COLUNAS_HISTOGRAMA + COLUNAS_CORRELACAO) if col in df.columns]
+    matriz = np.column_stack([_valores(df[col]) for col in colunas])
+    coluna = {col: matriz[:, j] for j, col in enumerate(colunas)}
+
+    histogramas = {col: _histograma(coluna[col], n_faixas) for col in COLUNAS_HISTOGRAMA if col in coluna}
+    contagens = {col: _contagem(df[col]) for col in COLUNAS_CONTAGEM if col in df.columns}
+    densidade, curva = _densidade(coluna["distance"], coluna["price"], n_faixas_densidade)
+    correlacionadas = [col for col in COLUNAS_CORRELACAO if col in coluna]
+    correlacao = _correlacao(matriz[:, [colunas.index(col) for col in correlacionadas]], correlacionadas)
+    return ResumoEDA(len(df), histogramas, contagens, densidade, curva, correlacao)
+
+
+def _valores(serie):
+    """float64 da coluna; categóricas viram os códigos (NaN para faltantes)."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        codigos = serie.cat.codes.to_numpy().astype(np.float64)
+        codigos[codigos < 0] = np.nan
+        return codigos
+    if serie.dtype == object:
+        return _valores(serie.astype("category"))
+    return serie.to_numpy(np.float64, na_value=np.nan)
+
+
+def _faixas(valores, n):
+    finitos = valores[np.isfinite(valores)]
+    if not len(finitos):
+        return np.linspace(0, 1, n + 1)
+    menor, maior = finitos.min(), finitos.max()
+    return np.linspace(menor, maior if maior > menor else menor + 1, n + 1)
+
+
+def _histograma(valores, n):
+    bordas = _faixas(valores, n)
+    contagem, _ = np.histogram(valores[np.isfinite(valores)], bordas)
+    return pd.DataFrame({"inicio": bordas[:-1], "fim": bordas[1:], "corridas": contagem})
+
+
+def _contagem(serie):
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        codigos = serie.cat.codes.to_numpy()
+        contagem = np.bincount(codigos[codigos >= 0], minlength=len(serie.cat.categories))
+        return pd.Series(contagem, index=serie.cat.categories.astype(str), name="corridas") \
+            .sort_values(ascending=False)
+    return serie.value_counts().rename("corridas")
+
+
+def _densidade(distancia, preco, n):
+    validas = np.isfinite(distancia) & np.isfinite(preco)
+    distancia, preco = distancia[validas], preco[validas]
+    bordas_d, bordas_p = _faixas(distancia, n), _faixas(preco, n)
+    contagem, _, _ = np.histogram2d(distancia, preco, [bordas_d, bordas_p])
+    i, j = np.nonzero(contagem)
+    densidade = pd.DataFrame({
+        "distancia_inicio": bordas_d[i], "distancia_fim": bordas_d[i + 1],
+        "preco_inicio": bordas_p[j], "preco_fim": bordas_p[j + 1],
+        "corridas": contagem[i, j].astype(np.int64),
+    })
+
+    faixa = np.clip(np.searchsorted(bordas_d, distancia, side="right") - 1, 0, n - 1)
+    corridas = np.bincount(faixa, minlength=n)
+    com_corridas = corridas > 0
+    curva = pd.DataFrame({
+        "distancia": ((bordas_d[:-1] + bordas_d[1:]) / 2)[com_corridas],
+        "preco_medio": (np.bincount(faixa, weights=preco, minlength=n) / np.maximum(corridas, 1))[com_corridas],
+    })
+    return densidade, curva
+
+
+def _correlacao(matriz, colunas):
+    """Pearson das linhas completas (colunas constantes ficam NaN, como no ``DataFrame.corr``)."""
+    matriz = matriz[np.isfinite(matriz).all(axis=1)]
+    centrada = matriz - matriz.mean(axis=0)
+    cov = centrada.T @ centrada
+    desvio = np.sqrt(np.diag(cov))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov / np.outer(desvio, desvio)
+    return pd.DataFrame(np.clip(corr, -1, 1), index=colunas, columns=colunas)
@@ -0,0 +1,149 @@
+"""Stacking a partir das predições out-of-fold guardadas durante a busca.
+
+O ``StackingRegressor(cv=cv)`` reajusta cada modelo base nos mesmos 3 folds
+que a busca já avaliou (um depois do outro, ``n_jobs=1``) só para obter as
+meta-features, e ainda reajusta cada base nos dados inteiros. Aqui:
+
+* ``PredicoesFold`` guarda as predições de cada avaliação ``(modelo,
+  candidato, fold)`` da busca (em disco ao lado do checkpoint, ou em memória);
+  ao fim da busca ficam marcadas as chaves do melhor candidato de cada modelo;
+* ``empilhar`` monta as meta-features com essas predições, faz num único
+  pool só os ajustes que faltam (folds sem predição guardada, bases que
+  precisam de refit nos dados inteiros) e treina o ``RidgeCV`` direto.
+
+As predições guardadas vêm de ``clone(estimador).set_params(**melhores)``
+ajustado nos mesmos folds de ``models.cv``, então o blender é o mesmo do
+``StackingRegressor`` (``build_stacking``). Modelos buscados numa subamostra
+não têm predições para todas as linhas, e os folds deles são refeitos aqui.
+"""
+
+import hashlib
+from pathlib import Path
+
+import numpy as np
+
+
+class PredicoesFold:
+    """Predições de teste de cada fold avaliado, por chave de ``busca.chave``."""
+
+    def __init__(self, pasta=None):
+        self.pasta = Path(pasta) if pasta else None
+        self._memoria = {}
+        self.melhores = {}  # nome do modelo -> chaves (uma por fold) do melhor candidato
+
+    def _arquivo(self, chave):
+        return self.pasta / f"{hashlib.sha1(chave.encode()).hexdigest()[:24]}.npy"
+
+    def __contains__(self, chave):
+        return chave in self._memoria or (self.pasta is not None and self._arquivo(chave).is_file())
+
+    def guardar(self, chave, predicoes):
+        predicoes = np.asarray(predicoes, dtype=np.float64)
+        if self.pasta is None:
+            self._memoria[chave] = predicoes
+            return
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        destino = self._arquivo(chave)
+        tmp = destino.with_suffix(".tmp.npy")
+        np.save(tmp, predicoes)
+        tmp.replace(destino)
+
+    def carregar(self, chave):
+        if chave in self._memoria:
+            return self._memoria[chave]
+        return np.load(self._arquivo(chave))
+
+    def oof(self, nome, folds, n):
+        """Predições out-of-fold do melhor candidato de ``nome`` (``None`` se faltar algum fold)."""
+        chaves = self.melhores.get(nome)
+        if chaves is None or len(chaves) != len(folds) or not all(k in self for k in chaves):
+            return None
+        oof = np.empty(n)
+        for k, (_, teste) in zip(chaves, folds):
+            pred = self.carregar(k)
+            if len(pred) != len(teste):
+                return None
+            oof[teste] = pred
+        return oof
+
+
+class Empilhamento:
+    """Blender sobre as predições dos modelos base (o ``predict`` do ``StackingRegressor``).
+
+    Expõe os mesmos atributos ajustados: ``estimators_``, ``named_estimators_``
+    e ``final_estimator_``.
+    """
+
+    def __init__(self, estimadores, final):
+        self.named_estimators_ = dict(estimadores)
+        self.estimators_ = list(self.named_estimators_.values())
+        self.final_estimator_ = final
+
+    def transform(self, X):
+        return np.column_stack([est.predict(X) for est in self.estimators_])
+
+    def predict(self, X):
+        return self.final_estimator_.predict(self.transform(X))
+
+
+def _prever_fold(nome, estimador, dados, treino, teste):
+    from sklearn.base import clone
+    from uber_price.busca import _xy
+
+    X, y = _xy(dados)
+    modelo = clone(estimador).fit(X.iloc[treino], y.iloc[treino])
+    return "fold", nome, teste, modelo.predict(X.iloc[teste])
+
+
+def _ajustar(nome, estimador, dados):
+    from sklearn.base import clone
+    from uber_price.busca import _xy
+
+    X, y = _xy(dados)
+    return "refit", nome, None, clone(estimador).fit(X, y)
+
+
+def empilhar(bases, X, y, oof=None, reajustar=(), n_jobs=-1, verbose=1):
+    """Ajusta o blender ``RidgeCV`` sobre ``bases`` (lista ``(nome, estimador)``).
+
+    ``oof`` (``{nome: predições out-of-fold}``) dispensa os ajustes por fold da
+    base; os estimadores já estão ajustados em ``X, y``, exceto os de
+    ``reajustar``. Os ajustes que faltarem rodam num único pool do joblib.
+    """
+    from joblib import Parallel, delayed, effective_n_jobs
+    from sklearn.linear_model import RidgeCV
+    from uber_price.compartilhado import DadosCompartilhados
+    from uber_price.models import cv
+
+    oof = {nome: np.asarray(p, dtype=np.float64) for nome, p in (oof or {}).items() if p is not None}
+    folds = list(cv.split(X))
+    ajustados = dict(bases)
+    meta = {nome: oof[nome].copy() if nome in oof else np.empty(len(X)) for nome, _ in bases}
+
+    tarefas = [(nome, est, treino, teste) for nome, est in bases if nome not in oof for treino, teste in folds]
+    refits = [(nome, est) for nome, est in bases if nome in reajustar]
+    if verbose:
+        print(f"[stacking] {len(tarefas)} ajustes por fold e {len(refits)} refits "
+              f"({len(oof)} de {len(bases)} bases com predições out-of-fold guardadas)")
+
+    compartilhado = None
+    dados = (X, y)
+    if tarefas or refits:
+        if len(tarefas) + len(refits) > 1 and effective_n_jobs(n_jobs) > 1:
+            compartilhado = dados = DadosCompartilhados(X, y)
+        try:
+            with Parallel(n_jobs=n_jobs, return_as="generator_unordered") as paralelo:
+                jobs = [delayed(_prever_fold)(nome, est, dados, treino, teste) for nome, est, treino, teste in tarefas]
+                jobs += [delayed(_ajustar)(nome, est, dados) for nome, est in refits]
+                for tipo, nome, teste, resultado in paralelo(jobs):
+                    if tipo == "fold":
+                        meta[nome][teste] = resultado
+                    else:
+                        ajustados[nome] = resultado
+        finally:
+            if compartilhado is not None:
+                compartilhado.remover()
+
+    final = RidgeCV(alphas=np.logspace(-4, 4, 20), cv=cv)
+    final.fit(np.column_stack([meta[nome] for nome, _ in bases]), y)
+    return Empilhamento([(nome, ajustados[nome]) for nome, _ in bases], final)
@@ -0,0 +1,306 @@
+"""Estatísticas aproximadas em streaming (esboços) para perfilar logs de corridas sem limite de tamanho.
+
+A EDA do notebook usa ``describe``, ``value_counts``, ``corr`` e histogramas
+de amostras, que precisam do DataFrame inteiro em memória. Aqui cada
+estatística é um esboço de memória constante, atualizado chunk a chunk e
+**combinável** (``juntar``): esboços de chunks, processos ou dias diferentes
+somados dão o mesmo resultado (a menos do erro declarado) que um único
+esboço de todas as linhas.
+
+* ``EsbocoQuantis`` – quantis no estilo KLL: níveis de compactadores com
+  capacidade decrescente; um nível cheio é ordenado e metade dos itens
+  (pares ou ímpares, sorteado) sobe ao nível seguinte com o dobro do peso.
+  Memória ``O(k)``; com ``k=200`` o erro de rank fica em torno de 1%.
+  Mínimo e máximo são exatos;
+* ``Histograma`` – faixas fixas (as mesmas em todos os esboços), exato;
+* ``Frequentes`` – contagens exatas enquanto houver até ``k`` valores
+  distintos (zonas, serviços); acima disso, Misra-Gries: cada contagem
+  fica subestimada em no máximo ``erro`` <= n/(k+1);
+* ``Covariancia`` – média e co-momentos combinados pela fórmula de Chan
+  (estável, sem somas de quadrados), dos quais saem a covariância e a
+  matriz de correlação.
+
+``PerfilStreaming`` junta esses esboços para as colunas do dataset limpo e
+``perfilar_arquivos`` percorre CSV/Parquet brutos em chunks, distribuídos
+entre processos pelo joblib, combinando os perfis parciais à medida que
+chegam.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+NUMERICAS_PERFIL = ["price", "distance", "duration", "surge_multiplier", "hour", "apparentTemperature",
+                    "precipIntensity", "precipProbability"]
+CATEGORICAS_PERFIL = ["source", "destination", "name", "cab_type", "short_summary"]
+CORRELACAO_PERFIL = ["price", "distance", "duration", "surge_multiplier", "hour", "apparentTemperature"]
+BORDAS_PADRAO = {
+    "price": np.linspace(0, 100, 51),
+    "distance": np.linspace(0, 8, 41),
+    "duration": np.linspace(0, 24, 49),
+    "surge_multiplier": np.linspace(1, 3, 9),
+    "hour": np.arange(25),
+}
+
+
+class EsbocoQuantis:
+    """Quantis aproximados (KLL) de um fluxo de números; NaN é ignorado."""
+
+    def __init__(self, k=200, semente=None):
+        self.k = k
+        self.n = 0
+        self.minimo, self.maximo = np.inf, -np.inf
+        self._niveis = [np.empty(0)]
+        self._rng = np.random.default_rng(semente)
+
+    def _capacidade(self, nivel):
+        return max(2, int(np.ceil(self.k * (2 / 3) ** (len(self._niveis) - nivel - 1))))
+
+    def _compactar(self):
+        cheio = True
+        while cheio:  # um nível novo reduz a capacidade dos de baixo
+            cheio = False
+            for nivel in range(len(self._niveis)):
+                itens = self._niveis[nivel]
+                if len(itens) <= self._capacidade(nivel):
+                    continue
+                cheio = True
+                if nivel + 1 == len(self._niveis):
+                    self._niveis.append(np.empty(0))
+                itens = np.sort(itens)
+                impar = len(itens) % 2  # o menor fica no nível quando a conta é ímpar
+                self._niveis[nivel] = itens[:impar]
+                sobe = itens[impar + self._rng.integers(2)::2]
+                self._niveis[nivel + 1] = np.concatenate([self._niveis[nivel + 1], sobe])
+
+    def atualizar(self, valores):
+        valores = np.asarray(valores, dtype=np.float64).ravel()
+        valores = valores[~np.isnan(valores)]
+        if len(valores):
+            self.n += len(valores)
+            self.minimo = min(self.minimo, valores.min())
+            self.maximo = max(self.maximo, valores.max())
+            self._niveis[0] = np.concatenate([self._niveis[0], valores])
+            self._compactar()
+        return self
+
+    def juntar(self, outro):
+        for nivel, itens in enumerate(outro._niveis):
+            if nivel == len(self._niveis):
+                self._niveis.append(np.empty(0))
+            self._niveis[nivel] = np.concatenate([self._niveis[nivel], itens])
+        self.n += outro.n
+        self.minimo, self.maximo = min(self.minimo, outro.minimo), max(self.maximo, outro.maximo)
+        self._compactar()
+        return self
+
+    @property
+    def itens(self):
+        """Valores guardados (a memória do esboço)."""
+        return sum(len(itens) for itens in self._niveis)
+
+    def quantil(self, q):
+        """Quantil(is) ``q`` em [0, 1]; NaN se o esboço estiver vazio."""
+        q = np.asarray(q, dtype=np.float64)
+        if not self.n:
+            return np.full(q.shape, np.nan)[()]
+        valores = np.concatenate(self._niveis)
+        pesos = np.concatenate([np.full(len(itens), 2.0 ** nivel) for nivel, itens in enumerate(self._niveis)])
+        ordem = np.argsort(valores, kind="stable")
+        valores, acumulado = valores[ordem], np.cumsum(pesos[ordem])
+        posicao = np.searchsorted(acumulado, q * acumulado[-1], side="left")
+        resultado = valores[np.minimum(posicao, len(valores) - 1)]
+        resultado = np.where(q <= 0, self.minimo, np.where(q >= 1, self.maximo, resultado))
+        return resultado[()]
+
+
+class Histograma:
+    """Contagens em faixas fixas; valores fora de ``[bordas[0], bordas[-1]]`` vão para ``abaixo``/``acima``."""
+
+    def __init__(self, bordas):
+        self.bordas = np.asarray(bordas, dtype=np.float64)
+        self.contagem = np.zeros(len(self.bordas) - 1, dtype=np.int64)
+        self.abaixo = self.acima = 0
+
+    def atualizar(self, valores):
+        valores = np.asarray(valores, dtype=np.float64).ravel()
+        valores = valores[~np.isnan(valores)]
+        self.contagem += np.histogram(valores, self.bordas)[0]
+        self.abaixo += int((valores < self.bordas[0]).sum())
+        self.acima += int((valores > self.bordas[-1]).sum())
+        return self
+
+    def juntar(self, outro):
+        if not np.array_equal(self.bordas, outro.bordas):
+            raise ValueError("Só é possível juntar histogramas com as mesmas faixas")
+        self.contagem += outro.contagem
+        self.abaixo += outro.abaixo
+        self.acima += outro.acima
+        return self
+
+    def tabela(self):
+        """DataFrame ``(inicio, fim, corridas)``, no formato de ``eda.ResumoEDA.histogramas``."""
+        return pd.DataFrame({"inicio": self.bordas[:-1], "fim": self.bordas[1:], "corridas": self.contagem})
+
+
+class Frequentes:
+    """Valores mais frequentes: exato até ``k`` distintos, Misra-Gries acima disso."""
+
+    def __init__(self, k=100):
+        self.k = k
+        self.n = 0
+        self.erro = 0  # quanto cada contagem pode estar subestimada
+        self.contagem = {}
+
+    def _somar(self, contagens, n):
+        for valor, c in contagens.items():
+            self.contagem[valor] = self.contagem.get(valor, 0) + int(c)
+        self.n += int(n)
+        if len(self.contagem) > self.k:
+            # Desconta a (k+1)-ésima maior contagem de todas e descarta as que zeram
+            limiar = sorted(self.contagem.values(), reverse=True)[self.k]
+            self.contagem = {valor: c - limiar for valor, c in self.contagem.items() if c > limiar}
+            self.erro += limiar
+
+    def atualizar(self, valores):
+        contagens = pd.Series(valores).value_counts()
+        contagens = contagens[contagens > 0]  # categorias sem corridas neste chunk
+        self._somar(contagens.to_dict(), contagens.sum())
+        return self
+
+    def juntar(self, outro):
+        self.erro += outro.erro
+        self._somar(outro.contagem, outro.n)
+        return self
+
+    def mais_frequentes(self, n=None):
+        serie = pd.Series(self.contagem, dtype=np.int64, name="corridas").sort_values(ascending=False)
+        return serie if n is None else serie.head(n)
+
+
+class Covariancia:
+    """Média e covariância das linhas completas de ``colunas`` (combinação de Chan)."""
+
+    def __init__(self, colunas):
+        self.colunas = list(colunas)
+        self.n = 0
+        self.media = np.zeros(len(self.colunas))
+        self.comomento = np.zeros((len(self.colunas), len(self.colunas)))
+
+    def _somar(self, n, media, comomento):
+        if not n:
+            return
+        total = self.n + n
+        delta = media - self.media
+        self.comomento += comomento + np.outer(delta, delta) * (self.n * n / total)
+        self.media += delta * (n / total)
+        self.n = total
+
+    def atualizar(self, matriz):
+        matriz = np.asarray(matriz, dtype=np.float64).reshape(len(matriz), -1)
+        matriz = matriz[np.isfinite(matriz).all(axis=1)]
+        if len(matriz):
+            media = matriz.mean(axis=0)
+            centrada = matriz - media
+            self._somar(len(matriz), media, centrada.T @ centrada)
+        return self
+
+    def juntar(self, outro):
+        if self.colunas != outro.colunas:
+            raise ValueError("Só é possível juntar covariâncias das mesmas colunas")
+        self._somar(outro.n, outro.media, outro.comomento)
+        return self
+
+    def covariancia(self):
+        return pd.DataFrame(self.comomento / max(self.n - 1, 1), index=self.colunas, columns=self.colunas)
+
+    def correlacao(self):
+        desvio = np.sqrt(np.diag(self.comomento))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = self.comomento / np.outer(desvio, desvio)
+        return pd.DataFrame(np.clip(corr, -1, 1), index=self.colunas, columns=self.colunas)
+
+
+class PerfilStreaming:
+    """Esboços das colunas do dataset limpo: ``describe``, contagens, histogramas e correlação."""
+
+    def __init__(self, numericas=NUMERICAS_PERFIL, categoricas=CATEGORICAS_PERFIL, correlacao=CORRELACAO_PERFIL,
+                 bordas=BORDAS_PADRAO, k_quantis=200, k_frequentes=100, semente=None):
+        rng = np.random.default_rng(semente)
+        self.linhas = 0
+        self.quantis = {col: EsbocoQuantis(k_quantis, rng.integers(2 ** 32)) for col in numericas}
+        self.momentos = {col: Covariancia([col]) for col in numericas}
+        self.histogramas = {col: Histograma(b) for col, b in bordas.items() if col in self.quantis}
+        self.frequentes = {col: Frequentes(k_frequentes) for col in categoricas}
+        self.covariancia = Covariancia(correlacao)
+
+    def atualizar(self, df):
+        self.linhas += len(df)
+        for col, esboco in self.quantis.items():
+            if col in df.columns:
+                valores = df[col].to_numpy(np.float64, na_value=np.nan)
+                esboco.atualizar(valores)
+                self.momentos[col].atualizar(valores)
+                if col in self.histogramas:
+                    self.histogramas[col].atualizar(valores)
+        for col, esboco in self.frequentes.items():
+            if col in df.columns:
+                esboco.atualizar(df[col])
+        presentes = [col for col in self.covariancia.colunas if col in df.columns]
+        if presentes == self.covariancia.colunas:
+            self.covariancia.atualizar(df[presentes].to_numpy(np.float64, na_value=np.nan))
+        return self
+
+    def juntar(self, outro):
+        self.linhas += outro.linhas
+        for meus, deles in [(self.quantis, outro.quantis), (self.momentos, outro.momentos),
+                            (self.histogramas, outro.histogramas), (self.frequentes, outro.frequentes)]:
+            for col, esboco in meus.items():
+                esboco.juntar(deles[col])
+        self.covariancia.juntar(outro.covariancia)
+        return self
+
+    def descricao(self, quantis=(0.25, 0.5, 0.75)):
+        """Tabela no formato do ``DataFrame.describe`` (quantis aproximados)."""
+        linhas = {}
+        for col, esboco in self.quantis.items():
+            momentos = self.momentos[col]
+            desvio = np.sqrt(momentos.comomento[0, 0] / (momentos.n - 1)) if momentos.n > 1 else np.nan
+            linhas[col] = {"count": esboco.n, "mean": momentos.media[0] if momentos.n else np.nan, "std": desvio,
+                           "min": esboco.minimo if esboco.n else np.nan,
+                           **{f"{q:.0%}": v for q, v in zip(quantis, esboco.quantil(quantis))},
+                           "max": esboco.maximo if esboco.n else np.nan}
+        return pd.DataFrame(linhas)
+
+    def correlacao(self):
+        return self.covariancia.correlacao()
+
+
+def _perfil_chunk(chunk, semente, apenas_uber, opcoes):
+    from uber_price.data import filtrar_uber, limparDados
+
+    df = limparDados(chunk, compacto=True)
+    if apenas_uber:
+        df = filtrar_uber(df)
+    return PerfilStreaming(semente=semente, **opcoes).atualizar(df)
+
+
+def perfilar_arquivos(caminhos, chunksize=100_000, n_jobs=-1, apenas_uber=False, **opcoes):
+    """Perfil de um ou mais CSV/Parquet brutos numa passada (limpeza e esboços por chunk, em paralelo).
+
+    Em memória ficam os chunks em processamento e um perfil de tamanho fixo.
+    ``opcoes`` vão para ``PerfilStreaming``.
+    """
+    from itertools import count
+    from joblib import Parallel, delayed
+    from uber_price.predicao import ler_em_chunks
+
+    caminhos = [caminhos] if isinstance(caminhos, (str, os.PathLike)) else caminhos
+    sementes = count()
+    tarefas = (delayed(_perfil_chunk)(chunk, next(sementes), apenas_uber, opcoes)
+               for caminho in caminhos for chunk in ler_em_chunks(caminho, chunksize))
+    perfil = PerfilStreaming(**opcoes)
+    for parcial in Parallel(n_jobs=n_jobs, return_as="generator")(tarefas):
+        perfil.juntar(parcial)
+    return perfil
@@ -0,0 +1,21 @@
+"""Métricas finais de avaliação no conjunto de teste."""
+
+import numpy as np
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+
+def calc_rmse(y_true, y_pred):
+    return np.sqrt(mean_squared_error(y_true, y_pred))
+
+
+def eval_model(name, model, X_test, y_test, oob=False):
+    y_pred = model.predict(X_test)
+    res = {
+        "RMSE_test": calc_rmse(y_test, y_pred),
+        "MAE_test": mean_absolute_error(y_test, y_pred),
+        "R2_test": r2_score(y_test, y_pred)
+    }
+    estimador = model[-1] if hasattr(model, "steps") else model  # Pipeline → último passo
+    if oob and hasattr(estimador, "oob_score_"):
+        res["OOB_R2"] = estimador.oob_score_
+    return res
@@ -0,0 +1,122 @@
+"""Montagem da matriz de features e divisão treino/teste.
+
+Há dois caminhos:
+
+* ``codificar`` + ``separar_xy`` – o One-Hot denso do notebook
+  (``pd.get_dummies``), mantido para a EDA e como referência nos benchmarks;
+* ``selecionar_features`` – X compacto com as colunas categóricas no dtype
+  ``category``. Os modelos recebem esse X: os lineares, o SVR e os ensembles
+  de árvores fazem o One-Hot dentro do próprio Pipeline
+  (``preprocessador_esparso``: CSR, ou float32 denso para as árvores), e o
+  HistGradientBoosting usa as categorias nativamente
+  (``categorical_features="from_dtype"``). A matriz densa de dezenas de
+  colunas int64 nunca é criada.
+
+``montar_X`` monta esse X a partir de cotações avulsas (servidor, grade de preços).
+"""
+
+import pandas as pd
+
+from uber_price.rastreio import cronometrado
+
+CATEGORICAL_COLS_FINAL = [
+    'cab_type',
+    'name',
+    'short_summary',
+    'source',
+    'destination'
+]
+
+# Colunas que DEVEM ser removidas antes de treinar:
+COLUMNS_TO_DROP_FINAL = [
+    'price', 'datetime',
+    'source_encoded', 'destination_encoded', 'cab_type_encoded',
+    'name_encoded', 'short_summary_encoded', 'icon_encoded', 'icon', "apparentTemperature",
+    "precipIntensity", "precipProbability", "latitude", "longitude"
+    ]
+
+# Colunas numéricas que sobram em X depois de COLUMNS_TO_DROP_FINAL
+NUMERIC_COLS_FINAL = ['hour', 'day', 'month', 'distance', 'surge_multiplier', 'duration']
+
+TARGET = "price"
+
+
+def codificar(df):
+    """Aplica One-Hot Encoding nas colunas de CATEGORICAL_COLS_FINAL."""
+    return pd.get_dummies(
+        df, columns=CATEGORICAL_COLS_FINAL, drop_first=True, dtype=int
+    )
+
+
+def separar_xy(df_encoded):
+    """Separa preditores (X) e alvo (y), descartando as colunas redundantes."""
+    X = df_encoded.drop(columns=COLUMNS_TO_DROP_FINAL, errors='ignore')
+    y = df_encoded[TARGET]
+    return X, y
+
+
+@cronometrado("selecionar_features")
+def selecionar_features(df):
+    """X compacto (numéricas + categóricas como ``category``) e y.
+
+    Equivalente em informação ao ``separar_xy(codificar(df))``.
+    """
+    X = df[NUMERIC_COLS_FINAL + CATEGORICAL_COLS_FINAL]
+    objetos = [col for col in CATEGORICAL_COLS_FINAL if not isinstance(X[col].dtype, pd.CategoricalDtype)]
+    if objetos:
+        X = X.assign(**{col: X[col].astype("category") for col in objetos})
+    return X, df[TARGET]
+
+
+def preprocessador_esparso(denso=False):
+    """One-Hot (``drop="first"``, como o get_dummies) em CSR, com as numéricas repassadas.
+
+    Com ``denso=True`` sai um ndarray float32 (o dtype interno das árvores do
+    sklearn, que assim não copiam X; com CSR elas ficam muito mais lentas).
+    """
+    import numpy as np
+    from sklearn.compose import ColumnTransformer
+    from sklearn.preprocessing import OneHotEncoder
+
+    ohe = OneHotEncoder(drop="first", handle_unknown="ignore", sparse_output=not denso,
+                        dtype=np.float32 if denso else np.float64)
+    return ColumnTransformer(
+        [("ohe", ohe, CATEGORICAL_COLS_FINAL)],
+        remainder="passthrough",
+        sparse_threshold=0.0 if denso else 1.0,
+    )
+
+
+def montar_X(cotacoes, meta, codificador=None, rotas=None):
+    """X com as features de ``meta`` (nos dtypes do treino) para cotações em lista de dicts ou DataFrame.
+
+    ``duration`` é estimada a partir de ``distance`` quando não vier, como em
+    ``limparDados``. Com uma ``rotas.TabelaRotas``, cotações com ``source``,
+    ``destination`` e ``hour`` podem vir sem ``distance`` e a duração usa o
+    ritmo típico da rota (ver ``TabelaRotas.completar``).
+    """
+    from uber_price.rotas import estimar_duracao
+
+    df = cotacoes.copy() if isinstance(cotacoes, pd.DataFrame) else pd.DataFrame.from_records(cotacoes)
+    if rotas is not None:
+        df = rotas.completar(df)
+    elif "duration" not in df.columns and "distance" in df.columns:
+        df["duration"] = estimar_duracao(df["distance"])
+    faltando = [col for col, _ in meta["features"] if col not in df.columns]
+    if faltando:
+        raise ValueError(f"Campos obrigatórios ausentes: {faltando}")
+    colunas = {}
+    for col, dtype in meta["features"]:
+        if dtype == "category":
+            colunas[col] = codificador.categorical(col, df[col]) if codificador else df[col].astype("category")
+        else:
+            colunas[col] = df[col].astype(dtype)
+    return pd.DataFrame(colunas)
+
+
+@cronometrado("dividir")
+def dividir(X, y, test_size=0.2, random_state=42):
+    """Split reprodutível 80/20 usado em todo o projeto."""
+    from sklearn.model_selection import train_test_split
+
+    return train_test_split(X, y, test_size=test_size, random_state=random_state)
@@ -0,0 +1,326 @@
+"""Treino fora da memória: lê o cache colunar (Feather) lote a lote.
+
+O pipeline normal materializa o dataset limpo inteiro e o ``X_train``. Aqui o
+arquivo do cache (``cache.cachear_em_chunks``) é aberto com memory-map e
+percorrido por record batch; em memória ficam só o lote atual e o estado do
+modelo:
+
+* ``treinar_hgb_em_lotes`` – os limites dos bins do HistGradientBoosting são
+  calculados numa amostra uniforme (``Binarizador``) e o resto do arquivo é
+  binado lote a lote. Linhas com os mesmos bins viram uma única célula com
+  peso = contagem e alvo = média; com perda quadrática os gradientes e
+  hessianos somados por bin são os mesmos, então as árvores são as do treino
+  linha a linha sobre os dados binados (o ``min_samples_leaf`` passa a contar
+  células). Com as features padrão quase toda linha é uma célula, então o
+  número de células é limitado por ``max_celulas``: ao passar do orçamento, a
+  numérica que mais reduz o agregado tem os bins vizinhos unidos dois a dois
+  (no agregado e no ``Binarizador``) até caber. A memória fica em
+  O(``max_celulas`` + lote + amostra), com bins mais grossos quanto maior o arquivo;
+* ``treinar_sgd_em_lotes`` – baseline linear (``models.pipe_sgd``): One-Hot e
+  escala ajustados na amostra e ``partial_fit`` lote a lote, por ``epocas``.
+
+O split treino/teste é sorteado lote a lote com semente fixa (as mesmas linhas
+em todas as passadas) e as métricas de teste são acumuladas numa última
+passada, sem juntar as predições.
+"""
+
+import numpy as np
+import pandas as pd
+
+from uber_price.data import COLUNAS_CODIFICADAS, filtrar_uber
+from uber_price.features import CATEGORICAL_COLS_FINAL, NUMERIC_COLS_FINAL, TARGET
+
+FEATURES_PADRAO = NUMERIC_COLS_FINAL + CATEGORICAL_COLS_FINAL
+LINHAS_POR_LOTE = 100_000
+TAMANHO_AMOSTRA = 200_000
+MAX_CELULAS = 500_000  # ~8 MB de códigos + 16 bytes de soma/contagem por célula
+FALTANTE = 255  # código do bin de valores ausentes / categorias desconhecidas
+
+
+def ler_lotes(caminho, colunas=None, linhas_por_lote=LINHAS_POR_LOTE):
+    """Itera sobre DataFrames de até ``linhas_por_lote`` linhas do Feather ``caminho`` (memory-map)."""
+    import pyarrow as pa
+
+    with pa.memory_map(str(caminho)) as fonte:
+        leitor = pa.ipc.open_file(fonte)
+        for i in range(leitor.num_record_batches):
+            lote = leitor.get_batch(i)
+            if colunas is not None:
+                lote = lote.select(colunas)
+            for inicio in range(0, lote.num_rows, linhas_por_lote):
+                yield lote.slice(inicio, linhas_por_lote).to_pandas()
+
+
+def lotes_xy(caminho, features=FEATURES_PADRAO, fracao_teste=0.2, semente=42, linhas_por_lote=LINHAS_POR_LOTE):
+    """Itera sobre ``(X, y, teste)`` das corridas Uber; ``teste`` é a máscara do split, igual a cada passada."""
+    rng = np.random.default_rng(semente)
+    colunas = list(dict.fromkeys([*features, TARGET, "cab_type"]))
+    for df in ler_lotes(caminho, colunas, linhas_por_lote):
+        df = filtrar_uber(df)
+        yield df[features], df[TARGET].to_numpy(dtype=np.float64), rng.random(len(df)) < fracao_teste
+
+
+def _concatenar(partes):
+    """``pd.concat`` que mantém as categóricas (com categorias diferentes o pandas as converte em object)."""
+    from pandas.api.types import union_categoricals
+
+    colunas = {}
+    for col, dtype in partes[0].dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            colunas[col] = union_categoricals([p[col] for p in partes], ignore_order=True)
+        else:
+            colunas[col] = np.concatenate([p[col].to_numpy() for p in partes])
+    return pd.DataFrame(colunas)
+
+
+def amostrar(caminho, features=FEATURES_PADRAO, n=TAMANHO_AMOSTRA, semente=42, **kwargs):
+    """Amostra uniforme de até ``n`` linhas de treino (chaves aleatórias) e o codificador do arquivo.
+
+    O vocabulário vem do dicionário das colunas categóricas do Feather, o mesmo
+    em todos os lotes. Retorna ``(X, y, codificador, n_treino)``.
+    """
+    from uber_price.preprocessing import CodificadorCategorias
+
+    codificador = CodificadorCategorias().partial_fit(next(ler_lotes(caminho, COLUNAS_CODIFICADAS, 1)))
+    rng = np.random.default_rng(semente + 1)
+    amostra, n_treino = None, 0
+    for X, y, teste in lotes_xy(caminho, features, semente=semente, **kwargs):
+        X = X[~teste].assign(**{TARGET: y[~teste], "_chave": rng.random(int((~teste).sum()))})
+        n_treino += len(X)
+        amostra = X if amostra is None else _concatenar([amostra, X])
+        if len(amostra) > n:
+            amostra = amostra.nsmallest(n, "_chave")
+    amostra = codificador.transform(amostra.reset_index(drop=True))  # vocabulário do arquivo inteiro
+    return amostra[features], amostra[TARGET], codificador, n_treino
+
+
+class Binarizador:
+    """Códigos uint8 por feature: quantis da amostra nas numéricas, vocabulário nas categóricas.
+
+    O código ``FALTANTE`` (255) marca ausentes e categorias desconhecidas.
+    """
+
+    def __init__(self, max_bins=255):
+        if not 2 <= max_bins <= 255:
+            raise ValueError("max_bins deve estar entre 2 e 255")
+        self.max_bins = max_bins
+
+    def fit(self, X, categorias=None):
+        """``categorias`` (``{col: valores}``) substitui o vocabulário visto na amostra."""
+        categorias = categorias or {}
+        self.features_ = list(X.columns)
+        self.limites_, self.categorias_ = {}, {}
+        for col in self.features_:
+            if isinstance(X[col].dtype, pd.CategoricalDtype):
+                cats = pd.Index(categorias.get(col, X[col].cat.categories))
+                if len(cats) > self.max_bins:
+                    raise ValueError(f"{col} tem {len(cats)} categorias (máximo {self.max_bins})")
+                self.categorias_[col] = cats
+                continue
+            valores = X[col].to_numpy(dtype=np.float64)
+            distintos = np.unique(valores[~np.isnan(valores)])
+            if len(distintos) <= self.max_bins:
+                limites = (distintos[:-1] + distintos[1:]) / 2
+            else:  # como o _BinMapper do scikit-learn: quantis de pontos médios
+                percentis = np.linspace(0, 100, self.max_bins + 1)[1:-1]
+                limites = np.unique(np.percentile(valores[~np.isnan(valores)], percentis, method="midpoint"))
+            self.limites_[col] = limites
+        return self
+
+    @property
+    def categoricas(self):
+        return np.array([col in self.categorias_ for col in self.features_])
+
+    def transform(self, X):
+        codigos = np.empty((len(X), len(self.features_)), dtype=np.uint8)
+        for j, col in enumerate(self.features_):
+            if col in self.categorias_:
+                c = self.categorias_[col].get_indexer(np.asarray(X[col], dtype=object))
+                codigos[:, j] = np.where(c < 0, FALTANTE, c)
+            else:
+                valores = X[col].to_numpy(dtype=np.float64)
+                c = np.searchsorted(self.limites_[col], valores, side="left")
+                codigos[:, j] = np.where(np.isnan(valores), FALTANTE, c)
+        return codigos
+
+    def engrossar(self, col):
+        """Une os bins de ``col`` dois a dois: o código novo é ``codigo // 2``."""
+        self.limites_[col] = self.limites_[col][1::2]
+        return self.features_.index(col)
+
+    @staticmethod
+    def para_float(codigos):
+        """Códigos como float32 com NaN no ``FALTANTE`` (entrada do HistGradientBoosting)."""
+        X = codigos.astype(np.float32)
+        X[codigos == FALTANTE] = np.nan
+        return X
+
+
+class ModeloBinado:
+    """HistGradientBoosting treinado sobre os códigos do ``Binarizador``."""
+
+    def __init__(self, binarizador, modelo):
+        self.binarizador, self.modelo = binarizador, modelo
+
+    def predict(self, X):
+        return self.modelo.predict(Binarizador.para_float(self.binarizador.transform(X)))
+
+
+def _chaves_unicas(codigos, return_inverse=False):
+    """``np.unique`` das linhas de ``codigos`` (cada linha vira uma chave de bytes)."""
+    chaves = np.ascontiguousarray(codigos).view(np.dtype((np.void, codigos.shape[1]))).ravel()
+    return np.unique(chaves, return_inverse=return_inverse)
+
+
+def _agregar(partes):
+    """Junta ``(codigos, soma_y, contagem)`` somando as linhas com os mesmos códigos."""
+    codigos = np.concatenate([p[0] for p in partes])
+    soma = np.concatenate([p[1] for p in partes])
+    contagem = np.concatenate([p[2] for p in partes])
+    unicas, inverso = _chaves_unicas(codigos, return_inverse=True)
+    return (unicas.view(np.uint8).reshape(len(unicas), codigos.shape[1]),
+            np.bincount(inverso, weights=soma), np.bincount(inverso, weights=contagem))
+
+
+def _limitar(celulas, binarizador, max_celulas):
+    """Engrossa numéricas até o agregado ter no máximo ``max_celulas`` células.
+
+    A cada passo une os bins da numérica que mais reduz o número de células
+    (features redundantes, como ``distance`` e ``duration``, sozinhas quase não reduzem).
+    """
+    while len(celulas[0]) > max_celulas:
+        candidatas = {}
+        for col, limites in binarizador.limites_.items():
+            if len(limites):
+                codigos = _engrossar(celulas[0], binarizador.features_.index(col))
+                candidatas[col] = (len(_chaves_unicas(codigos)), -len(limites))
+        if not candidatas:
+            raise ValueError(f"As categóricas sozinhas passam de {max_celulas:,} células; aumente max_celulas")
+        col = min(candidatas, key=candidatas.get)
+        codigos = _engrossar(celulas[0], binarizador.engrossar(col))
+        celulas = _agregar([(codigos, *celulas[1:])])
+    return celulas
+
+
+def _engrossar(codigos, j):
+    codigos = codigos.copy()
+    validos = codigos[:, j] != FALTANTE
+    codigos[validos, j] //= 2
+    return codigos
+
+
+class _Metricas:
+    """RMSE, MAE e R² acumulados lote a lote (mesmas chaves de ``eval_model``)."""
+
+    def __init__(self):
+        self.n = 0
+        self.sq = self.abs = self.soma_y = self.soma_y2 = 0.0
+
+    def atualizar(self, y, pred):
+        erro = y - pred
+        self.n += len(y)
+        self.sq += float(erro @ erro)
+        self.abs += float(np.abs(erro).sum())
+        self.soma_y += float(y.sum())
+        self.soma_y2 += float(y @ y)
+
+    def resultado(self):
+        variancia = self.soma_y2 - self.soma_y ** 2 / self.n
+        return {"RMSE_test": float(np.sqrt(self.sq / self.n)), "MAE_test": self.abs / self.n,
+                "R2_test": 1 - self.sq / variancia}
+
+
+def _avaliar(modelo, caminho, features, **kwargs):
+    metricas = _Metricas()
+    for X, y, teste in lotes_xy(caminho, features, **kwargs):
+        if teste.any():
+            metricas.atualizar(y[teste], modelo.predict(X[teste]))
+    return metricas.resultado()
+
+
+def treinar_hgb_em_lotes(caminho, features=FEATURES_PADRAO, amostra=TAMANHO_AMOSTRA, max_bins=255,
+                         max_celulas=MAX_CELULAS, verbose=1, **params):
+    """HistGradientBoosting com bins da amostra e até ``max_celulas`` células agregadas lote a lote.
+
+    ``params`` vão para o ``HistGradientBoostingRegressor``. Retorna
+    ``(modelo, metricas, info)``; ``info`` tem a amostra, o codificador, as
+    contagens e os bins finais de cada numérica.
+    """
+    from sklearn.ensemble import HistGradientBoostingRegressor
+    from uber_price.models import RANDOM_STATE
+
+    X_amostra, y_amostra, codificador, n_treino = amostrar(caminho, features, amostra)
+    binarizador = Binarizador(max_bins).fit(X_amostra, codificador.categorias_)
+
+    celulas, pendentes, n_pendente = None, [], 0
+    for X, y, teste in lotes_xy(caminho, features):
+        codigos = binarizador.transform(X[~teste])
+        pendentes.append((codigos, y[~teste], np.ones(len(codigos))))
+        n_pendente += len(codigos)
+        # Consolida quando o pendente passa do agregado: custo total O(n log n)
+        if n_pendente > (0 if celulas is None else len(celulas[0])):
+            celulas = _agregar(pendentes if celulas is None else [celulas, *pendentes])
+            celulas = _limitar(celulas, binarizador, max_celulas)
+            pendentes, n_pendente = [], 0
+    if pendentes:
+        celulas = _agregar(pendentes if celulas is None else [celulas, *pendentes])
+        celulas = _limitar(celulas, binarizador, max_celulas)
+    codigos, soma_y, contagem = celulas
+    bins = {col: len(limites) + 1 for col, limites in binarizador.limites_.items()}
+    if verbose:
+        print(f"{n_treino:,} linhas de treino -> {len(codigos):,} células distintas "
+              f"(máximo {max_celulas:,}; bins: {bins})", flush=True)
+
+    params = {"max_iter": 200, "random_state": RANDOM_STATE, **params, "early_stopping": False,
+              "categorical_features": binarizador.categoricas}
+    hgb = HistGradientBoostingRegressor(**params)
+    hgb.fit(Binarizador.para_float(codigos), soma_y / contagem, sample_weight=contagem)
+    modelo = ModeloBinado(binarizador, hgb)
+    info = {"X_amostra": X_amostra, "y_amostra": y_amostra, "codificador": codificador,
+            "n_treino": n_treino, "celulas": len(codigos), "bins": bins}
+    return modelo, _avaliar(modelo, caminho, features), info
+
+
+def treinar_sgd_em_lotes(caminho, epocas=3, amostra=TAMANHO_AMOSTRA, semente=42, verbose=1):
+    """``models.pipe_sgd`` com o pré-processamento ajustado na amostra e ``partial_fit`` por lote.
+
+    Usa as features de ``selecionar_features``. Retorna ``(modelo, metricas, info)``.
+    """
+    from sklearn.base import clone
+    from uber_price.models import pipe_sgd
+
+    X_amostra, y_amostra, codificador, n_treino = amostrar(caminho, FEATURES_PADRAO, amostra)
+    modelo = clone(pipe_sgd)
+    preprocessar = modelo[:-1].fit(X_amostra, y_amostra)
+    sgd = modelo[-1]
+    rng = np.random.default_rng(semente)
+    for epoca in range(epocas):
+        for X, y, teste in lotes_xy(caminho, FEATURES_PADRAO):
+            ordem = rng.permutation(int((~teste).sum()))  # o arquivo vem em ordem cronológica
+            sgd.partial_fit(preprocessar.transform(X[~teste].iloc[ordem]), y[~teste][ordem])
+        if verbose:
+            print(f"época {epoca + 1}/{epocas}: {n_treino:,} linhas", flush=True)
+    info = {"X_amostra": X_amostra, "y_amostra": y_amostra, "codificador": codificador, "n_treino": n_treino}
+    return modelo, _avaliar(modelo, caminho, FEATURES_PADRAO), info
+
+
+def treinar_em_lotes(csv, modelo="hgb", registrar=False, nome=None, raiz=None, chunksize=100_000, **kwargs):
+    """Limpa ``csv`` em chunks para o cache (se preciso) e treina ``modelo`` (``"hgb"`` ou ``"sgd"``) lote a lote.
+
+    Com ``registrar=True`` salva no registro como ``nome`` (padrão
+    ``<modelo>-em-lotes``); o ``meta.json`` descreve a amostra, com
+    ``n_amostras`` = linhas de treino do arquivo inteiro. Retorna ``(modelo, metricas)``.
+    """
+    from pathlib import Path
+    from uber_price.cache import cachear_em_chunks
+
+    caminho = cachear_em_chunks(csv, chunksize=chunksize)
+    treinar = {"hgb": treinar_hgb_em_lotes, "sgd": treinar_sgd_em_lotes}[modelo]
+    estimador, metricas, info = treinar(caminho, **kwargs)
+    if registrar:
+        from uber_price.registry import RAIZ_PADRAO, salvar_modelo
+
+        salvar_modelo(estimador, nome or f"{modelo}-em-lotes", info["X_amostra"], info["y_amostra"], metricas,
+                      raiz=raiz or RAIZ_PADRAO, codificador=info["codificador"], n_amostras=info["n_treino"],
+                      fonte=Path(caminho).name, em_lotes=True)
+    return estimador, metricas
@@ -0,0 +1,159 @@
+"""Grade de preços pré-calculada para o espaço de entradas do simulador.
+
+O simulador só recebe distância (0,1–8 milhas), hora (0–23), surge e, se o
+modelo usar ``name``, o tipo de serviço. ``calcular_grade`` avalia o modelo
+uma única vez em todas as combinações e guarda o resultado num array
+``precos[servico, surge, hora, distancia]`` (float32, ~76 KB por serviço e
+surge), salvo como ``grade.npz`` na pasta da versão do modelo no registro.
+
+A consulta é uma leitura de array: hora, surge e serviço são índices exatos
+e a distância é interpolada linearmente entre os dois pontos vizinhos (ou o
+mais próximo, com ``interpolar=False``). O passo padrão de 0,01 milha é o do
+``number_input`` do app, então as entradas do simulador caem exatamente em
+pontos da grade; entre pontos o erro vem dos degraus das árvores. Consultar a grade não importa o
+scikit-learn: ``Precificador`` só recorre ao modelo quando uma consulta cai
+fora dela, pelo caminho rápido de ``uber_price.cotacao`` quando possível.
+"""
+
+import numpy as np
+
+from uber_price.registry import RAIZ_PADRAO
+
+ARQUIVO_GRADE = "grade.npz"
+
+DISTANCIA_MIN, DISTANCIA_MAX = 0.1, 8.0
+N_DISTANCIAS = 791  # passo de 0,01 milha
+
+
+class GradePrecos:
+    def __init__(self, distancias, horas, surges, servicos, precos, versao_modelo=None):
+        self.distancias = np.asarray(distancias, dtype=np.float64)
+        self.horas = np.asarray(horas, dtype=np.int64)
+        self.surges = np.asarray(surges, dtype=np.float64)
+        self.servicos = tuple(servicos)
+        self.precos = np.asarray(precos, dtype=np.float32)
+        self.versao_modelo = versao_modelo
+        self._servico = {s: i for i, s in enumerate(self.servicos)}
+
+    # --- consulta -------------------------------------------------------------
+    def consultar(self, distancia, hora, surge=1.0, servico=None, interpolar=True):
+        """Preço da grade, ou ``None`` se o ponto estiver fora dela."""
+        if not self.distancias[0] <= distancia <= self.distancias[-1]:
+            return None
+        if hora != int(hora) or not self.horas[0] <= hora <= self.horas[-1]:
+            return None
+        i_surge = np.flatnonzero(np.isclose(self.surges, surge))
+        if not len(i_surge):
+            return None
+        if self.servicos:
+            if servico not in self._servico:
+                return None
+            i_servico = self._servico[servico]
+        else:
+            i_servico = 0
+        linha = self.precos[i_servico, i_surge[0], int(hora) - self.horas[0]]
+        if interpolar:
+            return float(np.interp(distancia, self.distancias, linha))
+        return float(linha[np.abs(self.distancias - distancia).argmin()])
+
+    # --- persistência ---------------------------------------------------------
+    def salvar(self, caminho):
+        np.savez(caminho, distancias=self.distancias, horas=self.horas, surges=self.surges,
+                 servicos=np.array(self.servicos, dtype=str), precos=self.precos,
+                 versao_modelo=np.array(-1 if self.versao_modelo is None else self.versao_modelo))
+        return caminho
+
+    @classmethod
+    def carregar(cls, caminho):
+        with np.load(caminho, allow_pickle=False) as z:
+            versao = int(z["versao_modelo"])
+            return cls(z["distancias"], z["horas"], z["surges"], z["servicos"].tolist(), z["precos"],
+                       None if versao < 0 else versao)
+
+
+def calcular_grade(modelo, meta, codificador=None, n_distancias=N_DISTANCIAS, surges=(1.0,), servicos=None):
+    """Avalia ``modelo`` em toda a grade (um único ``predict`` vetorizado).
+
+    Se o modelo usa ``name``, ``servicos`` são os produtos da grade (padrão: as
+    categorias do ``codificador``). Outras features categóricas não são suportadas.
+    """
+    import pandas as pd
+    from uber_price.features import montar_X
+
+    features = {col: dtype for col, dtype in meta["features"]}
+    extras = set(features) - {"distance", "duration", "surge_multiplier", "hour", "name"}
+    if extras:
+        raise ValueError(f"A grade não cobre as features {sorted(extras)}")
+    if "name" in features:
+        servicos = tuple(servicos or codificador.categorias_["name"])
+    else:
+        servicos = ()
+
+    distancias = np.linspace(DISTANCIA_MIN, DISTANCIA_MAX, n_distancias)
+    horas = np.arange(24)
+    eixos = np.meshgrid(np.arange(max(len(servicos), 1)), surges, horas, distancias, indexing="ij")
+    pontos = {"distance": eixos[3].ravel(), "surge_multiplier": eixos[1].ravel(), "hour": eixos[2].ravel()}
+    if servicos:
+        pontos["name"] = np.asarray(servicos, dtype=object)[eixos[0].ravel()]
+    X = montar_X(pd.DataFrame(pontos), meta, codificador)
+    precos = modelo.predict(X).reshape(eixos[0].shape)
+    return GradePrecos(distancias, horas, surges, servicos, precos, meta.get("versao"))
+
+
+def salvar_grade(grade, nome, versao=None, raiz=RAIZ_PADRAO):
+    from uber_price.registry import pasta_modelo
+
+    return grade.salvar(pasta_modelo(nome, versao, raiz) / ARQUIVO_GRADE)
+
+
+def carregar_grade(nome, versao=None, raiz=RAIZ_PADRAO):
+    """Grade salva junto da versão do modelo (``FileNotFoundError`` se não houver)."""
+    from uber_price.registry import pasta_modelo
+
+    caminho = pasta_modelo(nome, versao, raiz) / ARQUIVO_GRADE
+    if not caminho.is_file():
+        raise FileNotFoundError(f"Grade de preços não calculada para {caminho.parent}")
+    return GradePrecos.carregar(caminho)
+
+
+class Precificador:
+    """Consulta a grade e recorre ao modelo do registro (carregado sob demanda) fora dela."""
+
+    def __init__(self, grade, nome, raiz=RAIZ_PADRAO):
+        self.grade, self.nome, self.raiz = grade, nome, raiz
+        self.consultas_modelo = 0
+        self._cotador = None
+
+    def preco(self, distancia, hora, surge=1.0, servico=None):
+        """``ValueError`` se o modelo usa o serviço e ``servico`` não é um dos produtos da grade."""
+        if self.grade.servicos and servico not in self.grade.servicos:
+            raise ValueError(f"Serviço desconhecido: {servico!r}")
+        preco = self.grade.consultar(distancia, hora, surge, servico)
+        if preco is not None:
+            return preco
+        self.consultas_modelo += 1
+        cotador = self.cotador()
+        if cotador:
+            from uber_price.cotacao import Cotacao
+
+            return cotador.preco(Cotacao(distancia, hora, surge, servico))
+        from uber_price.features import montar_X
+        from uber_price.registry import carregar_modelo, carregar_codificador
+
+        modelo, meta = carregar_modelo(self.nome, self.grade.versao_modelo, self.raiz)
+        cotacao = {"distance": distancia, "hour": hora, "surge_multiplier": surge}
+        if servico is not None:
+            cotacao["name"] = servico
+        codificador = carregar_codificador(self.nome, meta["versao"], self.raiz) if servico is not None else None
+        return float(modelo.predict(montar_X([cotacao], meta, codificador))[0])
+
+    def cotador(self):
+        """``CotadorRapido`` do modelo (``False`` se ele não for um ensemble de árvores suportado)."""
+        if self._cotador is None:
+            from uber_price.cotacao import CotadorRapido
+
+            try:
+                self._cotador = CotadorRapido.do_registro(self.nome, self.grade.versao_modelo, self.raiz)
+            except (TypeError, ValueError):
+                self._cotador = False
+        return self._cotador
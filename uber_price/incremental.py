@@ -0,0 +1,139 @@
+"""Atualização incremental de um modelo do registro com um lote novo de corridas.
+
+O retreino completo refaz a limpeza, o split e a busca de hiperparâmetros
+sobre o histórico inteiro. ``atualizar`` parte da versão registrada e só olha
+o lote novo:
+
+* RandomForest / ExtraTrees / Bagging – ``warm_start``: as árvores antigas ficam, e
+  ``n_novos`` árvores treinadas no lote entram no ensemble;
+* estimadores com ``partial_fit`` (ex.: ``models.pipe_sgd``) – um passo de
+  ``partial_fit`` no lote;
+* HistGradientBoosting – ``n_novos`` iterações de boosting sobre o resíduo do
+  modelo atual no lote (``ModeloResidual``). O ``warm_start`` do próprio
+  scikit-learn refaz o binning com os dados novos e passa a calcular os
+  gradientes com as árvores antigas aplicadas a bins errados.
+
+Outros modelos (ex.: o Stacking) levantam ``TypeError``. Nos Pipelines o
+One-Hot fica congelado: só o último passo é atualizado. Antes de atualizar,
+``drift.verificar_drift`` compara o lote com o perfil dos dados do treino
+completo; se o drift passar dos limiares, o modelo não é atualizado e o
+retreino completo é recomendado (a menos que ``forcar=True``).
+A versão nova guarda ``base`` (versão de origem) e herda o perfil e o RMSE
+de referência do treino completo, para que o drift continue medido contra ele,
+e a tabela de rotas (``rotas.npz``) da versão de origem.
+"""
+
+import shutil
+
+import numpy as np
+
+from uber_price.registry import RAIZ_PADRAO
+
+N_ITER_BOOSTING = 50
+FRACAO_ARVORES = 0.2  # árvores novas por atualização, em fração do ensemble atual
+
+
+class ModeloResidual:
+    """``base`` + correções treinadas sobre o resíduo de lotes posteriores."""
+
+    def __init__(self, base, correcoes=()):
+        self.base = base
+        self.correcoes = list(correcoes)
+
+    def predict(self, X):
+        pred = np.asarray(self.base.predict(X), dtype=np.float64)
+        for correcao in self.correcoes:
+            pred = pred + correcao.predict(X)
+        return pred
+
+
+def _passo_final(modelo):
+    """``(estimador, transformar)``: último passo do Pipeline e a função que prepara o X dele."""
+    if hasattr(modelo, "steps"):
+        return modelo[-1], modelo[:-1].transform
+    return modelo, lambda X: X
+
+
+def atualizar_modelo(modelo, X, y, n_novos=None):
+    """Atualiza ``modelo`` (modificado no lugar, quando possível) com o lote ``X, y`` e o retorna."""
+    from sklearn.ensemble import HistGradientBoostingRegressor
+
+    if isinstance(modelo, (ModeloResidual, HistGradientBoostingRegressor)):
+        residual = modelo if isinstance(modelo, ModeloResidual) else ModeloResidual(modelo)
+        hgb = residual.base
+        correcao = HistGradientBoostingRegressor(**{**hgb.get_params(), "max_iter": n_novos or N_ITER_BOOSTING,
+                                                    "early_stopping": False, "warm_start": False})
+        correcao.fit(X, np.asarray(y, dtype=np.float64) - residual.predict(X))
+        residual.correcoes.append(correcao)
+        return residual
+
+    from sklearn.ensemble import BaggingRegressor, ExtraTreesRegressor, RandomForestRegressor
+
+    estimador, transformar = _passo_final(modelo)
+    if hasattr(estimador, "partial_fit"):
+        estimador.partial_fit(transformar(X), y)
+    elif isinstance(estimador, (RandomForestRegressor, ExtraTreesRegressor, BaggingRegressor)):
+        n_atual = estimador.n_estimators
+        estimador.set_params(warm_start=True, oob_score=False,
+                             n_estimators=n_atual + (n_novos or max(1, round(FRACAO_ARVORES * n_atual))))
+        estimador.fit(transformar(X), y)
+        for atributo in ("oob_score_", "oob_prediction_"):  # calculados no treino antigo, não valem mais
+            estimador.__dict__.pop(atributo, None)
+    else:
+        raise TypeError(f"{type(estimador).__name__} não suporta atualização incremental; use o retreino completo")
+    return modelo
+
+
+def atualizar(df, nome, versao=None, raiz=RAIZ_PADRAO, n_novos=None, forcar=False, verbose=1, **limiares):
+    """Atualiza o modelo ``nome`` com o lote ``df`` (já limpo) e registra uma versão nova.
+
+    ``limiares`` (``limiar_psi``, ``limiar_rmse``) vão para ``verificar_drift``.
+    Retorna ``(pasta, relatorio)``; ``pasta`` é ``None`` se o drift pedir retreino completo.
+    """
+    from uber_price.drift import verificar_drift
+    from uber_price.eval import eval_model
+    from uber_price.features import TARGET, dividir, montar_X
+    from uber_price.registry import carregar_modelo, carregar_codificador, pasta_modelo, salvar_modelo
+    from uber_price.rotas import ARQUIVO_ROTAS, TabelaRotas, aplicar_duracao
+
+    # Cópia própria (sem mmap nem cache): o modelo é modificado no lugar
+    modelo, meta = carregar_modelo(nome, versao, raiz, mmap=False, cache=False)
+    try:
+        codificador = carregar_codificador(nome, meta["versao"], raiz)
+    except FileNotFoundError:
+        codificador = None
+    X = montar_X(df, meta, codificador)
+    y = df[TARGET]
+    rotas = pasta_modelo(nome, meta["versao"], raiz) / ARQUIVO_ROTAS
+    if rotas.is_file() and meta.get("duracao", {}).get("origem") == "rotas":  # a mesma duration do treino
+        X = aplicar_duracao(X, TabelaRotas.carregar(rotas), df)
+
+    relatorio = verificar_drift(meta, X, y, modelo, **limiares)
+    if verbose:
+        for col, valor in relatorio["psi"].items():
+            print(f"PSI {col:<20} {valor:.4f}")
+        if relatorio["rmse_lote"] is not None:
+            print(f"RMSE no lote: {relatorio['rmse_lote']:.4f} (referência {relatorio['rmse_referencia']:.4f})")
+        for motivo in relatorio["motivos"]:
+            print(f"Drift: {motivo}")
+    if relatorio["retreinar"] and not forcar:
+        if verbose:
+            print("Retreino completo recomendado; modelo não atualizado.")
+        return None, relatorio
+
+    X_train, X_test, y_train, y_test = dividir(X, y)
+    modelo = atualizar_modelo(modelo, X_train, y_train, n_novos)
+    metricas = eval_model(nome, modelo, X_test, y_test)
+    extra = {k: meta[k] for k in ("perfil", "servico", "duracao") if k in meta}
+    pasta = salvar_modelo(
+        modelo, nome, X_train, y_train, metricas, raiz=raiz, codificador=codificador,
+        base=meta["versao"], incremental=True,
+        rmse_referencia=meta.get("rmse_referencia", meta["metricas"].get("RMSE_test")),
+        n_amostras_total=meta.get("n_amostras_total", meta["n_amostras"]) + len(X_train), **extra,
+    )
+    if rotas.is_file():  # como o perfil: a tabela do treino completo segue para a versão nova
+        shutil.copy2(rotas, pasta / ARQUIVO_ROTAS)
+    if verbose:
+        print(f"v{meta['versao']} atualizada com {len(X_train):,} linhas -> {pasta} "
+              f"(RMSE no lote {metricas['RMSE_test']:.4f})")
+    return pasta, relatorio
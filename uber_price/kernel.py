@@ -0,0 +1,74 @@
+"""Regressão com kernel RBF aproximado: alternativa ao SVR que treina nos dados inteiros.
+
+O SVR exato monta uma matriz de kernel quadrática no número de linhas e o
+predict custa uma avaliação de kernel por vetor de suporte, então a busca
+usa só uma subamostra de 20 mil linhas (``subsample`` em ``models.MODELOS``).
+``RidgeKernelAproximado`` mapeia cada linha para ``n_components`` features
+(Nystroem: kernel contra pontos de referência sorteados; ``rbf``: random
+Fourier features do ``RBFSampler``) e ajusta uma regressão Ridge nelas.
+
+O ajuste percorre X em blocos de ``bloco`` linhas acumulando ``ZᵀZ`` e
+``Zᵀy`` (equações normais), então o custo é linear no número de linhas e a
+memória é ``O(bloco × n_components + n_components²)``, sem materializar a
+matriz transformada inteira. O predict também é feito em blocos.
+"""
+
+import numpy as np
+from sklearn.base import BaseEstimator, RegressorMixin
+from sklearn.kernel_approximation import Nystroem, RBFSampler
+
+
+class RidgeKernelAproximado(RegressorMixin, BaseEstimator):
+    """Ridge sobre features de kernel RBF aproximado (``metodo``: ``"nystroem"`` ou ``"rbf"``)."""
+
+    def __init__(self, n_components=500, gamma=0.1, alpha=1.0, metodo="nystroem", bloco=10_000,
+                 random_state=None):
+        self.n_components = n_components
+        self.gamma = gamma
+        self.alpha = alpha
+        self.metodo = metodo
+        self.bloco = bloco
+        self.random_state = random_state
+
+    def _mapa(self):
+        if self.metodo == "nystroem":
+            return Nystroem(kernel="rbf", gamma=self.gamma, n_components=self.n_components,
+                            random_state=self.random_state)
+        if self.metodo == "rbf":
+            return RBFSampler(gamma=self.gamma, n_components=self.n_components, random_state=self.random_state)
+        raise ValueError(f"metodo deve ser 'nystroem' ou 'rbf', não {self.metodo!r}")
+
+    def _blocos(self, X):
+        for inicio in range(0, X.shape[0], self.bloco):
+            yield self.mapa_.transform(X[inicio:inicio + self.bloco])
+
+    def fit(self, X, y):
+        from scipy.linalg import solve
+
+        y = np.asarray(y, dtype=np.float64)
+        self.mapa_ = self._mapa().fit(X)
+        m = self.mapa_.n_components if self.metodo == "rbf" else self.mapa_.components_.shape[0]
+        ztz, zty, soma_z = np.zeros((m, m)), np.zeros(m), np.zeros(m)
+        inicio = 0
+        for Z in self._blocos(X):
+            y_bloco = y[inicio:inicio + len(Z)]
+            ztz += Z.T @ Z
+            zty += Z.T @ y_bloco
+            soma_z += Z.sum(axis=0)
+            inicio += len(Z)
+
+        # Centraliza Z e y pelas médias (intercepto fora da penalização, como no Ridge)
+        n = len(y)
+        media_z, media_y = soma_z / n, y.mean()
+        ztz -= n * np.outer(media_z, media_z)
+        zty -= n * media_z * media_y
+        ztz[np.diag_indices_from(ztz)] += self.alpha
+        self.coef_ = solve(ztz, zty, assume_a="pos")
+        self.intercept_ = media_y - media_z @ self.coef_
+        self.n_features_in_ = X.shape[1]
+        return self
+
+    def predict(self, X):
+        if X.shape[0] == 0:
+            return np.empty(0)
+        return np.concatenate([Z @ self.coef_ + self.intercept_ for Z in self._blocos(X)])
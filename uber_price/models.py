@@ -0,0 +1,162 @@
+"""Modelos, espaços de busca de hiperparâmetros e a função ``tune``.
+
+Todos os modelos recebem o X compacto de ``features.selecionar_features``.
+Os que precisam de One-Hot são Pipelines que começam por
+``preprocessador_esparso()``: CSR para a regressão linear e o SVR, float32
+denso para as árvores (RF, AdaBoost, Bagging); o HistGradientBoosting usa as
+colunas categóricas diretamente. Como o CSR não pode ser centralizado sem virar denso,
+o StandardScaler usa ``with_mean=False`` (sem efeito na regressão linear com
+intercepto nem no kernel RBF, que é invariante a translação). O SVR exato só
+cabe numa subamostra; ``pipe_kernel`` aproxima o mesmo kernel RBF nos dados inteiros.
+"""
+
+import numpy as np
+from sklearn.linear_model import LinearRegression, RidgeCV, SGDRegressor
+from sklearn.model_selection import RandomizedSearchCV, KFold
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVR
+from sklearn.tree import DecisionTreeRegressor
+from sklearn.ensemble import (
+    RandomForestRegressor, AdaBoostRegressor, BaggingRegressor, StackingRegressor,
+    HistGradientBoostingRegressor
+)
+
+from uber_price.features import preprocessador_esparso
+from uber_price.kernel import RidgeKernelAproximado
+
+RANDOM_STATE = 42
+cv = KFold(n_splits=3, shuffle=True, random_state=RANDOM_STATE)
+scoring = "neg_root_mean_squared_error"
+
+
+def esparso(nome, estimador, escalar=False, denso=False):
+    """Pipeline One-Hot (+ StandardScaler opcional) → ``estimador``."""
+    passos = [("features", preprocessador_esparso(denso=denso))]
+    if escalar:
+        passos.append(("scaler", StandardScaler(with_mean=False)))
+    return Pipeline(passos + [(nome, estimador)])
+
+
+# Baseline
+pipe_lr = esparso("lr", LinearRegression(), escalar=True)
+
+# Baseline linear atualizável com partial_fit (``uber_price.incremental``); com o
+# eta0 padrão (0,01) o SGD diverge nas features só escaladas (sem centralizar)
+pipe_sgd = esparso("sgd", SGDRegressor(eta0=0.001, random_state=RANDOM_STATE), escalar=True)
+
+# RandomForest
+pipe_rf = esparso("rf", RandomForestRegressor(random_state=RANDOM_STATE, oob_score=True), denso=True)
+param_rf = {
+    "rf__n_estimators": [50, 100, 200],
+    "rf__max_depth": [10, 15, None],
+    "rf__min_samples_split": [2, 5],
+    "rf__min_samples_leaf": [1, 2],
+    "rf__max_features": ["sqrt"]
+}
+
+# SVR
+pipe_svr = esparso("svr", SVR(), escalar=True)
+param_svr = {
+    "svr__C": np.logspace(-1, 3, 6),
+    "svr__gamma": np.logspace(-4, 0, 5),
+    "svr__epsilon": np.logspace(-3, 0, 4),
+}
+
+# Kernel RBF aproximado (``uber_price.kernel``): treina nos dados inteiros, sem subamostra
+pipe_kernel = esparso("kernel", RidgeKernelAproximado(random_state=RANDOM_STATE), escalar=True)
+param_kernel = {
+    "kernel__n_components": [300, 600, 1000],
+    "kernel__gamma": np.logspace(-3, -1, 5),
+    "kernel__alpha": np.logspace(-4, 1, 6),
+    "kernel__metodo": ["nystroem", "rbf"],
+}
+
+# AdaBoost
+pipe_ada = esparso("ada", AdaBoostRegressor(estimator=DecisionTreeRegressor(max_depth=2), random_state=RANDOM_STATE),
+                   denso=True)
+param_ada = {
+    "ada__n_estimators": [50, 100, 200],
+    "ada__learning_rate": np.logspace(-3, 0, 5),
+    "ada__loss": ["linear", "square", "exponential"],
+}
+
+# HistGradientBoosting
+pipe_hgb = HistGradientBoostingRegressor(random_state=RANDOM_STATE, early_stopping=True,
+                                         categorical_features="from_dtype")
+param_hgb = {
+    "max_iter": [200, 400, 800],
+    "learning_rate": np.logspace(-3, 0, 5),
+    "max_depth": [3, 5, None],
+    "max_leaf_nodes": [31, 63, 127],
+    "min_samples_leaf": [20, 50, 100],
+    "l2_regularization": [0.0, 0.1, 1.0],
+}
+
+# Bagging
+pipe_bag = esparso("bag", BaggingRegressor(
+    estimator=DecisionTreeRegressor(random_state=RANDOM_STATE),
+    random_state=RANDOM_STATE,
+    oob_score=True
+), denso=True)
+param_bag = {
+    "bag__n_estimators": [100, 200, 400],
+    "bag__estimator__max_depth": [5, 10, None],
+    "bag__estimator__min_samples_split": [2, 5],
+    "bag__estimator__min_samples_leaf": [1, 2],
+    "bag__max_samples": [0.5, 0.7, 1.0],
+    "bag__max_features": [0.5, 0.7, 1.0]
+}
+
+# (nome, estimador, espaço de busca, subsample) na ordem do notebook
+MODELOS = [
+    ("RandomForest", pipe_rf, param_rf, True),
+    ("SVR", pipe_svr, param_svr, True),
+    ("KernelAproximado", pipe_kernel, param_kernel, False),
+    ("AdaBoost", pipe_ada, param_ada, False),
+    ("HistGradientBoosting", pipe_hgb, param_hgb, False),
+    ("Bagging", pipe_bag, param_bag, True),
+]
+
+
+def tune(model, param_dist, name, X_train, y_train, n_iter=5, subsample=False):
+    if subsample:
+        # Subamostra menor para caber na RAM
+        X_sub = X_train.sample(20000, random_state=RANDOM_STATE)
+        y_sub = y_train.loc[X_sub.index]
+        data_X, data_y = X_sub, y_sub
+        n_jobs_val = 1  # sem paralelismo
+    else:
+        data_X, data_y = X_train, y_train
+        n_jobs_val = -1  # usar múltiplos núcleos
+
+    search = RandomizedSearchCV(
+        estimator=model,
+        param_distributions=param_dist,
+        n_iter=n_iter,
+        scoring=scoring,
+        cv=cv,
+        n_jobs=n_jobs_val,
+        random_state=RANDOM_STATE,
+        verbose=1
+    )
+    search.fit(data_X, data_y)
+    print(f"\n[{name}] Melhor RMSE (CV): {-search.best_score_:.4f}")
+    print(f"[{name}] Melhores parâmetros: {search.best_params_}")
+    return search.best_estimator_, -search.best_score_
+
+
+def build_stacking(lr, best_hgb, best_bag):
+    """Blender RidgeCV sobre LinearRegression, HistGradientBoosting e Bagging."""
+    meta = RidgeCV(alphas=np.logspace(-4, 4, 20), cv=cv)
+    return StackingRegressor(
+        estimators=[
+            ("lr", lr),
+            ("hgb", best_hgb),
+            ("bag", best_bag),
+        ],
+        final_estimator=meta,
+        passthrough=False,
+        cv=cv,
+        n_jobs=1
+    )
@@ -0,0 +1,146 @@
+"""Fluxo completo do notebook (limpeza → features → tuning → avaliação) sob demanda."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from uber_price.data import carregar_dados, limparDados, filtrar_uber
+from uber_price.features import selecionar_features, dividir
+from uber_price.rastreio import cronometrado, etapa
+from uber_price.rotas import aplicar_duracao, construir_tabela
+
+
+def preparar_dados(df):
+    """Remove o Lyft, seleciona o X compacto e faz o split treino/teste.
+
+    O One-Hot fica dentro dos Pipelines dos modelos (ver ``uber_price.models``).
+    """
+    df = filtrar_uber(df)  # as três são etapas do rastreio (@cronometrado)
+    X, y = selecionar_features(df)
+    return dividir(X, y)
+
+
+def caminho_checkpoint(X_train, y_train, raiz=None):
+    """Checkpoint da busca específico dos dados de treino (``<cache>/busca/<hash>.jsonl``)."""
+    from uber_price.cache import RAIZ_CACHE
+    from uber_price.registry import hash_dados
+
+    return Path(raiz or RAIZ_CACHE) / "busca" / f"{hash_dados(X_train, y_train)[:24]}.jsonl"
+
+
+def treinar_modelos(X_train, y_train, n_iter=5, n_jobs=-1, halving=False, checkpoint=True):
+    """Baseline, tuning de cada modelo e Stacking.
+
+    O tuning de todos os modelos roda num único pool (``uber_price.busca``).
+    ``checkpoint`` é o arquivo de retomada da busca: ``True`` usa
+    ``caminho_checkpoint``, ``False`` desativa. O Stacking reaproveita as
+    predições out-of-fold da busca (``uber_price.empilhamento``), guardadas em
+    ``<checkpoint>.oof/``. Retorna ``{nome: (modelo, rmse_cv)}``; o Stacking
+    não tem RMSE_CV.
+    """
+    from sklearn.base import clone
+    from sklearn.metrics import root_mean_squared_error
+    from sklearn.model_selection import cross_val_predict
+    from uber_price.busca import buscar
+    from uber_price.empilhamento import PredicoesFold, empilhar
+    from uber_price.models import MODELOS, pipe_lr, cv
+
+    with etapa("baseline", modelo="LinearRegression"):
+        lr = clone(pipe_lr)
+        lr.fit(X_train, y_train)
+        # As predições out-of-fold dão o RMSE_CV e as meta-features do Stacking com os mesmos 3 ajustes
+        folds = list(cv.split(X_train))
+        oof_lr = cross_val_predict(clone(pipe_lr), X_train, y_train, cv=cv)
+        rmse_lr = np.mean([root_mean_squared_error(y_train.iloc[teste], oof_lr[teste]) for _, teste in folds])
+    modelos = {"LinearRegression": (lr, rmse_lr)}
+
+    if checkpoint is True:
+        checkpoint = caminho_checkpoint(X_train, y_train)
+    predicoes = PredicoesFold(Path(checkpoint).with_suffix(".oof") if checkpoint else None)
+    with etapa("busca", n_iter=n_iter, halving=halving):
+        modelos.update(buscar(MODELOS, X_train, y_train, n_iter=n_iter, n_jobs=n_jobs, halving=halving,
+                              checkpoint=checkpoint or None, predicoes=predicoes))
+
+    # Mesmo blender de models.build_stacking; modelos buscados na subamostra são reajustados em X_train
+    subamostrados = {nome for nome, _, _, subsample in MODELOS if subsample}
+    bases = [("lr", "LinearRegression"), ("hgb", "HistGradientBoosting"), ("bag", "Bagging")]
+    with etapa("stacking"):
+        stacking = empilhar(
+            [(curto, modelos[nome][0]) for curto, nome in bases], X_train, y_train,
+            oof={"lr": oof_lr, "hgb": predicoes.oof("HistGradientBoosting", folds, len(X_train))},
+            reajustar=[curto for curto, nome in bases if nome in subamostrados], n_jobs=n_jobs,
+        )
+    modelos["Stacking"] = (stacking, np.nan)
+    return modelos
+
+
+@cronometrado()
+def avaliar_modelos(modelos, X_test, y_test):
+    """Tabela da "Comparação Final" (RMSE_CV, RMSE_test, MAE_test, R2_test, OOB_R2)."""
+    from uber_price.eval import eval_model
+
+    linhas = []
+    for nome, (modelo, rmse_cv) in modelos.items():
+        with etapa(f"avaliar {nome}"):
+            res = eval_model(nome, modelo, X_test, y_test, oob=True)
+        linhas.append({"Modelo": nome, "RMSE_CV": rmse_cv, **res})
+    return pd.DataFrame(linhas).set_index("Modelo")
+
+
+@cronometrado()
+def registrar_modelos(modelos, resultados, X_train, y_train, codificador=None, raiz=None, rotas=None):
+    """Salva cada modelo treinado no registro, com as métricas de ``resultados``.
+
+    Cada versão leva também a tabela de rotas (``rotas.npz``) das linhas de
+    treino (``rotas`` ou construída aqui) e, no ``meta.json``, a origem da ``duration``.
+    """
+    from uber_price.registry import RAIZ_PADRAO, salvar_modelo
+    from uber_price.rotas import ARQUIVO_ROTAS, construir_tabela, descrever_duracao
+
+    if rotas is None:
+        rotas = construir_tabela(X_train.assign(price=y_train))
+    for nome, (modelo, _) in modelos.items():
+        metricas = resultados.loc[nome].dropna().to_dict()
+        pasta = salvar_modelo(modelo, nome, X_train, y_train, metricas, raiz=raiz or RAIZ_PADRAO,
+                              codificador=codificador, duracao=descrever_duracao(rotas))
+        rotas.salvar(pasta / ARQUIVO_ROTAS)
+
+
+def run_pipeline(df=None, csv=None, n_iter=5, registrar=False, cache=True, n_jobs=-1, halving=False,
+                 checkpoint=True):
+    """Executa o notebook de ponta a ponta, sem gráficos.
+
+    ``df`` pode ser um DataFrame já limpo por ``limparDados``; caso contrário o
+    dataset é lido de ``csv`` (ou baixado do Kaggle) e limpo aqui, passando pelo
+    cache colunar de ``uber_price.cache`` se ``cache=True``. Com
+    ``registrar=True`` os modelos são salvos no registro (``uber_price.registry``).
+    ``n_jobs``, ``halving`` e ``checkpoint`` vão para ``treinar_modelos``.
+    Retorna ``(resultados, modelos)``.
+    """
+    if df is None and cache:
+        from uber_price.cache import carregar_limpo
+
+        with etapa("carregar_limpo", csv=str(csv)):
+            df = carregar_limpo(csv)
+    elif df is None:
+        with etapa("carregar_dados", csv=str(csv)):
+            df = carregar_dados(csv)
+        df = limparDados(df)
+
+    with etapa("preparar_dados", linhas=len(df)):
+        X_train, X_test, y_train, y_test = preparar_dados(df)
+    with etapa("rotas"):  # duration do treino e do teste pela tabela, como no servidor
+        rotas = construir_tabela(X_train.assign(price=y_train))
+        X_train, X_test = aplicar_duracao(X_train, rotas), aplicar_duracao(X_test, rotas)
+    with etapa("treinar_modelos", linhas_treino=len(X_train)):
+        modelos = treinar_modelos(X_train, y_train, n_iter=n_iter, n_jobs=n_jobs, halving=halving,
+                                  checkpoint=checkpoint)
+    resultados = avaliar_modelos(modelos, X_test, y_test)
+    if registrar:
+        from uber_price.preprocessing import CodificadorCategorias
+
+        # Vocabulário das linhas de treino já sem o Lyft, as mesmas que o estimador viu
+        codificador = CodificadorCategorias().fit(filtrar_uber(df).loc[X_train.index])
+        registrar_modelos(modelos, resultados, X_train, y_train, codificador, rotas=rotas)
+    return resultados, modelos
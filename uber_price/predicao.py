@@ -0,0 +1,121 @@
+"""Predição em lote: arquivos de cotações (CSV/Parquet) maiores que a memória.
+
+O arquivo é lido em chunks (só as colunas usadas pela limpeza), cada chunk
+passa por ``limparDados`` com o codificador salvo junto do modelo e pelo
+modelo do registro, e as predições são anexadas ao arquivo de saída na ordem
+de entrada. Os chunks são distribuídos entre processos pelo joblib; cada
+worker carrega o modelo do registro uma única vez (``carregar_modelo``). No
+máximo ``2 * n_jobs`` chunks ficam em memória ao mesmo tempo.
+
+Como no treino (``filtrar_uber``), só corridas Uber com categorias conhecidas
+pelo codificador recebem preço; as demais linhas ficam na saída, na mesma
+posição, com ``COLUNA_PREDICAO`` vazia, e são contadas em ``sem_predicao``.
+"""
+
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from uber_price.data import COLUNAS_BRUTAS, limparDados
+from uber_price.registry import RAIZ_PADRAO, ler_meta, carregar_modelo, carregar_codificador
+
+COLUNA_PREDICAO = "preco_previsto"
+
+
+def _parquet(caminho):
+    return Path(caminho).suffix.lower() in (".parquet", ".pq")
+
+
+def ler_em_chunks(caminho, chunksize=100_000, manter=()):
+    """Itera sobre DataFrames de até ``chunksize`` linhas com as colunas da limpeza (+ ``manter``)."""
+    colunas = set(COLUNAS_BRUTAS) | set(manter)
+    if _parquet(caminho):
+        import pyarrow.parquet as pq
+
+        arquivo = pq.ParquetFile(caminho)
+        usadas = [col for col in arquivo.schema_arrow.names if col in colunas]
+        for lote in arquivo.iter_batches(batch_size=chunksize, columns=usadas):
+            yield lote.to_pandas()
+    else:
+        yield from pd.read_csv(caminho, usecols=lambda col: col in colunas, chunksize=chunksize)
+
+
+def prever_chunk(chunk, nome, versao, raiz=RAIZ_PADRAO, manter=()):
+    """Limpa ``chunk`` e devolve as colunas ``manter`` (as que existirem) + ``COLUNA_PREDICAO``.
+
+    Linhas do Lyft e com categorias desconhecidas ficam com ``COLUNA_PREDICAO`` NaN.
+    """
+    modelo, meta = carregar_modelo(nome, versao, raiz)
+    codificador = carregar_codificador(nome, versao, raiz)
+    limpo = limparDados(chunk, codificador, compacto=True, descartar_sem_preco=False)
+    features = [col for col, _ in meta["features"]]
+    numericas = {col: dtype for col, dtype in meta["features"] if dtype != "category"}
+    X = limpo[features].astype(numericas)
+    # Categórica NaN = fora do vocabulário do treino; o modelo só conhece corridas Uber
+    validas = ~X[[col for col in features if col not in numericas]].isna().any(axis=1).to_numpy()
+    if "cab_type" in limpo.columns:
+        validas &= (limpo["cab_type"].str.lower() == "uber").to_numpy(dtype=bool, na_value=False)
+    saida = chunk.loc[limpo.index, [col for col in manter if col in chunk.columns]].reset_index(drop=True)
+    precos = np.full(len(X), np.nan)
+    if validas.any():
+        precos[validas] = modelo.predict(X[validas])
+    saida[COLUNA_PREDICAO] = precos
+    return saida
+
+
+class _Escritor:
+    """Anexa DataFrames a um CSV ou Parquet, abrindo o arquivo no primeiro lote."""
+
+    def __init__(self, caminho):
+        self.caminho = Path(caminho)
+        self.parquet = _parquet(caminho)
+        self._arquivo = None
+
+    def escrever(self, df):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            tabela = pa.Table.from_pandas(df, preserve_index=False)
+            if self._arquivo is None:
+                self._arquivo = pq.ParquetWriter(self.caminho, tabela.schema)
+            self._arquivo.write_table(tabela)
+        else:
+            primeiro = self._arquivo is None
+            if primeiro:
+                self._arquivo = open(self.caminho, "w", newline="")
+            df.to_csv(self._arquivo, header=primeiro, index=False)
+
+    def fechar(self):
+        if self._arquivo is not None:
+            self._arquivo.close()
+
+
+def prever_arquivo(entrada, saida, nome, versao=None, raiz=RAIZ_PADRAO, chunksize=100_000, n_jobs=-1,
+                   manter=(), verbose=1):
+    """Escreve em ``saida`` as predições do modelo ``nome`` para cada linha de ``entrada``.
+
+    Retorna ``{"linhas", "sem_predicao", "segundos", "linhas_por_s"}``.
+    """
+    from joblib import Parallel, delayed
+
+    versao = ler_meta(nome, versao, raiz)["versao"]  # fixa a versão para todos os workers
+    manter = tuple(manter)
+    escritor = _Escritor(saida)
+    linhas, sem_predicao, inicio = 0, 0, time.perf_counter()
+    tarefas = (delayed(prever_chunk)(chunk, nome, versao, raiz, manter)
+               for chunk in ler_em_chunks(entrada, chunksize, manter))
+    try:
+        for resultado in Parallel(n_jobs=n_jobs, return_as="generator")(tarefas):
+            escritor.escrever(resultado)
+            linhas += len(resultado)
+            sem_predicao += int(resultado[COLUNA_PREDICAO].isna().sum())
+            if verbose:
+                decorrido = time.perf_counter() - inicio
+                print(f"{linhas:>12,} linhas  {linhas / decorrido:>10,.0f} linhas/s", flush=True)
+    finally:
+        escritor.fechar()
+    segundos = time.perf_counter() - inicio
+    return {"linhas": linhas, "sem_predicao": sem_predicao, "segundos": segundos, "linhas_por_s": linhas / segundos if segundos else 0.0}
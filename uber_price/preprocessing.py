@@ -0,0 +1,108 @@
+"""Codificador de categorias ajustado uma vez e reutilizado em todo o projeto.
+
+Substitui o ``LabelEncoder`` que ``limparDados`` reajustava seis vezes a cada
+chamada. O ``CodificadorCategorias`` aprende os vocabulários de todas as
+colunas numa única passada, guarda-os (JSON) e codifica com uma busca vetorizada
+em hash (``pd.Index.get_indexer``). Categorias não vistas no ajuste recebem o
+código ``-1`` (NaN nas categóricas).
+
+Os códigos são os mesmos do LabelEncoder: categorias em ordem crescente.
+Não depende do scikit-learn, mas segue o protocolo de transformer
+(``fit``/``transform``/``get_params``), então pode entrar num ``Pipeline``.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from uber_price.data import COLUNAS_CODIFICADAS
+
+DESCONHECIDA = -1
+
+
+class CodificadorCategorias:
+    def __init__(self, colunas=tuple(COLUNAS_CODIFICADAS)):
+        self.colunas = colunas
+
+    # --- ajuste -------------------------------------------------------------
+    def fit(self, X, y=None):
+        self.categorias_ = {}
+        return self.partial_fit(X)
+
+    def partial_fit(self, X, y=None):
+        """Acrescenta as categorias de ``X`` (útil para ajustar chunk a chunk)."""
+        atuais = getattr(self, "categorias_", {})
+        categorias = {}
+        for col in self.colunas:
+            if isinstance(X[col].dtype, pd.CategoricalDtype):
+                valores = X[col].cat.categories
+            else:
+                valores = X[col].dropna().unique()
+            categorias[col] = np.array(sorted(set(atuais.get(col, ())).union(valores)), dtype=object)
+        self.categorias_ = categorias
+        self._indices = {col: pd.Index(cats) for col, cats in categorias.items()}
+        return self
+
+    # --- codificação ----------------------------------------------------------
+    def codigos(self, col, valores):
+        """Códigos inteiros de ``valores`` na coluna ``col`` (``-1`` para desconhecidas)."""
+        return self._indices[col].get_indexer(np.asarray(valores, dtype=object))
+
+    def categorical(self, col, valores):
+        """``pd.Categorical`` com o vocabulário ajustado (desconhecidas viram NaN)."""
+        return pd.Categorical.from_codes(self.codigos(col, valores), categories=self._indices[col])
+
+    def transform(self, X):
+        """Cópia de ``X`` com as colunas codificadas como categóricas de dicionário fixo."""
+        return X.assign(**{col: self.categorical(col, X[col]) for col in self.colunas if col in X.columns})
+
+    def fit_transform(self, X, y=None):
+        return self.fit(X).transform(X)
+
+    def colunas_encoded(self, X):
+        """Colunas ``<col>_encoded`` (int64) no formato antigo do LabelEncoder."""
+        return {f"{col}_encoded": self.codigos(col, X[col]).astype("int64") for col in self.colunas}
+
+    def inverse_transform(self, col, codigos):
+        codigos = np.asarray(codigos)
+        valores = self.categorias_[col][np.clip(codigos, 0, None)]
+        return np.where(codigos == DESCONHECIDA, None, valores)
+
+    # --- protocolo de estimador / persistência --------------------------------
+    def get_params(self, deep=True):
+        return {"colunas": self.colunas}
+
+    def set_params(self, **params):
+        for nome, valor in params.items():
+            setattr(self, nome, valor)
+        return self
+
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        estado.pop("_indices", None)  # reconstruído no unpickle
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        if "categorias_" in estado:
+            self._indices = {col: pd.Index(cats) for col, cats in self.categorias_.items()}
+
+    def to_dict(self):
+        return {"colunas": list(self.colunas),
+                "categorias": {col: cats.tolist() for col, cats in self.categorias_.items()}}
+
+    @classmethod
+    def from_dict(cls, dados):
+        cod = cls(colunas=tuple(dados["colunas"]))
+        cod.categorias_ = {col: np.array(cats, dtype=object) for col, cats in dados["categorias"].items()}
+        cod._indices = {col: pd.Index(cats) for col, cats in cod.categorias_.items()}
+        return cod
+
+    def salvar(self, caminho):
+        Path(caminho).write_text(json.dumps(self.to_dict(), ensure_ascii=False))
+
+    @classmethod
+    def carregar(cls, caminho):
+        return cls.from_dict(json.loads(Path(caminho).read_text()))
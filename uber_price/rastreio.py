@@ -0,0 +1,194 @@
+"""Rastreio das etapas do pipeline: tempo de parede, CPU e pico de memória.
+
+As etapas são marcadas com ``etapa("nome")`` (context manager) ou
+``@cronometrado("nome")``. Sem um ``Rastreador`` ativo, ``etapa`` devolve um
+objeto nulo compartilhado e o decorador chama a função direto: o custo é uma
+leitura de variável global. Dentro de ``with Rastreador() as r:`` cada etapa
+vira um evento com:
+
+* ``segundos`` (``perf_counter``) e ``cpu_s`` (``process_time``, só deste
+  processo: o trabalho nos workers do joblib aparece como tempo de parede);
+* ``pico_mb``: pico de RSS durante a etapa. No Linux o ``VmHWM`` é zerado
+  (``/proc/self/clear_refs``) ao entrar em cada etapa e o pico das etapas
+  internas é repassado à externa; sem essa permissão, fica o pico acumulado
+  do processo;
+* ``rss_mb`` ao fim e os atributos passados para ``etapa``.
+
+``r.salvar(caminho)`` grava o rastreio no formato Chrome trace (abre no
+``chrome://tracing`` ou no Perfetto) e ``r.resumo()`` devolve uma tabela.
+Com ``Rastreador(cprofile=True)`` cada etapa de primeiro nível roda sob um
+``cProfile.Profile`` e ``r.perfil_mais_lento()`` dá as estatísticas da mais lenta.
+Pensado para uma thread; etapas abertas em outras threads são ignoradas.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+
+_ativo = None
+
+
+def _ler_status(campo):
+    try:
+        with open("/proc/self/status") as f:
+            return next((int(linha.split()[1]) / 1024 for linha in f if linha.startswith(campo)), None)
+    except OSError:
+        return None
+
+
+def _zerar_pico():
+    """Zera o ``VmHWM`` do processo; ``False`` se o kernel não permitir."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class _Nula:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULA = _Nula()
+
+
+class _Etapa:
+    __slots__ = ("rastreador", "nome", "atributos", "inicio", "cpu", "pico_filhas", "perfil")
+
+    def __init__(self, rastreador, nome, atributos):
+        self.rastreador = rastreador
+        self.nome = nome
+        self.atributos = atributos
+        self.pico_filhas = 0.0
+        self.perfil = None
+
+    def __enter__(self):
+        r = self.rastreador
+        pilha = r._pilha
+        if pilha:
+            # o pico até aqui pertence à etapa externa, que o guarda antes de ele ser zerado
+            pilha[-1].pico_filhas = max(pilha[-1].pico_filhas, _ler_status("VmHWM:") or 0.0)
+        if r._zera_pico:
+            _zerar_pico()
+        pilha.append(self)
+        if r.cprofile and len(pilha) == 1:
+            import cProfile
+
+            self.perfil = cProfile.Profile()
+            self.perfil.enable()
+        self.cpu = time.process_time()
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        fim = time.perf_counter()
+        cpu = time.process_time() - self.cpu
+        if self.perfil is not None:
+            self.perfil.disable()
+        r = self.rastreador
+        r._pilha.pop()
+        pico = max(_ler_status("VmHWM:") or 0.0, self.pico_filhas)
+        if r._pilha:
+            r._pilha[-1].pico_filhas = max(r._pilha[-1].pico_filhas, pico)
+        r.eventos.append({
+            "nome": self.nome, "profundidade": len(r._pilha), "inicio_s": self.inicio - r.inicio,
+            "segundos": fim - self.inicio, "cpu_s": cpu, "pico_mb": pico, "rss_mb": _ler_status("VmRSS:"),
+            "atributos": self.atributos, "erro": exc[0].__name__ if exc[0] else None,
+        })
+        if self.perfil is not None:
+            r._perfis.append((fim - self.inicio, self.nome, self.perfil))
+        return False
+
+
+def etapa(nome, **atributos):
+    """Context manager que registra ``nome`` no rastreador ativo (nulo se não houver)."""
+    r = _ativo
+    if r is None or threading.get_ident() != r._thread:
+        return _NULA
+    return _Etapa(r, nome, atributos)
+
+
+def cronometrado(nome=None):
+    """Decorador: a chamada inteira vira a etapa ``nome`` (padrão: nome da função)."""
+    def decorar(funcao):
+        rotulo = nome or funcao.__qualname__
+
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            if _ativo is None:
+                return funcao(*args, **kwargs)
+            with etapa(rotulo):
+                return funcao(*args, **kwargs)
+        return envolvida
+    return decorar
+
+
+class Rastreador:
+    """Coleta as etapas executadas dentro do ``with`` (um rastreador ativo por vez)."""
+
+    def __init__(self, cprofile=False):
+        self.cprofile = cprofile
+        self.eventos = []
+        self._pilha = []
+        self._perfis = []  # (segundos, nome, cProfile.Profile) das etapas de primeiro nível
+        self._zera_pico = False
+
+    def __enter__(self):
+        global _ativo
+        if _ativo is not None:
+            raise RuntimeError("Já existe um Rastreador ativo")
+        self._thread = threading.get_ident()
+        self._zera_pico = _zerar_pico()
+        self.inicio = time.perf_counter()
+        _ativo = self
+        return self
+
+    def __exit__(self, *exc):
+        global _ativo
+        _ativo = None
+        return False
+
+    def resumo(self):
+        """DataFrame com uma linha por etapa, na ordem de início (nomes indentados pela profundidade)."""
+        import pandas as pd
+
+        linhas = [{"etapa": "  " * e["profundidade"] + e["nome"], "segundos": e["segundos"], "cpu_s": e["cpu_s"],
+                   "pico_mb": e["pico_mb"], "rss_mb": e["rss_mb"]}
+                  for e in sorted(self.eventos, key=lambda e: (e["inicio_s"], e["profundidade"]))]
+        return pd.DataFrame(linhas, columns=["etapa", "segundos", "cpu_s", "pico_mb", "rss_mb"])
+
+    def chrome_trace(self):
+        """Eventos completos (``ph: X``) do formato Chrome trace, tempos em microssegundos."""
+        pid = os.getpid()
+        eventos = [{
+            "name": e["nome"], "cat": "etapa", "ph": "X", "pid": pid, "tid": self._thread,
+            "ts": round(e["inicio_s"] * 1e6, 1), "dur": round(e["segundos"] * 1e6, 1),
+            "args": {"cpu_s": round(e["cpu_s"], 4), "pico_mb": round(e["pico_mb"], 1),
+                     "rss_mb": e["rss_mb"] and round(e["rss_mb"], 1), "erro": e["erro"], **e["atributos"]},
+        } for e in self.eventos]
+        # contador de memória: aparece como um gráfico abaixo das etapas
+        eventos += [{"name": "memória (MB)", "ph": "C", "pid": pid, "ts": round((e["inicio_s"] + e["segundos"]) * 1e6, 1),
+                     "args": {"rss": round(e["rss_mb"] or 0, 1)}} for e in self.eventos]
+        return {"traceEvents": eventos, "displayTimeUnit": "ms"}
+
+    def salvar(self, caminho):
+        with open(caminho, "w") as f:
+            json.dump(self.chrome_trace(), f, default=str)
+
+    def perfil_mais_lento(self):
+        """``(nome, pstats.Stats)`` da etapa de primeiro nível mais lenta (``None`` sem ``cprofile``)."""
+        import pstats
+
+        if not self._perfis:
+            return None
+        _, nome, perfil = max(self._perfis, key=lambda p: p[0])
+        return nome, pstats.Stats(perfil)
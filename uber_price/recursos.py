@@ -0,0 +1,200 @@
+"""Cache de recursos compartilhado por todas as sessões do app (um por processo).
+
+O Streamlit roda cada sessão numa thread do mesmo processo; guardar o
+DataFrame em ``st.session_state`` faz a memória crescer com o número de
+usuários. ``CacheLRU`` guarda uma única cópia de cada recurso (dataset pelo
+hash do conteúdo, agregados da EDA, precificador do simulador, CSS e imagens
+em base64) com um orçamento de memória: quando ele estoura, saem os itens
+usados há mais tempo.
+A sessão guarda só a chave (o hash do upload), e um dataset despejado é relido
+do cache Feather em disco.
+
+O orçamento vem de ``UBER_PRICE_CACHE_MB`` (padrão: 1024). ``metricas()``
+expõe acertos, faltas, despejos e bytes em uso.
+"""
+
+import base64
+import os
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ORCAMENTO_PADRAO_MB = float(os.environ.get("UBER_PRICE_CACHE_MB", 1024))
+
+
+def tamanho_de(obj):
+    """Estimativa em bytes do que ``obj`` ocupa em memória."""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return int(np.sum(obj.memory_usage(deep=True)))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, (bytes, bytearray, str)):
+        return len(obj)
+    return sys.getsizeof(obj)
+
+
+class CacheLRU:
+    """Dicionário LRU com orçamento em bytes, seguro entre threads."""
+
+    def __init__(self, orcamento_mb=ORCAMENTO_PADRAO_MB):
+        self.orcamento = int(orcamento_mb * 1024 * 1024)
+        self._itens = OrderedDict()  # chave -> (valor, bytes)
+        self._trava = threading.Lock()
+        self._travas_chave = {}
+        self.bytes = self.acertos = self.faltas = self.despejos = self.rejeitados = 0
+
+    def obter(self, chave, fabrica, tamanho=None):
+        """Valor de ``chave``; na falta, ``fabrica()`` é chamada uma única vez mesmo com sessões concorrentes.
+
+        ``tamanho`` (bytes ou função do valor) substitui a estimativa de ``tamanho_de``.
+        """
+        with self._trava:
+            if chave in self._itens:
+                self._itens.move_to_end(chave)
+                self.acertos += 1
+                return self._itens[chave][0]
+            trava_chave = self._travas_chave.setdefault(chave, threading.Lock())
+
+        with trava_chave:
+            with self._trava:  # outra sessão pode ter criado o item enquanto esperávamos
+                if chave in self._itens:
+                    self._itens.move_to_end(chave)
+                    self.acertos += 1
+                    return self._itens[chave][0]
+                self.faltas += 1
+            try:
+                valor = fabrica()
+                if callable(tamanho):
+                    n = tamanho(valor)
+                else:
+                    n = tamanho_de(valor) if tamanho is None else tamanho
+                self._guardar(chave, valor, int(n))
+                return valor
+            finally:
+                with self._trava:
+                    if chave not in self._itens:  # fábrica falhou, item rejeitado ou já despejado
+                        self._soltar_trava(chave, trava_chave)
+
+    def _guardar(self, chave, valor, n):
+        with self._trava:
+            if n > self.orcamento:
+                self.rejeitados += 1  # maior que o orçamento inteiro: devolvido, mas não guardado
+                return
+            self._itens[chave] = (valor, n)
+            self.bytes += n
+            while self.bytes > self.orcamento:
+                antiga, (_, n_antigo) = self._itens.popitem(last=False)
+                self._soltar_trava(antiga)
+                self.bytes -= n_antigo
+                self.despejos += 1
+
+    def __contains__(self, chave):
+        with self._trava:
+            return chave in self._itens
+
+    def limpar(self):
+        with self._trava:
+            for chave in list(self._itens):
+                self._soltar_trava(chave)
+            self._itens.clear()
+            self.bytes = 0
+
+    def _soltar_trava(self, chave, propria=None):
+        """A trava da chave vive enquanto o item estiver no cache (chamar com ``self._trava``).
+
+        ``propria`` é a trava que quem chama está segurando; outra trava travada
+        fica, porque alguém já está recriando o item.
+        """
+        trava = self._travas_chave.get(chave)
+        if trava is not None and (trava is propria or not trava.locked()):
+            del self._travas_chave[chave]
+
+    def metricas(self):
+        with self._trava:
+            consultas = self.acertos + self.faltas
+            return {
+                "itens": len(self._itens),
+                "bytes": self.bytes,
+                "orcamento": self.orcamento,
+                "acertos": self.acertos,
+                "faltas": self.faltas,
+                "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+                "despejos": self.despejos,
+                "rejeitados": self.rejeitados,
+            }
+
+
+RECURSOS = CacheLRU()
+
+
+# --- recursos do app -----------------------------------------------------------
+def registrar_upload(conteudo, cache=RECURSOS):
+    """Limpa (ou reaproveita) o upload e devolve a chave que a sessão deve guardar."""
+    from uber_price.cache import hash_conteudo, limpar_com_cache
+    from uber_price.data import filtrar_uber
+
+    chave = hash_conteudo(conteudo)
+    cache.obter(("dataset", chave), lambda: filtrar_uber(limpar_com_cache(conteudo, hash_fonte=chave)))
+    return chave
+
+
+def dataset(chave, cache=RECURSOS):
+    """Dataset (já só Uber) do upload ``chave``; relido do Feather em disco se tiver sido despejado."""
+    from uber_price.cache import caminho_cache, ler_feather
+    from uber_price.data import filtrar_uber
+
+    return cache.obter(("dataset", chave), lambda: filtrar_uber(ler_feather(caminho_cache(chave))))
+
+
+def eda(chave, cache=RECURSOS):
+    """``eda.ResumoEDA`` do upload ``chave``, calculado uma vez e compartilhado entre as sessões."""
+    from uber_price.eda import resumir
+
+    return cache.obter(("eda", chave), lambda: resumir(dataset(chave, cache)), tamanho=lambda r: r.nbytes)
+
+
+def _dataset_ou_none(chave, cache):
+    return None if chave is None else dataset(chave, cache)
+
+
+def precificador(chave=None, cache=RECURSOS):
+    """``Precificador`` do simulador, carregado uma vez por processo.
+
+    Sem artefato no registro, o modelo é treinado com o upload ``chave``; sem
+    upload, levanta ``FileNotFoundError``.
+    """
+    from uber_price.registry import RAIZ_PADRAO
+    from uber_price.simulador import obter_precificador
+
+    return cache.obter(("precificador", str(RAIZ_PADRAO)),
+                       lambda: obter_precificador(_dataset_ou_none(chave, cache)),
+                       tamanho=lambda p: p.grade.precos.nbytes)
+
+
+def rotas(chave=None, cache=RECURSOS):
+    """``TabelaRotas`` do simulador (origem/destino do app), carregada uma vez por processo, como ``precificador``."""
+    from uber_price.registry import RAIZ_PADRAO
+    from uber_price.simulador import obter_rotas
+
+    return cache.obter(("rotas", str(RAIZ_PADRAO)), lambda: obter_rotas(_dataset_ou_none(chave, cache)),
+                       tamanho=lambda t: t.distancia.nbytes + t.duracao.nbytes + t.precos.nbytes)
+
+
+def _chave_arquivo(caminho):
+    caminho = Path(caminho)
+    return str(caminho.resolve()), caminho.stat().st_mtime_ns
+
+
+def texto(caminho, cache=RECURSOS):
+    """Conteúdo de um arquivo texto (ex.: o CSS do tema), relido só se o arquivo mudar."""
+    return cache.obter(("texto", *_chave_arquivo(caminho)), lambda: Path(caminho).read_text())
+
+
+def imagem_base64(caminho, cache=RECURSOS):
+    """Imagem codificada em base64 (para ``<img src="data:...">``), codificada uma vez."""
+    return cache.obter(("base64", *_chave_arquivo(caminho)),
+                       lambda: base64.b64encode(Path(caminho).read_bytes()).decode())
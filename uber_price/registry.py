@@ -0,0 +1,129 @@
+"""Registro de modelos treinados: artefatos versionados em disco.
+
+Cada versão fica em ``<raiz>/<nome>/v<N>/`` com:
+
+* ``modelo.joblib`` – o estimador, salvo sem compressão para que os arrays
+  numpy possam ser lidos com memory-map;
+* ``meta.json`` – schema das features, hash dos dados de treino, métricas
+  (``eval_model``), perfil das features (``drift.perfil_dados``), versões das
+  bibliotecas e data de criação;
+* ``codificador.json`` (opcional) – o ``CodificadorCategorias`` usado no
+  treino, para que a predição codifique as categorias exatamente igual.
+"""
+
+import functools
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+RAIZ_PADRAO = Path(os.environ.get("UBER_PRICE_MODELOS", "modelos"))
+
+
+def hash_dados(X, y=None):
+    """Hash SHA-256 do conteúdo de X (e y), independente do objeto em memória."""
+    h = hashlib.sha256()
+    h.update(pd.util.hash_pandas_object(X, index=False).values.tobytes())
+    h.update(",".join(map(str, X.columns)).encode())
+    if y is not None:
+        h.update(pd.util.hash_pandas_object(y, index=False).values.tobytes())
+    return h.hexdigest()
+
+
+def schema_features(X):
+    """Lista ordenada ``[(coluna, dtype)]`` esperada pelo modelo na predição."""
+    return [[str(col), str(dtype)] for col, dtype in X.dtypes.items()]
+
+
+def _versoes(nome, raiz):
+    pasta = Path(raiz) / nome
+    if not pasta.is_dir():
+        return []
+    return sorted(int(p.name[1:]) for p in pasta.iterdir() if p.is_dir() and p.name[1:].isdigit())
+
+
+def salvar_modelo(modelo, nome, X_train, y_train=None, metricas=None, raiz=RAIZ_PADRAO,
+                  codificador=None, **extra):
+    """Salva ``modelo`` como nova versão de ``nome`` e retorna a pasta criada."""
+    import joblib
+    import sklearn
+    from uber_price.drift import perfil_dados
+
+    versao = max(_versoes(nome, raiz), default=0) + 1
+    pasta = Path(raiz) / nome / f"v{versao}"
+    pasta.mkdir(parents=True)
+
+    joblib.dump(modelo, pasta / "modelo.joblib")
+    if codificador is not None:
+        codificador.salvar(pasta / "codificador.json")
+    meta = {
+        "nome": nome,
+        "versao": versao,
+        "estimador": type(modelo).__name__,
+        "features": schema_features(X_train),
+        "hash_dados": hash_dados(X_train, y_train),
+        "n_amostras": int(len(X_train)),
+        "metricas": {k: float(v) for k, v in (metricas or {}).items()},
+        "perfil": perfil_dados(X_train),
+        "sklearn": sklearn.__version__,
+        "criado_em": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        **extra,
+    }
+    (pasta / "meta.json").write_text(json.dumps(meta, indent=2, ensure_ascii=False))
+    return pasta
+
+
+def ler_meta(nome, versao=None, raiz=RAIZ_PADRAO):
+    """Metadados da versão pedida (ou da mais recente)."""
+    return json.loads((_pasta_versao(nome, versao, raiz) / "meta.json").read_text())
+
+
+def pasta_modelo(nome, versao=None, raiz=RAIZ_PADRAO):
+    """Pasta ``<raiz>/<nome>/v<N>`` da versão pedida (ou da mais recente)."""
+    return _pasta_versao(nome, versao, raiz)
+
+
+def _pasta_versao(nome, versao, raiz):
+    versoes = _versoes(nome, raiz)
+    if not versoes:
+        raise FileNotFoundError(f"Nenhum modelo '{nome}' registrado em {raiz}")
+    versao = versoes[-1] if versao is None else versao
+    if versao not in versoes:
+        raise FileNotFoundError(f"Versão v{versao} do modelo '{nome}' não encontrada em {raiz}")
+    return Path(raiz) / nome / f"v{versao}"
+
+
+@functools.lru_cache(maxsize=8)
+def _carregar(pasta, mmap):
+    import joblib
+
+    modelo = joblib.load(Path(pasta) / "modelo.joblib", mmap_mode="r" if mmap else None)
+    meta = json.loads((Path(pasta) / "meta.json").read_text())
+    return modelo, meta
+
+
+def carregar_modelo(nome, versao=None, raiz=RAIZ_PADRAO, mmap=True, cache=True):
+    """Carrega ``(modelo, meta)``; cada versão é lida do disco uma única vez por processo.
+
+    Com ``cache=False`` o resultado não fica no cache do módulo (quem chama gerencia a memória).
+    """
+    pasta = str(_pasta_versao(nome, versao, raiz).resolve())
+    return _carregar(pasta, mmap) if cache else _carregar.__wrapped__(pasta, mmap)
+
+
+@functools.lru_cache(maxsize=8)
+def _carregar_codificador(pasta):
+    from uber_price.preprocessing import CodificadorCategorias
+
+    caminho = Path(pasta) / "codificador.json"
+    if not caminho.is_file():
+        raise FileNotFoundError(f"Modelo em {pasta} foi salvo sem codificador")
+    return CodificadorCategorias.carregar(caminho)
+
+
+def carregar_codificador(nome, versao=None, raiz=RAIZ_PADRAO):
+    """``CodificadorCategorias`` salvo junto da versão do modelo."""
+    return _carregar_codificador(str(_pasta_versao(nome, versao, raiz).resolve()))
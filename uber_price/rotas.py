@@ -0,0 +1,209 @@
+"""Tabela de rotas origem -> destino pré-calculada (distância, duração típica e preços).
+
+O dataset não traz o tempo de viagem: ``limparDados`` estima ``duration`` a
+partir da distância com velocidade constante (``estimar_duracao``, 20 mph), e
+o app, o servidor e ``Cotacao`` repetiam a conta. As latitudes/longitudes são
+descartadas, então a única informação de trajeto que sobra é o par
+``(source, destination)`` – 12 zonas de Boston, 144 pares.
+
+``construir_tabela`` agrega as corridas uma única vez por par e faixa de
+horário (``FAIXAS_HORA``) em arrays ``[origem, destino, faixa]``: número de
+corridas, distância mediana, duração mediana e quantis do preço (float32,
+poucos KB). Células sem corridas herdam os valores do par em todas as
+faixas (``contagem`` continua 0). A consulta é indexação de array:
+
+* ``consultar`` – uma rota (app);
+* ``completar`` – preenche ``distance`` e ``duration`` de um DataFrame de
+  cotações (``montar_X``), vetorizado. A duração sai do ritmo típico da
+  rota (minutos por milha da célula) aplicado à distância da cotação; fora
+  da tabela, ``estimar_duracao``.
+
+Com os dados atuais a duração mediana da rota é a própria estimativa de
+velocidade constante sobre a distância mediana; se o dataset passar a ter o
+tempo real em ``duration``, a tabela o usa sem mudanças. Ela é salva como
+``rotas.npz`` junto da versão do modelo no registro, construída só com as
+linhas de treino. ``aplicar_duracao`` recalcula a ``duration`` do treino (e
+do teste) com ``completar``, para que o modelo veja a mesma feature que o
+servidor monta; ``descrever_duracao`` vai para o ``meta.json`` (campo
+``duracao``) com a faixa de ritmos da tabela, que mostra o quanto as
+cotações sem rota (velocidade constante) se afastam do treino.
+"""
+
+import numpy as np
+
+from uber_price.registry import RAIZ_PADRAO
+
+ARQUIVO_ROTAS = "rotas.npz"
+
+VELOCIDADE_MEDIA_MPH = 20
+FAIXAS_HORA = (0, 6, 10, 16, 20)  # madrugada, manhã, meio do dia, fim de tarde, noite
+QUANTIS = (0.1, 0.5, 0.9)
+
+
+def estimar_duracao(distancia):
+    """Duração em minutos a velocidade constante (a ``duration`` de ``limparDados``)."""
+    return (distancia / VELOCIDADE_MEDIA_MPH) * 60
+
+
+class TabelaRotas:
+    def __init__(self, zonas, faixas, contagem, distancia, duracao, precos, quantis=QUANTIS):
+        self.zonas = tuple(zonas)
+        self.faixas = np.asarray(faixas, dtype=np.int64)
+        self.contagem = np.asarray(contagem, dtype=np.int32)
+        self.distancia = np.asarray(distancia, dtype=np.float32)
+        self.duracao = np.asarray(duracao, dtype=np.float32)
+        self.precos = np.asarray(precos, dtype=np.float32)
+        self.quantis = tuple(float(q) for q in quantis)
+        self._zona = {z: i for i, z in enumerate(self.zonas)}
+        self._faixa_da_hora = np.searchsorted(self.faixas, np.arange(24), side="right") - 1
+
+    # --- consulta -------------------------------------------------------------
+    def consultar(self, origem, destino, hora):
+        """Dados da rota na faixa de ``hora``, ou ``None`` se o par não estiver na tabela."""
+        i, j = self._zona.get(origem), self._zona.get(destino)
+        if i is None or j is None:
+            return None
+        f = self._faixa_da_hora[int(hora) % 24]
+        if not np.isfinite(self.distancia[i, j, f]):
+            return None
+        return {
+            "corridas": int(self.contagem[i, j, f]),
+            "distance": float(self.distancia[i, j, f]),
+            "duration": float(self.duracao[i, j, f]),
+            "precos": dict(zip(self.quantis, self.precos[i, j, f].tolist())),
+        }
+
+    def ritmos(self):
+        """Minutos por milha das células com distância positiva."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ritmo = self.duracao / self.distancia
+        return ritmo[np.isfinite(ritmo) & (self.distancia > 0)]
+
+    def indices(self, origens, destinos, horas):
+        """Índices ``(i, j, f)`` das células; ``i``/``j`` são -1 para zonas desconhecidas."""
+        import pandas as pd
+
+        zonas = pd.Index(self.zonas)
+        i = zonas.get_indexer(np.asarray(origens, dtype=object))
+        j = zonas.get_indexer(np.asarray(destinos, dtype=object))
+        f = self._faixa_da_hora[np.asarray(horas, dtype=np.int64) % 24]
+        return i, j, f
+
+    def completar(self, df):
+        """Cópia de ``df`` com ``distance`` e ``duration`` preenchidas pela tabela onde faltarem.
+
+        Precisa de ``source``, ``destination`` e ``hour``; sem eles só estima
+        ``duration`` a partir de ``distance``.
+        """
+        df = df.copy()
+        distancia = df["distance"].to_numpy(np.float64, na_value=np.nan, copy=True) if "distance" in df else \
+            np.full(len(df), np.nan)
+        if {"source", "destination", "hour"} <= set(df.columns):
+            i, j, f = self.indices(df["source"], df["destination"], df["hour"])
+            na_tabela = (i >= 0) & (j >= 0)
+            celula = (i[na_tabela], j[na_tabela], f[na_tabela])
+            falta = na_tabela & np.isnan(distancia)
+            distancia[falta] = self.distancia[i[falta], j[falta], f[falta]]
+            ritmo = np.full(len(df), np.nan)
+            ritmo[na_tabela] = self.duracao[celula] / self.distancia[celula]
+        else:
+            ritmo = np.full(len(df), np.nan)
+        df["distance"] = distancia
+        if "duration" not in df.columns:
+            df["duration"] = np.where(np.isfinite(ritmo), ritmo * distancia, estimar_duracao(distancia))
+        return df
+
+    # --- persistência ---------------------------------------------------------
+    def salvar(self, caminho):
+        np.savez(caminho, zonas=np.array(self.zonas, dtype=str), faixas=self.faixas, contagem=self.contagem,
+                 distancia=self.distancia, duracao=self.duracao, precos=self.precos,
+                 quantis=np.array(self.quantis))
+        return caminho
+
+    @classmethod
+    def carregar(cls, caminho):
+        with np.load(caminho, allow_pickle=False) as z:
+            return cls(z["zonas"].tolist(), z["faixas"], z["contagem"], z["distancia"], z["duracao"],
+                       z["precos"], z["quantis"].tolist())
+
+
+def construir_tabela(df, faixas=FAIXAS_HORA, quantis=QUANTIS):
+    """Agrega as corridas de ``df`` (``source``, ``destination``, ``hour``, ``distance``, ``price``)."""
+    import pandas as pd
+
+    zonas = sorted(set(df["source"].dropna().unique()) | set(df["destination"].dropna().unique()))
+    z, n_faixas = len(zonas), len(faixas)
+    tabela = TabelaRotas(zonas, faixas, np.zeros((z, z, n_faixas)), np.full((z, z, n_faixas), np.nan),
+                         np.full((z, z, n_faixas), np.nan), np.full((z, z, n_faixas, len(quantis)), np.nan),
+                         quantis)
+    i, j, f = tabela.indices(df["source"], df["destination"], df["hour"])
+    validas = (i >= 0) & (j >= 0)
+    distancia = df["distance"].to_numpy(np.float64)
+    duracao = df["duration"].to_numpy(np.float64) if "duration" in df else estimar_duracao(distancia)
+    corridas = pd.DataFrame({
+        "par": (i * z + j)[validas],
+        "faixa": f[validas],
+        "distancia": distancia[validas],
+        "duracao": duracao[validas],
+        "preco": df["price"].to_numpy(np.float64)[validas],
+    })
+
+    # Primeiro cada par em todas as faixas (vale para as células sem corridas), depois cada célula
+    medianas, precos = _agregar(corridas.groupby("par"), quantis)
+    pares = medianas.index.to_numpy()
+    tabela.distancia[pares // z, pares % z] = medianas["distancia"].to_numpy()[:, None]
+    tabela.duracao[pares // z, pares % z] = medianas["duracao"].to_numpy()[:, None]
+    tabela.precos[pares // z, pares % z] = precos[:, None]
+
+    grupos = corridas.groupby(["par", "faixa"])
+    medianas, precos = _agregar(grupos, quantis)
+    pares, faixa = (medianas.index.get_level_values(n).to_numpy() for n in ("par", "faixa"))
+    celulas = (pares // z, pares % z, faixa)
+    tabela.contagem[celulas] = grupos.size().to_numpy()
+    tabela.distancia[celulas] = medianas["distancia"].to_numpy()
+    tabela.duracao[celulas] = medianas["duracao"].to_numpy()
+    tabela.precos[celulas] = precos
+    return tabela
+
+
+def aplicar_duracao(X, tabela, corridas=None):
+    """``X`` com ``duration`` recalculada pela tabela, como ``montar_X`` faz no serviço.
+
+    ``corridas`` fornece ``source``, ``destination`` e ``hour`` (mesmo índice)
+    quando ``X`` não os tem, como no simulador.
+    """
+    base = X if corridas is None else corridas.loc[X.index, ["source", "destination", "hour"]]
+    base = base.assign(distance=X["distance"]).drop(columns="duration", errors="ignore")
+    duracao = tabela.completar(base)["duration"].to_numpy()
+    return X.assign(duration=duracao.astype(X["duration"].dtype))
+
+
+def descrever_duracao(tabela):
+    """Origem da ``duration`` do treino para o ``meta.json``."""
+    ritmos = tabela.ritmos()
+    return {
+        "origem": "rotas",
+        "ritmo_min_por_milha": [float(ritmos.min()), float(ritmos.max())] if len(ritmos) else None,
+        "ritmo_sem_rota": float(estimar_duracao(1.0)),
+    }
+
+
+def _agregar(grupos, quantis):
+    """Medianas de distância/duração e matriz ``[grupo, quantil]`` dos preços."""
+    return grupos[["distancia", "duracao"]].median(), grupos["preco"].quantile(list(quantis)).unstack().to_numpy()
+
+
+def salvar_rotas(tabela, nome, versao=None, raiz=RAIZ_PADRAO):
+    from uber_price.registry import pasta_modelo
+
+    return tabela.salvar(pasta_modelo(nome, versao, raiz) / ARQUIVO_ROTAS)
+
+
+def carregar_rotas(nome, versao=None, raiz=RAIZ_PADRAO):
+    """Tabela salva junto da versão do modelo (``FileNotFoundError`` se não houver)."""
+    from uber_price.registry import pasta_modelo
+
+    caminho = pasta_modelo(nome, versao, raiz) / ARQUIVO_ROTAS
+    if not caminho.is_file():
+        raise FileNotFoundError(f"Tabela de rotas não calculada para {caminho.parent}")
+    return TabelaRotas.carregar(caminho)
@@ -0,0 +1,304 @@
+"""Servidor HTTP de predição (asyncio, só biblioteca padrão) com micro-lotes.
+
+O modelo é carregado do registro uma única vez. Requisições concorrentes são
+agrupadas por ``MicroLote``: a primeira cotação que chega abre uma janela de
+``janela_ms`` e tudo o que chegar nesse intervalo (até ``max_lote`` cotações)
+vira um único ``predict`` vetorizado, executado numa thread para não travar o
+loop de eventos.
+
+Rotas:
+
+* ``POST /prever`` – corpo JSON com uma cotação (``{"distance": 3.5, ...}``)
+  ou uma lista delas (também aceita ``{"cotacoes": [...]}``). Se a versão do
+  modelo tiver a tabela de rotas (``rotas.npz``), ``distance`` pode ser
+  trocada por ``source`` e ``destination`` (com ``hour``);
+* ``GET /stats`` – latência p50/p99, vazão e tamanho médio dos lotes;
+* ``GET /saude`` – nome/versão do modelo carregado.
+
+    python -m uber_price servir --porta 8000 --modelo simulador
+"""
+
+import asyncio
+import json
+import math
+import time
+from collections import deque
+
+import numpy as np
+
+from uber_price.features import montar_X
+
+# Faixas válidas das numéricas (None = sem limite); o dtype inteiro do treino também limita
+LIMITES_CAMPOS = {
+    "hour": (0, 23),
+    "day": (1, 31),
+    "month": (1, 12),
+    "distance": (0, None),
+    "duration": (0, None),
+    "surge_multiplier": (1, None),
+}
+
+
+def _validar_numero(col, valor, dtype):
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+        raise ValueError(f"Campo {col} deve ser numérico")
+    try:
+        finito = math.isfinite(valor)
+    except OverflowError:  # inteiro grande demais para float
+        finito = False
+    if not finito:
+        raise ValueError(f"Campo {col} deve ser finito")
+    menor, maior = LIMITES_CAMPOS.get(col, (None, None))
+    if np.dtype(dtype).kind in "iu":
+        if valor != int(valor):
+            raise ValueError(f"Campo {col} deve ser inteiro")
+        info = np.iinfo(dtype)
+        menor = info.min if menor is None else max(menor, info.min)
+        maior = info.max if maior is None else min(maior, info.max)
+    if (menor is not None and valor < menor) or (maior is not None and valor > maior):
+        faixa = f"[{'-∞' if menor is None else menor}, {'∞' if maior is None else maior}]"
+        raise ValueError(f"Campo {col} fora da faixa {faixa}: {valor!r}")
+
+
+def validar(cotacoes, meta, rotas=None, codificador=None):
+    """Verifica campos, tipos e faixas de cada cotação, para que um erro não derrube o lote inteiro.
+
+    As numéricas precisam ser finitas e estar em ``LIMITES_CAMPOS`` e na faixa
+    do dtype do treino (``meta["features"]``). Com o ``codificador`` do modelo,
+    as categóricas precisam estar no vocabulário do treino.
+    """
+    for cotacao in cotacoes:
+        if not isinstance(cotacao, dict):
+            raise ValueError("cada cotação deve ser um objeto JSON")
+        rota = None
+        if rotas is not None and "distance" not in cotacao and {"source", "destination"} <= cotacao.keys():
+            if not all(isinstance(cotacao[col], str) for col in ("source", "destination")):
+                raise ValueError("source e destination devem ser texto")
+            if "hour" in cotacao:  # usada na consulta da rota
+                _validar_numero("hour", cotacao["hour"], dict(meta["features"]).get("hour", "int64"))
+            rota = rotas.consultar(cotacao["source"], cotacao["destination"], cotacao.get("hour", 0))
+            if rota is None:
+                raise ValueError(f"Rota desconhecida: {cotacao['source']} -> {cotacao['destination']}")
+        for col, dtype in meta["features"]:
+            if col in ("distance", "duration") and col not in cotacao and (rota or "distance" in cotacao):
+                continue
+            if col not in cotacao:
+                raise ValueError(f"Campo obrigatório ausente: {col}")
+            valor = cotacao[col]
+            if dtype != "category":
+                _validar_numero(col, valor, dtype)
+            elif not isinstance(valor, str):
+                raise ValueError(f"Campo {col} deve ser texto")
+            elif codificador is not None and col in codificador.categorias_ \
+                    and valor not in codificador.categorias_[col]:
+                raise ValueError(f"Valor desconhecido para {col}: {valor!r}")
+
+
+class Estatisticas:
+    """Latências das últimas ``janela`` requisições e contadores desde o início."""
+
+    def __init__(self, janela=10_000):
+        self.latencias = deque(maxlen=janela)
+        self.inicio = time.perf_counter()
+        self.requisicoes = self.cotacoes = self.lotes = self.erros = 0
+
+    def registrar(self, segundos, n_cotacoes):
+        self.latencias.append(segundos * 1000)
+        self.requisicoes += 1
+        self.cotacoes += n_cotacoes
+
+    def resumo(self):
+        decorrido = time.perf_counter() - self.inicio
+        lat = np.asarray(self.latencias)
+        p50, p99 = np.percentile(lat, [50, 99]) if len(lat) else (0.0, 0.0)
+        return {
+            "requisicoes": self.requisicoes,
+            "cotacoes": self.cotacoes,
+            "erros": self.erros,
+            "lotes": self.lotes,
+            "cotacoes_por_lote": self.cotacoes / self.lotes if self.lotes else 0.0,
+            "latencia_p50_ms": float(p50),
+            "latencia_p99_ms": float(p99),
+            "requisicoes_por_s": self.requisicoes / decorrido,
+            "cotacoes_por_s": self.cotacoes / decorrido,
+        }
+
+
+class MicroLote:
+    """Junta as cotações que chegam dentro de ``janela_ms`` num único ``predict``."""
+
+    def __init__(self, modelo, meta, codificador=None, janela_ms=2.0, max_lote=1024, stats=None, rotas=None):
+        self.modelo, self.meta, self.codificador, self.rotas = modelo, meta, codificador, rotas
+        self.janela = janela_ms / 1000
+        self.max_lote = max_lote
+        self.stats = stats or Estatisticas()
+        self._fila = asyncio.Queue()
+        self._tarefa = None
+
+    def iniciar(self):
+        self._tarefa = asyncio.ensure_future(self._loop())
+
+    async def parar(self):
+        if self._tarefa:
+            self._tarefa.cancel()
+
+    async def prever(self, cotacoes):
+        """Preços previstos para ``cotacoes`` (lista de dicts), resolvidos no próximo lote."""
+        validar(cotacoes, self.meta, self.rotas, self.codificador)
+        futuro = asyncio.get_running_loop().create_future()
+        await self._fila.put((cotacoes, futuro))
+        return await futuro
+
+    async def _loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pendentes = [await self._fila.get()]
+            n = len(pendentes[0][0])
+            limite = loop.time() + self.janela
+            while n < self.max_lote:
+                restante = limite - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._fila.get(), restante)
+                except asyncio.TimeoutError:
+                    break
+                pendentes.append(item)
+                n += len(item[0])
+            await self._executar(loop, pendentes)
+
+    async def _prever_lote(self, loop, cotacoes):
+        X = montar_X(cotacoes, self.meta, self.codificador, self.rotas)  # um DataFrame por lote, não por requisição
+        precos = await loop.run_in_executor(None, self.modelo.predict, X)
+        self.stats.lotes += 1
+        return precos
+
+    async def _executar(self, loop, pendentes):
+        pendentes = [(x, futuro) for x, futuro in pendentes if not futuro.done()]  # cliente já desistiu
+        if not pendentes:
+            return
+        try:
+            precos = await self._prever_lote(loop, [c for lote, _ in pendentes for c in lote])
+        except Exception as erro:
+            if len(pendentes) > 1:  # uma requisição ruim não derruba as outras: cada uma de novo, sozinha
+                for item in pendentes:
+                    await self._executar(loop, [item])
+            elif not pendentes[0][1].done():
+                pendentes[0][1].set_exception(erro)
+            return
+        inicio = 0
+        for x, futuro in pendentes:
+            if not futuro.done():
+                futuro.set_result(precos[inicio:inicio + len(x)].tolist())
+            inicio += len(x)
+
+
+_STATUS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+def _resposta(status, corpo, manter_conexao=True):
+    dados = json.dumps(corpo).encode()
+    cabecalho = (f"HTTP/1.1 {status} {_STATUS[status]}\r\n"
+                 "Content-Type: application/json\r\n"
+                 f"Content-Length: {len(dados)}\r\n"
+                 f"Connection: {'keep-alive' if manter_conexao else 'close'}\r\n\r\n")
+    return cabecalho.encode() + dados
+
+
+class Servidor:
+    """HTTP/1.1 mínimo (keep-alive, corpo por Content-Length) sobre ``asyncio.start_server``."""
+
+    def __init__(self, lote, info=None):
+        self.lote = lote
+        self.info = info or {}
+
+    async def _rota(self, metodo, caminho, corpo):
+        if caminho == "/stats":
+            return 200, self.lote.stats.resumo()
+        if caminho == "/saude":
+            return 200, {"status": "ok", **self.info}
+        if caminho != "/prever":
+            return 404, {"erro": f"rota {caminho} não existe"}
+        if metodo != "POST":
+            return 405, {"erro": "use POST"}
+
+        inicio = time.perf_counter()
+        try:
+            dados = json.loads(corpo or b"null")
+            if isinstance(dados, dict) and "cotacoes" in dados:
+                dados = dados["cotacoes"]
+            unica = isinstance(dados, dict)
+            cotacoes = [dados] if unica else dados
+            if not isinstance(cotacoes, list) or not cotacoes:
+                raise ValueError("envie uma cotação (objeto) ou uma lista de cotações")
+            precos = await self.lote.prever(cotacoes)
+        except (ValueError, TypeError, KeyError) as erro:
+            self.lote.stats.erros += 1
+            return 400, {"erro": str(erro)}
+        self.lote.stats.registrar(time.perf_counter() - inicio, len(cotacoes))
+        return 200, {"preco": precos[0]} if unica else {"precos": precos}
+
+    async def atender(self, reader, writer):
+        try:
+            while True:
+                linha = await reader.readline()
+                if not linha:
+                    break
+                metodo, caminho, versao = linha.decode("latin-1").split()
+                cabecalhos = {}
+                while (linha := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    chave, _, valor = linha.decode("latin-1").partition(":")
+                    cabecalhos[chave.strip().lower()] = valor.strip()
+                corpo = await reader.readexactly(int(cabecalhos.get("content-length", 0)))
+                manter = cabecalhos.get("connection", "").lower() != "close" and versao == "HTTP/1.1"
+                try:
+                    status, resposta = await self._rota(metodo, caminho.split("?")[0], corpo)
+                except Exception as erro:
+                    status, resposta = 500, {"erro": repr(erro)}
+                writer.write(_resposta(status, resposta, manter))
+                await writer.drain()
+                if not manter:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def iniciar(self, host="127.0.0.1", porta=8000):
+        """Sobe o servidor e o micro-lote; retorna o ``asyncio.Server``."""
+        self.lote.iniciar()
+        return await asyncio.start_server(self.atender, host, porta)
+
+
+def criar_servidor(nome="simulador", versao=None, raiz=None, janela_ms=2.0, max_lote=1024):
+    """``Servidor`` com o modelo ``nome`` carregado (uma vez) do registro."""
+    from uber_price.registry import RAIZ_PADRAO, carregar_modelo, carregar_codificador
+    from uber_price.rotas import carregar_rotas
+
+    raiz = raiz or RAIZ_PADRAO
+    modelo, meta = carregar_modelo(nome, versao, raiz)
+    try:
+        codificador = carregar_codificador(nome, meta["versao"], raiz)
+    except FileNotFoundError:
+        codificador = None
+    try:
+        rotas = carregar_rotas(nome, meta["versao"], raiz)
+    except FileNotFoundError:
+        rotas = None
+    lote = MicroLote(modelo, meta, codificador, janela_ms=janela_ms, max_lote=max_lote, rotas=rotas)
+    return Servidor(lote, {"modelo": nome, "versao": meta["versao"], "features": [c for c, _ in meta["features"]],
+                           "rotas": rotas is not None})
+
+
+def servir(host="127.0.0.1", porta=8000, **kwargs):
+    """Roda o servidor até ser interrompido (Ctrl+C)."""
+    async def principal():
+        servidor = await criar_servidor(**kwargs).iniciar(host, porta)
+        print(f"Servindo em http://{host}:{porta} (POST /prever, GET /stats)", flush=True)
+        async with servidor:
+            await servidor.serve_forever()
+
+    try:
+        asyncio.run(principal())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,191 @@
+"""Modelo do simulador de preços do app (aba 💵 Simulador).
+
+O modelo principal recebe o tipo de serviço (``name``) como categórica,
+codificada pelo ``CodificadorCategorias`` salvo junto dele. Opcionalmente
+(``por_servico=True``) também é registrado um modelo menor por produto
+(``simulador-uberx``, ``simulador-black-suv``...), sem a coluna ``name``;
+``SimuladorPorServico`` carrega esses modelos sob demanda e mantém só os
+``max_modelos`` usados mais recentemente; as cotações usam o caminho rápido
+de ``uber_price.cotacao``.
+"""
+
+from collections import OrderedDict
+
+from uber_price.features import TARGET, dividir
+from uber_price.registry import RAIZ_PADRAO, salvar_modelo, carregar_modelo
+
+NOME_SIMULADOR = "simulador"
+FEATURES_SIMULADOR = ["distance", "duration", "surge_multiplier", "hour", "name"]
+FEATURES_POR_SERVICO = [col for col in FEATURES_SIMULADOR if col != "name"]
+
+
+def nome_por_servico(servico):
+    """Nome no registro do modelo especializado de ``servico`` (ex.: ``simulador-black-suv``)."""
+    if not isinstance(servico, str) or not servico.strip():
+        raise ValueError(f"Serviço desconhecido: {servico!r}")
+    return f"{NOME_SIMULADOR}-{servico.strip().lower().replace(' ', '-')}"
+
+
+def servicos_registrados(raiz=RAIZ_PADRAO):
+    """``{servico: nome no registro}`` dos modelos por produto salvos em ``raiz``."""
+    from pathlib import Path
+    from uber_price.registry import ler_meta
+
+    servicos = {}
+    for pasta in sorted(Path(raiz).glob(f"{NOME_SIMULADOR}-*")):
+        try:
+            meta = ler_meta(pasta.name, raiz=raiz)
+        except FileNotFoundError:
+            continue
+        if "servico" in meta:
+            servicos[meta["servico"]] = pasta.name
+    return servicos
+
+
+def treinar_simulador(df, codificador=None, features=FEATURES_SIMULADOR, nome=NOME_SIMULADOR, rotas=None):
+    """Treina o HistGradientBoosting do simulador e avalia no split 80/20.
+
+    Com ``rotas`` (``TabelaRotas``), a ``duration`` do treino e do teste vem
+    da tabela, como no servidor. Retorna ``(modelo, X_train, y_train, metricas)``.
+    """
+    from sklearn.ensemble import HistGradientBoostingRegressor
+    from uber_price.eval import eval_model
+    from uber_price.preprocessing import CodificadorCategorias
+
+    codificador = codificador or CodificadorCategorias().fit(df)
+    X = codificador.transform(df[features])
+    X_train, X_test, y_train, y_test = dividir(X, df[TARGET])
+    if rotas is not None and "duration" in features:
+        from uber_price.rotas import aplicar_duracao
+
+        X_train, X_test = aplicar_duracao(X_train, rotas, df), aplicar_duracao(X_test, rotas, df)
+    model = HistGradientBoostingRegressor(max_iter=400, learning_rate=0.1, max_depth=5, random_state=42,
+                                          categorical_features="from_dtype")
+    model.fit(X_train, y_train)
+    metricas = eval_model(nome, model, X_test, y_test)
+    return model, X_train, y_train, metricas
+
+
+def registrar_simulador(df, raiz=RAIZ_PADRAO, por_servico=False):
+    """Treina o simulador a partir de ``df`` (já limpo, só Uber) e salva no registro.
+
+    Com ``por_servico=True`` registra também um modelo por produto. A tabela de
+    rotas das linhas de treino (``rotas.npz``) vai junto do modelo principal e
+    dá a ``duration`` do treino de todos eles. Retorna a pasta do modelo principal.
+    """
+    from uber_price.preprocessing import CodificadorCategorias
+    from uber_price.rotas import ARQUIVO_ROTAS, construir_tabela, descrever_duracao
+
+    codificador = CodificadorCategorias().fit(df)
+    treino = dividir(df, df[TARGET])[0]  # as linhas de treino de treinar_simulador (split fixo)
+    rotas = construir_tabela(treino)
+    duracao = descrever_duracao(rotas)
+    model, X_train, y_train, metricas = treinar_simulador(df, codificador, rotas=rotas)
+    pasta = salvar_modelo(model, NOME_SIMULADOR, X_train, y_train, metricas, raiz=raiz, codificador=codificador,
+                          duracao=duracao)
+    rotas.salvar(pasta / ARQUIVO_ROTAS)
+    if por_servico:
+        for servico, grupo in df.groupby("name", observed=True):
+            nome = nome_por_servico(servico)
+            model, X_train, y_train, metricas = treinar_simulador(grupo, codificador, FEATURES_POR_SERVICO, nome,
+                                                                  rotas=rotas)
+            salvar_modelo(model, nome, X_train, y_train, metricas, raiz=raiz, servico=servico, duracao=duracao)
+    return pasta
+
+
+class SimuladorPorServico:
+    """Modelos especializados por produto, carregados sob demanda num cache LRU."""
+
+    def __init__(self, raiz=RAIZ_PADRAO, max_modelos=4):
+        self.raiz = raiz
+        self.max_modelos = max_modelos
+        self._modelos = OrderedDict()
+        self._cotadores = {}  # servico -> CotadorRapido, dos modelos ainda no LRU
+        self._servicos = None
+
+    @property
+    def servicos(self):
+        """``{servico: nome no registro}`` dos produtos com modelo, lido do registro uma vez."""
+        if self._servicos is None:
+            self._servicos = servicos_registrados(self.raiz)
+        return self._servicos
+
+    def modelo(self, servico):
+        """``(modelo, meta)`` do produto; o menos usado sai do cache quando ele enche.
+
+        ``ValueError`` se o produto não tiver modelo registrado.
+        """
+        if servico in self._modelos:
+            self._modelos.move_to_end(servico)
+            return self._modelos[servico]
+        if not isinstance(servico, str) or servico not in self.servicos:
+            raise ValueError(f"Serviço desconhecido: {servico!r}")
+        # cache=False: quem controla quanto fica em memória é este LRU, não o do registro
+        self._modelos[servico] = carregar_modelo(self.servicos[servico], raiz=self.raiz, cache=False)
+        while len(self._modelos) > self.max_modelos:
+            despejado, _ = self._modelos.popitem(last=False)
+            self._cotadores.pop(despejado, None)
+        return self._modelos[servico]
+
+    def preco(self, distancia, hora, surge=1.0, servico=None):
+        from uber_price.cotacao import Cotacao, CotadorRapido
+
+        modelo, _ = self.modelo(servico)
+        if servico not in self._cotadores:
+            self._cotadores[servico] = CotadorRapido.do_modelo(modelo)  # o HGB do simulador é sempre suportado
+        return self._cotadores[servico].preco(Cotacao(distancia, hora, surge))
+
+
+def obter_simulador(df=None, raiz=RAIZ_PADRAO):
+    """Carrega ``(modelo, meta)`` do registro; se não houver artefato, treina com ``df`` uma vez."""
+    try:
+        return carregar_modelo(NOME_SIMULADOR, raiz=raiz)
+    except FileNotFoundError:
+        if df is None:
+            raise
+    registrar_simulador(df, raiz=raiz)
+    return carregar_modelo(NOME_SIMULADOR, raiz=raiz)
+
+
+def gerar_grade_simulador(raiz=RAIZ_PADRAO, **kwargs):
+    """Calcula a grade de preços da versão mais recente do simulador e a salva no registro.
+
+    Salva também o motor NumPy das árvores (``cotacao.salvar_motor``), usado
+    pelas consultas fora da grade.
+    """
+    from uber_price.cotacao import salvar_motor
+    from uber_price.grade import calcular_grade, salvar_grade
+    from uber_price.registry import carregar_codificador
+
+    modelo, meta = carregar_modelo(NOME_SIMULADOR, raiz=raiz)
+    grade = calcular_grade(modelo, meta, carregar_codificador(NOME_SIMULADOR, meta["versao"], raiz), **kwargs)
+    salvar_grade(grade, NOME_SIMULADOR, meta["versao"], raiz)
+    salvar_motor(NOME_SIMULADOR, meta["versao"], raiz)
+    return grade
+
+
+def obter_rotas(df=None, raiz=RAIZ_PADRAO):
+    """Tabela de rotas da versão mais recente do simulador; construída com ``df`` se faltar."""
+    from uber_price.rotas import carregar_rotas, construir_tabela, salvar_rotas
+
+    try:
+        return carregar_rotas(NOME_SIMULADOR, raiz=raiz)
+    except FileNotFoundError:
+        if df is None:
+            raise
+    _, meta = obter_simulador(df, raiz)  # versão registrada antes da tabela existir
+    rotas = construir_tabela(df)
+    salvar_rotas(rotas, NOME_SIMULADOR, meta["versao"], raiz)
+    return rotas
+
+
+def obter_precificador(df=None, raiz=RAIZ_PADRAO):
+    """``Precificador`` do simulador: grade do registro, calculada (e o modelo treinado) se faltar."""
+    from uber_price.grade import Precificador, carregar_grade
+
+    try:
+        grade = carregar_grade(NOME_SIMULADOR, raiz=raiz)
+    except FileNotFoundError:
+        obter_simulador(df, raiz)
+        grade = gerar_grade_simulador(raiz)
+    return Precificador(grade, NOME_SIMULADOR, raiz)